@@ -1,22 +1,106 @@
 from playwright.sync_api import sync_playwright
+import os
 import time
 import sys
+import json
+from urllib.parse import urlsplit
 
 from credentials.credentials import Credentials
+from credentials.message.msg_code import MsgCode
+from browser.chrome_launcher import read_active_port
+
+# Modos de conexão: 'attach' conecta a um Chrome já aberto (padrão);
+# 'launch' inicia o Chromium com launch_persistent_context
+MODE_ATTACH = "attach"
+MODE_LAUNCH = "launch"
+
+# Flags para terminais PDV com pouca RAM (modo 'launch')
+LOW_MEMORY_ARGS = [
+    "--disable-background-networking",
+    "--renderer-process-limit=2",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-breakpad",
+    "--disable-features=Translate,MediaRouter,OptimizationHints",
+    "--no-first-run",
+    "--no-default-browser-check",
+]
+
+# Sessão autenticada persistida: apenas cookies/localStorage deste domínio são
+# salvos (no modo 'attach' o contexto é o perfil inteiro do usuário)
+SESSION_DOMAIN = "gdoorweb.com.br"
+SESSION_MAX_AGE = 7 * 24 * 3600
+
+# Resultados de restore_session()
+SESSION_RESTORED = "restored"   # sessão salva injetada no contexto
+SESSION_PRESENT = "present"     # contexto já tinha cookies do domínio; nada injetado
+SESSION_NONE = "none"           # nenhuma sessão utilizável
+
+
+def _host_in_domain(host, domain):
+    """True para o próprio domínio ou um subdomínio (evilgdoorweb.com.br não conta)"""
+    host = (host or "").lstrip(".").lower()
+    return host == domain or host.endswith("." + domain)
+
+
+def _filter_storage_state(state, domain):
+    """Mantém do storage_state apenas cookies e origens do domínio informado"""
+    return {
+        "cookies": [c for c in state.get("cookies", []) if _host_in_domain(c.get("domain"), domain)],
+        "origins": [o for o in state.get("origins", []) if _host_in_domain(urlsplit(o.get("origin", "")).hostname, domain)]
+    }
+
+
+def start_driver():
+    """
+    Inicia o driver do Playwright. Não depende do Chrome, então pode rodar
+    enquanto o Chrome ainda sobe; o objeto retornado fica preso à thread atual.
+    """
+    return sync_playwright().start()
+
+
+def load_credentials():
+    """Carrega e decifra as credenciais: (Credentials, status, dados)"""
+    creds = Credentials()
+    status, data = creds.load_credentials()
+    return creds, status, data
 
 
 class BrowserCDP:
     """Controlador de navegador via Chrome DevTools Protocol"""
     
-    def __init__(self, debug_port=9222):
+    def __init__(self, debug_port=9222, mode=MODE_ATTACH, user_data_dir=None,
+                 headless=False, low_memory=True, executable_path=None,
+                 playwright=None, credentials=None):
+        """
+        Args:
+            debug_port (int): Porta DevTools. No modo 'launch' é aberta para que outras
+                instâncias (ex.: thread de voz) possam se conectar; 0 = efêmera
+            mode (str): 'attach' (padrão) ou 'launch'
+            user_data_dir (str): Perfil usado no modo 'launch'
+            headless (bool): Inicia sem janela (modo 'launch')
+            low_memory (bool): Aplica LOW_MEMORY_ARGS (modo 'launch')
+            executable_path (str): Binário do Chrome; None usa o Chromium do Playwright
+            playwright: Driver já iniciado com start_driver() na mesma thread; None inicia em connect()
+            credentials (tuple): Resultado de load_credentials() já obtido; None carrega aqui
+        """
         self.debug_port = debug_port
-        self.playwright = None
+        self.mode = mode
+        self.user_data_dir = os.path.expanduser(user_data_dir or "~/.config/google-chrome-debug")
+        self.headless = headless
+        self.low_memory = low_memory
+        self.executable_path = executable_path
+        self.startup_seconds = None
+        self.playwright = playwright
         self.browser = None
         self.context = None
         self.tab_page = None
         self.pages = {}  # Dicionário para armazenar páginas por nome
-        self.creds = Credentials()
-        self.status, self.data = self.creds.load_credentials()
+        if credentials is None:
+            credentials = load_credentials()
+        self.creds, self.status, self.data = credentials
 
     def _apply_stealth(self, page):
         """Aplica técnicas de evasão para evitar detecção (exemplo básico)"""
@@ -48,29 +132,87 @@ class BrowserCDP:
         page.add_init_script(js_script)
         
     def connect(self):
-        """Conecta ao Chrome já aberto com debugging habilitado"""
+        """Conecta ao Chrome já aberto (modo 'attach') ou inicia um gerenciado (modo 'launch')"""
+        start = time.perf_counter()
         try:
-            self.playwright = sync_playwright().start()
-            self.browser = self.playwright.chromium.connect_over_cdp(f"http://localhost:{self.debug_port}")
+            if self.playwright is None:
+                self.playwright = start_driver()
             
-            # Obtém o contexto principal
-            if len(self.browser.contexts) == 0:
-                self.context = self.browser.new_context()
+            if self.mode == MODE_LAUNCH:
+                self._launch_persistent()
             else:
-                self.context = self.browser.contexts[0]
+                self.browser = self.playwright.chromium.connect_over_cdp(f"http://localhost:{self.debug_port}")
+                
+                # Obtém o contexto principal
+                if len(self.browser.contexts) == 0:
+                    self.context = self.browser.new_context()
+                else:
+                    self.context = self.browser.contexts[0]
             
             # Aplica anti-detecção em todas as páginas existentes
             for page in self.context.pages:
                 self._apply_stealth(page)
             
-            print(f"✅ Conectado ao Chrome via CDP na porta {self.debug_port}")
-            print(f"   Contextos: {len(self.browser.contexts)}")
+            self.startup_seconds = time.perf_counter() - start
+            rss = self.memory_rss_bytes()
+            
+            action = "Chromium iniciado (launch)" if self.mode == MODE_LAUNCH else "Conectado ao Chrome via CDP"
+            print(f"✅ {action} na porta {self.debug_port}")
             print(f"   Páginas abertas: {len(self.context.pages)}")
+            print(f"   Tempo de inicialização: {self.startup_seconds * 1000:.0f} ms")
+            if rss is not None:
+                print(f"   Memória do Chrome (RSS): {rss / 1024 / 1024:.0f} MB")
             return True
             
         except Exception as e:
             print(f"❌ Erro ao conectar: {str(e)}", file=sys.stderr)
             return False
+    
+    def _launch_persistent(self):
+        """Inicia o Chromium com o perfil persistente e flags para pouca RAM"""
+        args = list(LOW_MEMORY_ARGS) if self.low_memory else []
+        # Mantém a porta DevTools aberta para as threads que usam o modo 'attach'
+        args.append(f"--remote-debugging-port={self.debug_port}")
+        
+        self.context = self.playwright.chromium.launch_persistent_context(
+            self.user_data_dir,
+            headless=self.headless,
+            executable_path=self.executable_path,
+            args=args,
+            no_viewport=True
+        )
+        self.browser = None
+        
+        if self.debug_port == 0:
+            active = read_active_port(self.user_data_dir)
+            if active:
+                self.debug_port = active[0]
+    
+    def memory_rss_bytes(self):
+        """Memória residente (RSS) do Chrome e seus processos filhos, ou None se indisponível"""
+        try:
+            import psutil
+        except ImportError:
+            return None
+        
+        if self.mode == MODE_LAUNCH:
+            # O Chromium gerenciado é descendente deste processo (via driver do Playwright);
+            # soma o processo principal e todos os seus filhos (renderers, GPU...)
+            flag = f"--user-data-dir={self.user_data_dir}"
+            counted = {}
+            for child in psutil.Process().children(recursive=True):
+                try:
+                    if flag not in child.cmdline():
+                        continue
+                    for proc in [child] + child.children(recursive=True):
+                        if proc.pid not in counted:
+                            counted[proc.pid] = proc.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return sum(counted.values()) if counted else None
+        
+        from runtime.metrics import chrome_rss_bytes
+        return chrome_rss_bytes(self.debug_port)
 
     def access(self, url: str, page_name: str = None):
         """Encontra ou abre a aba com a URL especificada"""
@@ -232,9 +374,11 @@ class BrowserCDP:
         print(f"Você está na aba {page_name}.")
 
     def close(self):
-        """Fecha a conexão com o navegador"""
+        """Fecha a conexão com o navegador (no modo 'launch' também encerra o Chromium)"""
         if self.browser:
             self.browser.close()
+        elif self.mode == MODE_LAUNCH and self.context:
+            self.context.close()
         if self.playwright:
             self.playwright.stop()
         print("✅ Conexão finalizada")
@@ -339,6 +483,121 @@ class BrowserCDP:
         print("   ✅ Login automático concluído!")
         return True
     
+    def save_session(self) -> bool:
+        """
+        Salva a sessão autenticada (cookies e localStorage do gdoorweb) no
+        armazenamento cifrado das credenciais, para pular o login no próximo start.
+        
+        Returns:
+            bool: True se a sessão foi salva
+        """
+        try:
+            state = _filter_storage_state(self.context.storage_state(), SESSION_DOMAIN)
+        except Exception as e:
+            print(f"   ⚠️ Não foi possível ler a sessão do navegador: {e}")
+            return False
+        
+        if not state["cookies"] and not state["origins"]:
+            print("   ⚠️ Nenhum cookie/localStorage do gdoorweb para salvar")
+            return False
+        
+        status = self.creds.save_session(state)
+        if status != MsgCode.SUCCESS:
+            print(f"   ⚠️ Falha ao salvar sessão: {MsgCode.name_of(status)}")
+            return False
+        
+        print(f"   💾 Sessão salva ({len(state['cookies'])} cookies, {len(state['origins'])} origens)")
+        return True
+    
+    def session_is_valid(self, url: str):
+        """
+        Verificação barata da sessão: um GET com os cookies do contexto, sem
+        abrir aba. Redirecionamento para login ou 401/403 indicam sessão expirada.
+        
+        A URL precisa ser de um endpoint que exija autenticação no servidor (API);
+        rotas da SPA (ex.: /movimentos/pdv/nova) respondem 200 sem sessão.
+        
+        Returns:
+            bool: True/False, ou None se a verificação não puder ser feita (rede)
+        """
+        try:
+            response = self.context.request.get(url, timeout=5000)
+        except Exception as e:
+            print(f"   ⚠️ Verificação de sessão indisponível: {e}")
+            return None
+        
+        if response.status in (401, 403) or "login" in response.url.lower():
+            return False
+        return response.ok
+    
+    def has_session_cookies(self) -> bool:
+        """True se o contexto já tem cookies do gdoorweb (ex.: perfil debug já logado)"""
+        try:
+            return bool(_filter_storage_state({"cookies": self.context.cookies()}, SESSION_DOMAIN)["cookies"])
+        except Exception:
+            return False
+    
+    def discard_session(self) -> None:
+        """Descarta a sessão salva (ex.: restaurada mas recusada pelo PDV, que pediu login)"""
+        self.creds.clear_session()
+    
+    def restore_session(self, check_url: str = None) -> bool:
+        """
+        Restaura a sessão salva por save_session() no contexto atual.
+        
+        Se o contexto já tiver cookies do gdoorweb (ex.: perfil debug), nada é
+        injetado; caso contrário a sessão salva é sempre injetada. Uma sessão
+        salva rejeitada pelo servidor é descartada e o chamador segue para o
+        login completo.
+        
+        Args:
+            check_url (str): Endpoint que exige autenticação (responde 401/403 ou
+                redireciona ao login sem sessão) usado para validar a sessão
+                injetada; None não valida, e o chamador confere ao abrir a página
+        Returns:
+            str: SESSION_RESTORED (sessão salva injetada), SESSION_PRESENT (o
+                contexto já tinha sessão; a salva não foi usada) ou SESSION_NONE
+        """
+        if self.has_session_cookies():
+            print("   ✅ Navegador já tem cookies de sessão")
+            return SESSION_PRESENT
+        
+        status, state = self.creds.load_session(SESSION_MAX_AGE)
+        if status != MsgCode.SUCCESS:
+            if status == MsgCode.SESSION_EXPIRED:
+                self.creds.clear_session()
+            print(f"   ℹ️ Sem sessão salva utilizável ({MsgCode.name_of(status)})")
+            return SESSION_NONE
+        
+        try:
+            if state.get("cookies"):
+                self.context.add_cookies(state["cookies"])
+            
+            # localStorage: aplicado uma única vez por aba, na primeira carga da origem,
+            # para não sobrescrever o que a aplicação gravar depois
+            origins = {o["origin"]: {i["name"]: i["value"] for i in o.get("localStorage", [])}
+                       for o in state.get("origins", []) if o.get("localStorage")}
+            if origins:
+                self.context.add_init_script(f"""
+                    (() => {{
+                        const saved = {json.dumps(origins)}[window.location.origin];
+                        if (!saved || sessionStorage.getItem('__pdv_session_restored')) return;
+                        for (const [name, value] of Object.entries(saved)) localStorage.setItem(name, value);
+                        sessionStorage.setItem('__pdv_session_restored', '1');
+                    }})();
+                """)
+        except Exception as e:
+            print(f"   ⚠️ Erro ao restaurar sessão: {e}")
+            return SESSION_NONE
+        
+        if check_url and self.session_is_valid(check_url) is False:
+            print("   ⌛ Sessão salva expirou no servidor, será feito login completo")
+            self.creds.clear_session()
+            return SESSION_NONE
+        
+        print(f"   ♻️ Sessão restaurada ({len(state.get('cookies', []))} cookies)")
+        return SESSION_RESTORED
+    
     def fill_email_field(self, page_name=None) -> bool:
         """
         Identifica e preenche o campo de email usando credentials carregadas
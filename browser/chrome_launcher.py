@@ -0,0 +1,217 @@
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import subprocess
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+# Arquivo que o Chrome grava no perfil quando o endpoint DevTools está aceitando
+# conexões: linha 1 = porta, linha 2 = caminho do websocket do browser
+DEVTOOLS_ACTIVE_PORT = "DevToolsActivePort"
+
+_DEVTOOLS_LISTENING = re.compile(r"DevTools listening on (ws://[^:/\s]+:(\d+)(/\S*))")
+
+# Constantes do inotify (linux/inotify.h)
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = 0o4000
+_IN_CLOEXEC = 0o2000000
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class ChromeEndpoint:
+    """Endpoint DevTools pronto para conexão"""
+
+    def __init__(self, port: int, ws_path: Optional[str], time_to_ready: float, source: str, pid: Optional[int] = None) -> None:
+        self.port = port
+        self.ws_path = ws_path
+        self.time_to_ready = time_to_ready
+        self.source = source
+        self.pid = pid
+
+    @property
+    def http_url(self) -> str:
+        return f"http://localhost:{self.port}"
+
+    @property
+    def ws_url(self) -> Optional[str]:
+        return f"ws://localhost:{self.port}{self.ws_path}" if self.ws_path else None
+
+    def __repr__(self) -> str:
+        return f"ChromeEndpoint(port={self.port}, time_to_ready={self.time_to_ready:.3f}s, source='{self.source}')"
+
+
+def read_active_port(user_data_dir: Path) -> Optional[tuple]:
+    """
+    Lê o DevToolsActivePort de um perfil.
+
+    Returns:
+        tuple: (porta, caminho_ws) ou None se o arquivo não existir ou estiver incompleto
+    """
+    try:
+        lines = (Path(user_data_dir) / DEVTOOLS_ACTIVE_PORT).read_text().splitlines()
+    except OSError:
+        return None
+    if not lines or not lines[0].strip().isdigit():
+        return None
+    port = int(lines[0].strip())
+    if port <= 0:
+        return None
+    return port, (lines[1].strip() if len(lines) > 1 else None)
+
+
+class _ProfileWatcher:
+    """Aguarda o DevToolsActivePort via inotify (Linux) ou polling fino como fallback"""
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = Path(directory)
+        self._fd = -1
+        self._libc = None
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+            fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+            if fd >= 0:
+                mask = _IN_CREATE | _IN_MOVED_TO | _IN_CLOSE_WRITE | _IN_MODIFY
+                if libc.inotify_add_watch(fd, str(self.directory).encode(), mask) >= 0:
+                    self._fd, self._libc = fd, libc
+                else:
+                    os.close(fd)
+        except (OSError, AttributeError, TypeError):
+            self._fd = -1
+
+    @property
+    def uses_inotify(self) -> bool:
+        return self._fd >= 0
+
+    def wait(self, timeout: float) -> None:
+        """Bloqueia até haver atividade no diretório (ou até timeout)"""
+        if self._fd < 0:
+            time.sleep(min(timeout, 0.01))
+            return
+        ready, _, _ = select.select([self._fd], [], [], timeout)
+        if ready:
+            try:
+                os.read(self._fd, 64 * (_EVENT_HEADER.size + 256))
+            except BlockingIOError:
+                pass
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class ChromeLauncher:
+    """
+    Inicia o Chrome com depuração remota e detecta o instante em que o endpoint
+    DevTools passa a existir, sem polling HTTP de 1 segundo.
+
+    A prontidão é sinalizada pelo que acontecer primeiro:
+        - o DevToolsActivePort aparecer no perfil (inotify);
+        - a linha "DevTools listening on ws://..." no stderr do Chrome.
+
+    Suporta porta 0 (efêmera): o Chrome escolhe uma porta livre e ela é lida
+    do DevToolsActivePort ou do stderr.
+    """
+
+    def __init__(
+        self,
+        user_data_dir: Path,
+        port: int = 9222,
+        executable: str = "google-chrome",
+        extra_args: Optional[List[str]] = None
+    ) -> None:
+        self.user_data_dir = Path(user_data_dir).expanduser()
+        self.port = port
+        self.executable = executable
+        self.extra_args = extra_args or []
+        self.process: Optional[subprocess.Popen] = None
+        self._ready = threading.Event()
+        self._stderr_endpoint: Optional[tuple] = None
+
+    def command(self) -> List[str]:
+        return [
+            self.executable,
+            f"--remote-debugging-port={self.port}",
+            f"--user-data-dir={self.user_data_dir}",
+        ] + self.extra_args
+
+    def _read_stderr(self) -> None:
+        # Consome o stderr até o fim para o Chrome nunca bloquear com o pipe cheio
+        for raw in iter(self.process.stderr.readline, b""):
+            if self._stderr_endpoint is None:
+                match = _DEVTOOLS_LISTENING.search(raw.decode("utf-8", "replace"))
+                if match:
+                    self._stderr_endpoint = (int(match.group(2)), match.group(3))
+                    self._ready.set()
+
+    def launch(self, timeout: float = 10.0) -> Optional[ChromeEndpoint]:
+        """
+        Inicia o Chrome e aguarda o endpoint DevTools.
+
+        Args:
+            timeout: Tempo máximo de espera em segundos
+        Returns:
+            ChromeEndpoint com porta real e tempo até ficar pronto, ou None em caso de falha
+        """
+        self.user_data_dir.mkdir(parents=True, exist_ok=True)
+
+        # Um DevToolsActivePort antigo (Chrome encerrado à força) seria lido como pronto
+        try:
+            (self.user_data_dir / DEVTOOLS_ACTIVE_PORT).unlink()
+        except FileNotFoundError:
+            pass
+
+        watcher = _ProfileWatcher(self.user_data_dir)
+        start = time.perf_counter()
+
+        try:
+            self.process = subprocess.Popen(
+                self.command(),
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE
+            )
+            threading.Thread(target=self._read_stderr, daemon=True).start()
+
+            deadline = start + timeout
+            while True:
+                active = read_active_port(self.user_data_dir)
+                if active:
+                    source = "DevToolsActivePort (inotify)" if watcher.uses_inotify else "DevToolsActivePort"
+                    return ChromeEndpoint(active[0], active[1], time.perf_counter() - start, source, self.process.pid)
+
+                if self._ready.is_set():
+                    port, ws_path = self._stderr_endpoint
+                    return ChromeEndpoint(port, ws_path, time.perf_counter() - start, "stderr", self.process.pid)
+
+                if self.process.poll() is not None:
+                    # Saiu sem abrir o endpoint (ex.: perfil já em uso por outra instância)
+                    return None
+
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    # Sem endpoint no prazo: não deixa um Chrome órfão segurando o perfil e a porta
+                    self.stop()
+                    return None
+                watcher.wait(min(remaining, 0.05))
+        finally:
+            watcher.close()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Encerra o Chrome iniciado por launch() (SIGTERM, depois SIGKILL) e aguarda sua saída"""
+        if self.process is None or self.process.poll() is not None:
+            return
+        self.process.terminate()
+        try:
+            self.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
@@ -0,0 +1,257 @@
+import argparse
+import fnmatch
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# ioctl FICLONE (linux/fs.h): cópia copy-on-write em btrfs/xfs
+_FICLONE = 0x40049409
+
+MANIFEST_NAME = ".snapshot_manifest.json"
+
+DEFAULT_SOURCE = Path( "~/.config/google-chrome" ).expanduser()
+DEFAULT_DEST = Path( "~/.config/google-chrome-debug" ).expanduser()
+
+# Arquivos da raiz do perfil necessários para a automação
+ROOT_FILES = [ "Local State", "First Run", "Last Version" ]
+
+# Itens de cada perfil (Default, Profile 1, ...): cookies, logins, preferências
+# e localStorage (sessão do gdoorweb). Diretórios são copiados recursivamente.
+PROFILE_ITEMS = [
+    "Cookies", "Cookies-journal",
+    "Network/Cookies", "Network/Cookies-journal",
+    "Login Data", "Login Data-journal",
+    "Login Data For Account", "Login Data For Account-journal",
+    "Preferences", "Secure Preferences",
+    "Web Data", "Web Data-journal",
+    "Local Storage",
+]
+
+# Nunca copiados: travas, sockets e temporários de uma instância em execução
+EXCLUDE_PATTERNS = [ "LOCK", "*.lock", "lockfile", "Singleton*", "*.tmp", "*.pma" ]
+
+# Arquivos que o Chrome nunca altera no lugar: substituídos por rename
+# (ImportantFileWriter) ou imutáveis (tabelas .ldb do LevelDB). Para eles um
+# hard link é seguro; SQLite e logs são escritos no lugar e exigem cópia/reflink.
+LINK_SAFE_PATTERNS = [ "Local State", "Preferences", "Secure Preferences", "*.ldb" ]
+
+
+class SnapshotReport:
+    """Resumo de uma sincronização de perfil"""
+
+    def __init__( self ) -> None:
+        self.linked = 0
+        self.reflinked = 0
+        self.copied = 0
+        self.unchanged = 0
+        self.removed = 0
+        self.bytes_written = 0
+        self.elapsed = 0.0
+        self.skipped_reason: Optional[ str ] = None
+
+    def as_dict( self ) -> Dict[ str, object ]:
+        return dict( vars( self ) )
+
+    def __str__( self ) -> str:
+        if self.skipped_reason:
+            return f"sincronização ignorada: {self.skipped_reason}"
+        return (
+            f"{self.linked} hard links, {self.reflinked} reflinks, {self.copied} cópias "
+            f"({self.bytes_written / 1024 / 1024:.1f} MB), {self.unchanged} inalterados, "
+            f"{self.removed} removidos em {self.elapsed * 1000:.0f} ms"
+        )
+
+
+def _excluded( name: str ) -> bool:
+    return any( fnmatch.fnmatch( name, pattern ) for pattern in EXCLUDE_PATTERNS )
+
+
+def _link_safe( name: str ) -> bool:
+    return any( fnmatch.fnmatch( name, pattern ) for pattern in LINK_SAFE_PATTERNS )
+
+
+def _profile_dirs( source: Path ) -> List[ str ]:
+    names = []
+    for entry in os.scandir( source ):
+        if entry.is_dir( follow_symlinks=False ) and ( entry.name == "Default" or entry.name.startswith( "Profile " ) ):
+            names.append( entry.name )
+    return sorted( names )
+
+
+def iter_snapshot_files( source: Path ) -> Iterator[ str ]:
+    """Lista (caminhos relativos) os arquivos do perfil que entram no snapshot"""
+    for name in ROOT_FILES:
+        if ( source / name ).is_file():
+            yield name
+
+    for profile in _profile_dirs( source ):
+        for item in PROFILE_ITEMS:
+            path = source / profile / item
+            if path.is_file() and not _excluded( path.name ):
+                yield f"{profile}/{item}"
+            elif path.is_dir():
+                for root, dirs, files in os.walk( path ):
+                    dirs[ : ] = [ d for d in dirs if not _excluded( d ) ]
+                    for file_name in files:
+                        if not _excluded( file_name ):
+                            yield str( Path( root, file_name ).relative_to( source ) )
+
+
+def _reflink( src: Path, dst: Path ) -> bool:
+    if fcntl is None:
+        return False
+    try:
+        with open( src, "rb" ) as fsrc, open( dst, "wb" ) as fdst:
+            fcntl.ioctl( fdst.fileno(), _FICLONE, fsrc.fileno() )
+        return True
+    except OSError:
+        try:
+            dst.unlink()
+        except OSError:
+            pass
+        return False
+
+
+def _place( src: Path, dst: Path, allow_links: bool, report: SnapshotReport ) -> None:
+    """Materializa src em dst pelo método mais barato e seguro disponível"""
+    tmp = dst.with_name( dst.name + ".snapshot-tmp" )
+    if tmp.exists():
+        tmp.unlink()
+
+    if allow_links and _link_safe( src.name ):
+        try:
+            os.link( src, tmp )
+            os.replace( tmp, dst )
+            report.linked += 1
+            return
+        except OSError:
+            pass
+
+    if allow_links and _reflink( src, tmp ):
+        shutil.copystat( src, tmp )
+        os.replace( tmp, dst )
+        report.reflinked += 1
+        return
+
+    shutil.copy2( src, tmp )
+    os.replace( tmp, dst )
+    report.copied += 1
+    report.bytes_written += src.stat().st_size
+
+
+def _dest_in_use( dest: Path ) -> Optional[ str ]:
+    """Retorna o motivo se o perfil destino estiver aberto por um Chrome vivo"""
+    lock = dest / "SingletonLock"
+    if not os.path.islink( lock ):
+        return None
+    try:
+        # Formato do alvo: "<hostname>-<pid>"
+        pid = int( os.readlink( lock ).rsplit( "-", 1 )[ 1 ] )
+        os.kill( pid, 0 )
+        return f"perfil em uso pelo Chrome (PID {pid})"
+    except ( ValueError, IndexError, ProcessLookupError ):
+        return None
+    except PermissionError:
+        return "perfil em uso por outro usuário"
+
+
+def snapshot_profile(
+    source: Path = DEFAULT_SOURCE,
+    dest: Path = DEFAULT_DEST,
+    allow_links: bool = True
+) -> SnapshotReport:
+    """
+    Cria ou atualiza incrementalmente o perfil debug a partir do perfil original,
+    copiando apenas o necessário para a automação (cookies, Local State,
+    preferências, logins e localStorage) e excluindo caches e travas.
+
+    Arquivos inalterados desde o último snapshot (tamanho, mtime e inode da
+    origem) não são tocados, preservando o que o perfil debug alterou neles.
+
+    Args:
+        source: Perfil original do Chrome
+        dest: Perfil debug (destino)
+        allow_links: Permite hard links/reflinks; False força cópia simples
+    Returns:
+        SnapshotReport com o resumo da operação
+    """
+    start = time.perf_counter()
+    report = SnapshotReport()
+    source, dest = Path( source ).expanduser(), Path( dest ).expanduser()
+
+    if not source.is_dir():
+        report.skipped_reason = f"perfil de origem inexistente: {source}"
+        return report
+
+    in_use = _dest_in_use( dest )
+    if in_use:
+        report.skipped_reason = in_use
+        return report
+
+    dest.mkdir( parents=True, exist_ok=True )
+    manifest_path = dest / MANIFEST_NAME
+    try:
+        manifest: Dict[ str, List[ int ] ] = json.loads( manifest_path.read_text() )
+    except ( OSError, ValueError ):
+        manifest = {}
+
+    new_manifest: Dict[ str, List[ int ] ] = {}
+    for rel in iter_snapshot_files( source ):
+        src = source / rel
+        dst = dest / rel
+        try:
+            st = src.stat()
+        except FileNotFoundError:
+            continue
+        signature = [ st.st_size, st.st_mtime_ns, st.st_ino ]
+        new_manifest[ rel ] = signature
+
+        if manifest.get( rel ) == signature and dst.exists():
+            report.unchanged += 1
+            continue
+
+        dst.parent.mkdir( parents=True, exist_ok=True )
+        _place( src, dst, allow_links, report )
+
+    # Remove do destino o que sumiu da origem (apenas itens gerenciados pelo snapshot)
+    for rel in set( manifest ) - set( new_manifest ):
+        try:
+            ( dest / rel ).unlink()
+            report.removed += 1
+        except FileNotFoundError:
+            pass
+
+    tmp_manifest = manifest_path.with_name( MANIFEST_NAME + ".tmp" )
+    tmp_manifest.write_text( json.dumps( new_manifest ) )
+    os.replace( tmp_manifest, manifest_path )
+
+    report.elapsed = time.perf_counter() - start
+    return report
+
+
+def main( argv: Optional[ List[ str ] ] = None ) -> None:
+    parser = argparse.ArgumentParser( description="Cria/atualiza o perfil debug do Chrome de forma incremental." )
+    parser.add_argument( "--source", type=str, default=str( DEFAULT_SOURCE ), help="Perfil original do Chrome" )
+    parser.add_argument( "--dest", type=str, default=str( DEFAULT_DEST ), help="Perfil debug de destino" )
+    parser.add_argument( "--copy-only", action="store_true", help="Não usa hard links nem reflinks" )
+    args = parser.parse_args( argv )
+
+    print( "📂 Sincronizando perfil debug do Chrome..." )
+    report = snapshot_profile( Path( args.source ), Path( args.dest ), allow_links=not args.copy_only )
+    if report.skipped_reason:
+        print( f"   ⚠️ {report}" )
+        sys.exit( 0 if "em uso" in report.skipped_reason else 1 )
+    print( f"   ✅ {report}" )
+
+
+if __name__ == "__main__":
+    main()
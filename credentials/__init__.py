@@ -11,12 +11,29 @@ __version__ = '0.0.1'
 __author__ = 'Silvio Antunes'
 __email__ = 'silvioantunes1@hotmail.com'
 
-from .credentials import Credentials
-from .message.msg_code import MsgCode
-from .message.msg_handler import MessageHandler
-from .crypto.crypto_manager import CryptoManager
-from .crypto.decrypto_manager import DecryptoManager
-from .core.credentials_checker import CredentialsChecker
-from .core.credentials_reader import CredentialsReader
+from importlib import import_module
 
-__all__ = [ 'Credentials', 'MsgCode', 'MessageHandler', 'CryptoManager', 'DecryptoManager', 'CredentialsChecker', 'CredentialsReader' ]
\ No newline at end of file
+# Public names are resolved on first access (PEP 562): importing the package,
+# or a light submodule such as credentials.config, does not load cryptography.
+_LAZY_EXPORTS = {
+    'Credentials': '.credentials',
+    'MsgCode': '.message.msg_code',
+    'MessageHandler': '.message.msg_handler',
+    'CryptoManager': '.crypto.crypto_manager',
+    'DecryptoManager': '.crypto.decrypto_manager',
+    'CredentialsChecker': '.core.credentials_checker',
+    'CredentialsReader': '.core.credentials_reader',
+}
+
+__all__ = [ 'Credentials', 'MsgCode', 'MessageHandler', 'CryptoManager', 'DecryptoManager', 'CredentialsChecker', 'CredentialsReader' ]
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
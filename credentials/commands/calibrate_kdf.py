@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import sys
+import json
+import argparse
+from pathlib import Path
+
+try:
+    from credentials.credentials import Credentials
+    from credentials.crypto.kdf import available_kdfs, default_kdf, DEFAULT_TARGET_MS
+    from credentials.message.msg_code import MsgCode
+    from credentials.message.msg_handler import MessageHandler
+except ImportError:
+    current_dir = Path(__file__).resolve().parent
+    root_dir = current_dir.parent.parent
+    sys.path.insert(0, str(root_dir))
+
+    from credentials.credentials import Credentials
+    from credentials.crypto.kdf import available_kdfs, default_kdf, DEFAULT_TARGET_MS
+    from credentials.message.msg_code import MsgCode
+    from credentials.message.msg_handler import MessageHandler
+
+#calibrate_kdf --target-ms 150 --kdf scrypt --max-memory-mib 32
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate key derivation (key password) for this machine.")
+    parser.add_argument("--target-ms", type=float, default=DEFAULT_TARGET_MS, help="Tempo de desbloqueio alvo em ms")
+    parser.add_argument("--kdf", choices=available_kdfs(), default=default_kdf(), help="Função de derivação")
+    parser.add_argument("--max-memory-mib", type=int, default=64, help="Limite de memória (scrypt/argon2id)")
+    parser.add_argument("--config", type=str, default=None, help="Configuração salva a calibrar")
+    parser.add_argument("--dry-run", action="store_true", help="Apenas medir, sem gravar kdf.json")
+    parser.add_argument("--json", action="store_true", help="Saída JSON")
+    args = parser.parse_args()
+
+    try:
+        creds = Credentials(config_name=args.config)
+    except ValueError as e:
+        print(f"\033[1;31m❌ Erro: {e}\033[0m")
+        sys.exit(1)
+
+    status, profile = creds.calibrate_kdf(
+        target_ms=args.target_ms,
+        algorithm=args.kdf,
+        max_memory_mib=args.max_memory_mib,
+        save=not args.dry_run
+    )
+
+    if args.json:
+        print(json.dumps({"status_code": status, "status_message": MessageHandler.get(status), "profile": profile}, indent=2))
+    elif status == MsgCode.SUCCESS:
+        costs = {k: v for k, v in profile.items() if k not in ("v", "kdf", "target_ms", "measured_ms", "calibrated_at")}
+        print(f"\033[1;32m✅ {profile['kdf']} {costs} → {profile['measured_ms']} ms (alvo {profile['target_ms']:g} ms)\033[0m")
+        if not args.dry_run:
+            print(f"   Perfil salvo em {creds.kdf_profile_path}; vale para as próximas chaves criadas com --keypass")
+    else:
+        print(f"\033[1;31m❌ Erro: {MessageHandler.get(status)}\033[0m")
+
+    sys.exit(0 if status == MsgCode.SUCCESS else 1)
+
+if __name__ == "__main__":
+    main()
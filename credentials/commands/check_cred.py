@@ -27,17 +27,19 @@ from typing import List, Dict, Any
 
 # Robust import strategy
 try:
-    from credentials.credentials import Credentials
     from credentials.message.msg_code import MsgCode
     from credentials.message.msg_handler import MessageHandler
     from credentials.config.config import CredentialsConfig
+    from credentials.config.config_manager import ConfigManager
+    from credentials.core.credentials_checker import CredentialsChecker
 except ImportError:
     try:
         # Try relative import
-        from ..credentials import Credentials
         from ..message.msg_code import MsgCode
         from ..message.msg_handler import MessageHandler
         from ..config.config import CredentialsConfig
+        from ..config.config_manager import ConfigManager
+        from ..core.credentials_checker import CredentialsChecker
     except ImportError:
         try:
             # Add root directory to Python path
@@ -45,10 +47,11 @@ except ImportError:
             root_dir = current_dir.parent.parent
             sys.path.insert(0, str(root_dir))
             
-            from credentials.credentials import Credentials
             from credentials.message.msg_code import MsgCode
             from credentials.message.msg_handler import MessageHandler
             from credentials.config.config import CredentialsConfig
+            from credentials.config.config_manager import ConfigManager
+            from credentials.core.credentials_checker import CredentialsChecker
         except ImportError as e:
             print(f"\033[1;31m❌ Critical import error: {e}\033[0m")
             sys.exit(255)
@@ -149,15 +152,16 @@ def print_credential_info(cred_info: Dict[str, Any], index: int = None) -> None:
 def check_default_credentials() -> Dict[str, Any]:
     """Check credentials in default directory."""
     try:
-        creds = Credentials()
-        dir_status, creds_status, key_status = creds.checker()
+        # Status only: checker + config, no Credentials (and no cryptography import)
+        config = CredentialsConfig()
+        dir_status, creds_status, key_status = CredentialsChecker(config).check_all()
         
         return {
             "type": "default",
             "config_name": None,
-            "directory": str(creds.credentials_directory),
-            "credentials_file": str(creds.credentials_file_path),
-            "key_file": str(creds.key_file_path),
+            "directory": str(config.credentials_dir),
+            "credentials_file": str(config.credentials_file),
+            "key_file": str(config.key_file),
             "status": {
                 "directory_exists": dir_status == MsgCode.SUCCESS,
                 "credentials_exists": creds_status == MsgCode.SUCCESS,
@@ -196,13 +200,13 @@ def check_registered_credentials() -> List[Dict[str, Any]]:
     registered_configs = []
     
     try:
-        creds = Credentials()
-        saved_configs = creds.list_saved_configs()
+        config_manager = ConfigManager()
+        saved_configs = config_manager.list_configs()
         
         for config_info in saved_configs:
             try:
                 # Check status using the existing method from your ConfigManager
-                status_code, exists, file_status = creds._config_manager.check_config_exists(config_info.name)
+                status_code, exists, file_status = config_manager.check_config_exists(config_info.name)
                 
                 base_path = Path(config_info.base_directory)
                 credentials_dir = base_path / config_info.folder_name
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+# ==============================================
+# authenticator/commands/check_cred_bin.py
+# version: 0.1.0
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import sys
+import socket
+import struct
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Robust import strategy
+try:
+    from credentials.message.msg_code import MsgCode
+    from credentials.config.config import CredentialsConfig
+    from credentials.config.config_manager import ConfigManager
+    from credentials.core.credentials_checker import CredentialsChecker
+except ImportError:
+    current_dir = Path(__file__).resolve().parent
+    root_dir = current_dir.parent.parent
+    sys.path.insert(0, str(root_dir))
+
+    from credentials.message.msg_code import MsgCode
+    from credentials.config.config import CredentialsConfig
+    from credentials.config.config_manager import ConfigManager
+    from credentials.core.credentials_checker import CredentialsChecker
+
+# Binary interface for native callers (see tests/integration/*.c).
+#
+# One-shot (default): writes int32[3] = { directory, credentials, key } of the
+# default config to stdout and exits.
+#
+# Server (--serve, on stdin/stdout or --socket PATH): reads request frames and writes
+# one response frame per request, in order. Native byte order, standard sizes.
+#   request  (68 bytes): char config_name[64] (UTF-8, NUL padded; empty = default)
+#                        int32 check_type
+#   response (16 bytes): int32 status, directory, credentials, key
+# status is 0, CONFIG_NOT_FOUND or CONFIG_INVALID (bad frame); codes of checks not
+# requested by check_type are -1. Requests can be pipelined: responses are written
+# once per read, so a batch of frames costs one write.
+
+CONFIG_NAME_SIZE = 64
+REQUEST = struct.Struct('=64si')
+RESPONSE = struct.Struct('=4i')
+RESULTS = struct.Struct('=3i')
+
+CHECK_ALL = 0
+CHECK_DIRECTORY = 1
+CHECK_CREDENTIALS = 2
+CHECK_KEY = 3
+
+NOT_CHECKED = -1
+READ_SIZE = 64 * 1024
+
+def run_checks(checker: CredentialsChecker, check_type: int = CHECK_ALL) -> Tuple[int, int, int]:
+    """Same codes as Credentials.checker(); unrequested checks are NOT_CHECKED."""
+    directory = credentials = key = NOT_CHECKED
+    if check_type in (CHECK_ALL, CHECK_DIRECTORY):
+        directory = checker.check_directory()
+    if check_type == CHECK_ALL and directory != MsgCode.SUCCESS:
+        return directory, MsgCode.CREDENTIALS_NULL, MsgCode.PROVIDED_KEY_NULL
+    if check_type in (CHECK_ALL, CHECK_CREDENTIALS):
+        credentials = checker.check_credentials_file()
+    if check_type in (CHECK_ALL, CHECK_KEY):
+        key = checker.check_key_file()
+    return directory, credentials, key
+
+class CheckServer:
+    """Answers request frames; keeps the registry and one checker per config in memory."""
+
+    def __init__(self, config_manager: Optional[ConfigManager] = None) -> None:
+        self._config_manager = config_manager
+        self._default = CredentialsChecker(CredentialsConfig())
+        self._checkers: Dict[str, Tuple[Tuple[Path, Path], CredentialsChecker]] = {}
+        self._lock = threading.Lock()
+
+    def _checker(self, name: str) -> Optional[CredentialsChecker]:
+        # Resolved on every request: a removed or moved config is seen right away
+        if not name:
+            return self._default
+        with self._lock:
+            if self._config_manager is None:
+                self._config_manager = ConfigManager()
+            status, config = self._config_manager.get_config(name, touch=False)
+            if status != MsgCode.SUCCESS or not config:
+                self._checkers.pop(name, None)
+                return None
+            paths = (config.credentials_file, config.key_file)
+            cached = self._checkers.get(name)
+            if cached is None or cached[0] != paths:
+                cached = self._checkers[name] = (paths, CredentialsChecker(config))
+            return cached[1]
+
+    def answer(self, frame: bytes) -> bytes:
+        """Response frame for one request frame."""
+        raw_name, check_type = REQUEST.unpack(frame)
+        try:
+            name = raw_name.rstrip(b'\0').decode('utf-8')
+        except UnicodeDecodeError:
+            return RESPONSE.pack(MsgCode.CONFIG_INVALID, NOT_CHECKED, NOT_CHECKED, NOT_CHECKED)
+        if check_type not in (CHECK_ALL, CHECK_DIRECTORY, CHECK_CREDENTIALS, CHECK_KEY):
+            return RESPONSE.pack(MsgCode.CONFIG_INVALID, NOT_CHECKED, NOT_CHECKED, NOT_CHECKED)
+
+        checker = self._checker(name)
+        if checker is None:
+            return RESPONSE.pack(MsgCode.CONFIG_NOT_FOUND, NOT_CHECKED, NOT_CHECKED, NOT_CHECKED)
+        return RESPONSE.pack(MsgCode.SUCCESS, *run_checks(checker, check_type))
+
+    def serve_fd(self, read_fd: int, write_fd: int) -> None:
+        """Frame loop until EOF: one read, all complete frames answered, one write."""
+        pending = b''
+        while True:
+            data = os.read(read_fd, READ_SIZE)
+            if not data:
+                return
+            pending += data
+            complete = len(pending) - len(pending) % REQUEST.size
+            if not complete:
+                continue
+            replies = b''.join(self.answer(pending[i:i + REQUEST.size]) for i in range(0, complete, REQUEST.size))
+            pending = pending[complete:]
+            view = memoryview(replies)
+            while view:
+                view = view[os.write(write_fd, view):]
+
+    def serve_socket(self, socket_path: Path) -> None:
+        """Same frames over an owner-only Unix socket, one thread per connection."""
+        if socket_path.exists():
+            socket_path.unlink()
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        old_umask = os.umask(0o177)
+        try:
+            server.bind(str(socket_path))
+        finally:
+            os.umask(old_umask)
+        server.listen(16)
+        try:
+            while True:
+                connection, _ = server.accept()
+                threading.Thread(target=self._serve_connection, args=(connection,), daemon=True).start()
+        finally:
+            server.close()
+            socket_path.unlink(missing_ok=True)
+
+    def _serve_connection(self, connection: socket.socket) -> None:
+        with connection:
+            try:
+                self.serve_fd(connection.fileno(), connection.fileno())
+            except OSError:
+                pass
+
+def main() -> None:
+    """Entry point: one-shot int32[3], or --serve for the persistent frame server."""
+    parser = argparse.ArgumentParser(description="Binary credentials check for native integrations.")
+    parser.add_argument("--serve", action="store_true", help="Persistent mode: request frames on stdin, response frames on stdout")
+    parser.add_argument("--socket", type=Path, default=None, help="With --serve: listen on this Unix socket instead of stdin")
+    args = parser.parse_args()
+
+    if not args.serve:
+        sys.stdout.buffer.write(RESULTS.pack(*run_checks(CredentialsChecker(CredentialsConfig()))))
+        sys.stdout.buffer.flush()
+        return
+
+    server = CheckServer()
+    try:
+        if args.socket:
+            server.serve_socket(args.socket)
+        else:
+            server.serve_fd(sys.stdin.fileno(), sys.stdout.fileno())
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+
+if __name__ == "__main__":
+    main()
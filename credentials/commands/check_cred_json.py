@@ -21,24 +21,31 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import argparse
 import json
 import sys
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterator, List
 
 # Robust import strategy
 try:
-    from credentials.credentials import Credentials
     from credentials.message.msg_code import MsgCode
     from credentials.message.msg_handler import MessageHandler
     from credentials.config.config import CredentialsConfig
+    from credentials.config.config_manager import ConfigManager
+    from credentials.config.status_scanner import scan_config_status
+    from credentials.core.credentials_checker import CredentialsChecker
+    from credentials.commands.ndjson_batch import add_batch_arguments, run_batch, thread_config_manager, dumps_compact
 except ImportError:
     try:
         # Try relative import
-        from ..credentials import Credentials
         from ..message.msg_code import MsgCode
         from ..message.msg_handler import MessageHandler
         from ..config.config import CredentialsConfig
+        from ..config.config_manager import ConfigManager
+        from ..config.status_scanner import scan_config_status
+        from ..core.credentials_checker import CredentialsChecker
+        from .ndjson_batch import add_batch_arguments, run_batch, thread_config_manager, dumps_compact
     except ImportError:
         try:
             # Add root directory to Python path
@@ -46,10 +53,13 @@ except ImportError:
             root_dir = current_dir.parent.parent
             sys.path.insert(0, str(root_dir))
             
-            from credentials.credentials import Credentials
             from credentials.message.msg_code import MsgCode
             from credentials.message.msg_handler import MessageHandler
             from credentials.config.config import CredentialsConfig
+            from credentials.config.config_manager import ConfigManager
+            from credentials.config.status_scanner import scan_config_status
+            from credentials.core.credentials_checker import CredentialsChecker
+            from credentials.commands.ndjson_batch import add_batch_arguments, run_batch, thread_config_manager, dumps_compact
         except ImportError as e:
             error_output = {
                 "exist": False,
@@ -67,15 +77,16 @@ def check_default_credentials() -> Dict[str, Any]:
         Dict containing default credentials info
     """
     try:
-        creds = Credentials()
-        dir_status, creds_status, key_status = creds.checker()
+        # Status only: checker + config, no Credentials (and no cryptography import)
+        config = CredentialsConfig()
+        dir_status, creds_status, key_status = CredentialsChecker(config).check_all()
         
         default_info = {
             "type": "default",
             "config_name": None,
-            "directory": str(creds.credentials_directory),
-            "credentials_file": str(creds.credentials_file_path),
-            "key_file": str(creds.key_file_path),
+            "directory": str(config.credentials_dir),
+            "credentials_file": str(config.credentials_file),
+            "key_file": str(config.key_file),
             "status": {
                 "directory_exists": dir_status == MsgCode.SUCCESS,
                 "credentials_exists": creds_status == MsgCode.SUCCESS,
@@ -118,84 +129,157 @@ def check_default_credentials() -> Dict[str, Any]:
             "error": str(e)
         }
 
+def _registered_entry(config_info: Any, status_code: MsgCode, file_status: Dict[str, bool]) -> Dict[str, Any]:
+    """
+    Build the output entry of one registered configuration.
+    
+    Returns:
+        Dict with the registered configuration info
+    """
+    credentials_dir = Path(config_info.base_directory) / config_info.folder_name
+    
+    return {
+        "type": "registered",
+        "config_name": config_info.name,
+        "description": config_info.description,
+        "directory": str(credentials_dir),
+        "credentials_file": str(credentials_dir / config_info.credentials_filename),
+        "key_file": str(credentials_dir / config_info.key_filename),
+        "created_date": config_info.created_at,
+        "last_used": config_info.last_used,
+        "status": {
+            "directory_exists": file_status.get("directory_exists", False),
+            "credentials_exists": file_status.get("credentials_exists", False),
+            "key_exists": file_status.get("key_exists", False),
+            "status_code": status_code,
+            "status_message": MessageHandler.get(status_code)
+        },
+        "is_complete": bool(
+            file_status.get("directory_exists", False) and
+            file_status.get("credentials_exists", False) and
+            file_status.get("key_exists", False)
+        )
+    }
+
+def iter_registered_credentials(config_manager: ConfigManager = None) -> Iterator[Dict[str, Any]]:
+    """
+    Check all registered credential configurations concurrently.
+    
+    Each credentials directory is listed once (os.scandir) on a thread pool and
+    entries are yielded as soon as their scan finishes, not in registry order.
+    
+    Yields:
+        Registered credential configuration info
+    """
+    config_manager = config_manager or ConfigManager()
+    
+    for name, result in config_manager.iter_config_status():
+        yield _registered_entry(result['config_info'], result['status_code'], result['files'] or {})
+
 def check_registered_credentials() -> List[Dict[str, Any]]:
     """
     Check all registered credential configurations.
     
     Returns:
-        List of registered credential configurations info
+        List of registered credential configurations info, in registry order
     """
     registered_configs = []
     
     try:
-        creds = Credentials()
-        saved_configs = creds.list_saved_configs()
-        
-        for config_info in saved_configs:
-            try:
-                # Check status of this specific config using the existing method
-                status_code, exists, file_status = creds._config_manager.check_config_exists(config_info.name)
-                
-                base_path = Path(config_info.base_directory)
-                credentials_dir = base_path / config_info.folder_name
-                
-                config_data = {
-                    "type": "registered",
-                    "config_name": config_info.name,
-                    "description": config_info.description,
-                    "directory": str(credentials_dir),
-                    "credentials_file": str(credentials_dir / config_info.credentials_filename),
-                    "key_file": str(credentials_dir / config_info.key_filename),
-                    "created_date": config_info.created_at,
-                    "last_used": config_info.last_used,
-                    "status": {
-                        "directory_exists": file_status.get("directory_exists", False) if file_status else False,
-                        "credentials_exists": file_status.get("credentials_exists", False) if file_status else False,
-                        "key_exists": file_status.get("key_exists", False) if file_status else False,
-                        "status_code": status_code,
-                        "status_message": MessageHandler.get(status_code)
-                    },
-                    "is_complete": (
-                        file_status and
-                        file_status.get("directory_exists", False) and
-                        file_status.get("credentials_exists", False) and
-                        file_status.get("key_exists", False)
-                    ) if file_status else False
-                }
-                
-                registered_configs.append(config_data)
-                
-            except Exception as e:
-                # Add error info for this specific config
-                error_config = {
-                    "type": "registered",
-                    "config_name": config_info.name,
-                    "description": config_info.description,
-                    "directory": "unknown",
-                    "credentials_file": "unknown",
-                    "key_file": "unknown",
-                    "created_date": config_info.created_at if hasattr(config_info, 'created_at') else None,
-                    "last_used": config_info.last_used if hasattr(config_info, 'last_used') else None,
-                    "status": {
-                        "directory_exists": False,
-                        "credentials_exists": False,
-                        "key_exists": False,
-                        "status_code": MsgCode.UNKNOWN_ERROR,
-                        "status_message": str(e)
-                    },
-                    "is_complete": False,
-                    "error": str(e)
-                }
-                registered_configs.append(error_config)
-                
+        config_manager = ConfigManager()
+        order = {config_info.name: index for index, config_info in enumerate(config_manager.list_configs())}
+        registered_configs = sorted(
+            iter_registered_credentials(config_manager),
+            key=lambda entry: order.get(entry["config_name"], len(order))
+        )
     except Exception as e:
         # Return empty list with error info
         pass
     
     return registered_configs
 
+def _build_summary(default_creds: Dict[str, Any], registered_creds: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Build the aggregate fields of the output from the collected entries."""
+    all_credentials = [default_creds] + registered_creds
+    complete_credentials = [cred for cred in all_credentials if cred.get("is_complete", False)]
+    
+    return {
+        "exist": len(complete_credentials) > 0,
+        "total_configs": len(all_credentials),
+        "complete_configs": len(complete_credentials),
+        "incomplete_configs": len(all_credentials) - len(complete_credentials),
+        "summary": {
+            "has_default": default_creds.get("is_complete", False),
+            "registered_count": len(registered_creds),
+            "complete_registered": len([c for c in registered_creds if c.get("is_complete", False)])
+        }
+    }
+
+def check_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Batch handler: {"config_name": "..."} (omitted = default credentials).
+    
+    Returns:
+        The same entry as in "credentials", plus "success" (= is_complete)
+    """
+    config_name = request.get("config_name")
+    if not config_name:
+        entry = check_default_credentials()
+    else:
+        config_info = thread_config_manager().get_config_info(config_name)
+        if config_info is None:
+            return {
+                "success": False,
+                "type": "registered",
+                "config_name": config_name,
+                "error": MessageHandler.get(MsgCode.CONFIG_NOT_FOUND),
+                "status": {"status_code": MsgCode.CONFIG_NOT_FOUND}
+            }
+        entry = _registered_entry(config_info, MsgCode.SUCCESS, scan_config_status(config_info))
+    
+    return {"success": bool(entry.get("is_complete")), **entry}
+
+def stream_main() -> None:
+    """
+    NDJSON output: one line per configuration as soon as it is checked, then a
+    final line with "type": "summary" holding the same aggregate fields as the
+    default output (without the "credentials" list).
+    """
+    try:
+        default_creds = check_default_credentials()
+        print(dumps_compact(default_creds), flush=True)
+        
+        registered_creds = []
+        try:
+            for entry in iter_registered_credentials():
+                registered_creds.append(entry)
+                print(dumps_compact(entry), flush=True)
+        except Exception as e:
+            print(dumps_compact({"type": "error", "error": str(e)}), flush=True)
+        
+        summary = _build_summary(default_creds, registered_creds)
+        print(dumps_compact({"type": "summary", **summary}), flush=True)
+        sys.exit(0 if summary["exist"] else 1)
+        
+    except Exception as e:
+        print(dumps_compact({"type": "summary", "exist": False, "error": f"Unexpected error: {e}"}), flush=True)
+        sys.exit(255)
+
 def main() -> None:
     """Main entry point for JSON credential existence check."""
+    parser = argparse.ArgumentParser(description="JSON credential existence check.")
+    parser.add_argument("--stream", action="store_true", help="NDJSON: one line per configuration as soon as it is checked")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+    
+    if args.batch:
+        # printf '{"config_name": "loja1"}\n{}\n' | check_cred_json --batch --workers 8
+        sys.exit(run_batch(check_request, args.workers))
+    
+    if args.stream:
+        stream_main()
+        return
+    
     try:
         # Check default credentials
         default_creds = check_default_credentials()
@@ -203,27 +287,10 @@ def main() -> None:
         # Check registered credentials
         registered_creds = check_registered_credentials()
         
-        # Combine all credentials
-        all_credentials = [default_creds] + registered_creds
-        
-        # Check if any credentials exist and are complete
-        any_exist = any(cred.get("is_complete", False) for cred in all_credentials)
-        complete_credentials = [cred for cred in all_credentials if cred.get("is_complete", False)]
-        incomplete_credentials = [cred for cred in all_credentials if not cred.get("is_complete", False)]
-        
         # Build output
-        output = {
-            "exist": any_exist,
-            "total_configs": len(all_credentials),
-            "complete_configs": len(complete_credentials),
-            "incomplete_configs": len(incomplete_credentials),
-            "summary": {
-                "has_default": default_creds.get("is_complete", False),
-                "registered_count": len(registered_creds),
-                "complete_registered": len([c for c in registered_creds if c.get("is_complete", False)])
-            },
-            "credentials": all_credentials
-        }
+        output = _build_summary(default_creds, registered_creds)
+        output["credentials"] = [default_creds] + registered_creds
+        any_exist = output["exist"]
         
         # Output JSON
         print(json.dumps(output, indent=2, ensure_ascii=False))
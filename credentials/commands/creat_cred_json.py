@@ -2,12 +2,14 @@
 
 import sys
 import json
+import argparse
 from pathlib import Path
 
 try:
     from credentials.credentials import Credentials
     from credentials.message.msg_code import MsgCode
     from credentials.message.msg_handler import MessageHandler
+    from credentials.commands.ndjson_batch import add_batch_arguments, run_batch, thread_credentials
 except ImportError:
     current_dir = Path(__file__).resolve().parent
     root_dir = current_dir.parent.parent
@@ -16,8 +18,36 @@ except ImportError:
     from credentials.credentials import Credentials
     from credentials.message.msg_code import MsgCode
     from credentials.message.msg_handler import MessageHandler
+    from credentials.commands.ndjson_batch import add_batch_arguments, run_batch, thread_credentials
 
+def create_request(request):
+    """Batch handler: {"email", "password", "username"?, "keypass"?, "config_name"?} -> {"success", "error"?}."""
+    if not request.get("email") or not request.get("password"):
+        return {"success": False, "error": "Campos obrigatórios: 'email' e 'password'"}
+
+    config_name = request.get("config_name")
+    status, creds = thread_credentials(config_name)
+    if status == MsgCode.SUCCESS:
+        status = creds.create_credentials(
+            username=request.get("username"),
+            email=request["email"],
+            password=request["password"],
+            key_password=request.get("keypass")
+        )
+    result = {"success": status == MsgCode.SUCCESS, "config": config_name or "default"}
+    if status != MsgCode.SUCCESS:
+        result["error"] = MessageHandler.get(status)
+    return result
+
+#printf '{"config_name": "loja1", "email": "a@b.c", "password": "x"}\n' | create_cred_json --batch --workers 4
 def main():
+    parser = argparse.ArgumentParser(description="Cria credenciais a partir de JSON no stdin.")
+    add_batch_arguments(parser)
+    args = parser.parse_args()
+
+    if args.batch:
+        sys.exit(run_batch(create_request, args.workers))
+
     try:
         input_data = json.load(sys.stdin)
     except json.JSONDecodeError as e:
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+
+# ==============================================
+# authenticator/commands/cred.py
+# version: 0.1.0
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import sys
+from importlib import import_module
+from typing import List, Optional
+
+# Single entry point for the credential commands:
+#   cred check            cred check-json --stream
+#   cred show-json --batch < requests.ndjson
+# Only the chosen subcommand's module is imported, so status checks never load
+# cryptography or sqlite3 (tests/unit/test_cli_startup.py keeps it that way).
+# Argument parsing is left to each subcommand; `cred <name> --help` shows its options.
+
+# name -> (module, help)
+SUBCOMMANDS = {
+    "check": ("credentials.commands.check_cred", "Verificar a existência das credenciais (visual)"),
+    "check-json": ("credentials.commands.check_cred_json", "Verificar a existência das credenciais (JSON / NDJSON)"),
+    "check-bin": ("credentials.commands.check_cred_bin", "Verificação binária (int32) e servidor de frames"),
+    "create": ("credentials.commands.create_cred", "Criar credenciais (interativo)"),
+    "create-json": ("credentials.commands.creat_cred_json", "Criar credenciais (JSON)"),
+    "show": ("credentials.commands.show_cred", "Exibir credenciais (visual)"),
+    "show-json": ("credentials.commands.show_cred_json", "Exibir credenciais (JSON)"),
+    "calibrate-kdf": ("credentials.commands.calibrate_kdf", "Calibrar o custo da derivação de chave"),
+    "agent": ("credentials.commands.cred_agent", "Agente local de credenciais (socket Unix)"),
+}
+
+def usage() -> str:
+    """Help text; built from SUBCOMMANDS without importing any of them."""
+    width = max(len(name) for name in SUBCOMMANDS)
+    lines = ["uso: cred <comando> [opções]", "", "comandos:"]
+    lines += [f"  {name.ljust(width)}  {help_text}" for name, (_, help_text) in SUBCOMMANDS.items()]
+    lines += ["", "Use 'cred <comando> --help' para as opções de cada comando."]
+    return "\n".join(lines)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    """Dispatch to the subcommand's main(), importing only its module."""
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        sys.exit(0 if argv else 2)
+
+    name, rest = argv[0], argv[1:]
+    entry = SUBCOMMANDS.get(name)
+    if entry is None:
+        print(f"cred: comando desconhecido '{name}'\n\n{usage()}", file=sys.stderr)
+        sys.exit(2)
+
+    # Subcommands read sys.argv themselves (argparse or positional)
+    sys.argv = [f"cred {name}"] + rest
+    import_module(entry[0]).main()
+
+if __name__ == "__main__":
+    main()
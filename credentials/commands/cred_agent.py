@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+
+import sys
+import signal
+import argparse
+from pathlib import Path
+
+try:
+    from credentials.core.agent import AgentClient, CredentialsAgent, agent_socket_path, DEFAULT_IDLE_TIMEOUT
+except ImportError:
+    current_dir = Path(__file__).resolve().parent
+    root_dir = current_dir.parent.parent
+    sys.path.insert(0, str(root_dir))
+
+    from credentials.core.agent import AgentClient, CredentialsAgent, agent_socket_path, DEFAULT_IDLE_TIMEOUT
+
+#cred-agent &                  # inicia (primeiro plano; use & ou systemd --user)
+#cred-agent --status / --stop
+def main():
+    parser = argparse.ArgumentParser(description="Agente local de credenciais (socket Unix): decifra uma vez e responde get/verify.")
+    parser.add_argument("--socket", type=Path, default=None, help=f"Socket (padrão: {agent_socket_path()})")
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT, help="Segundos sem uso até descartar as credenciais da memória")
+    parser.add_argument("--exit-on-idle", action="store_true", help="Encerrar o agente quando ocioso")
+    parser.add_argument("--status", action="store_true", help="Verificar se o agente está ativo")
+    parser.add_argument("--stop", action="store_true", help="Encerrar o agente ativo")
+    args = parser.parse_args()
+
+    client = AgentClient(args.socket)
+
+    if args.status:
+        reply = client.request({"op": "ping"})
+        if reply:
+            print(f"\033[1;32m✅ cred-agent ativo (pid {reply.get('pid')}, {reply.get('entries', 0)} configuração(ões) em memória)\033[0m")
+            sys.exit(0)
+        print("\033[1;33m⚠️  cred-agent não está em execução\033[0m")
+        sys.exit(1)
+
+    if args.stop:
+        if client.stop():
+            print("\033[1;32m✅ cred-agent encerrado\033[0m")
+            sys.exit(0)
+        print("\033[1;33m⚠️  cred-agent não está em execução\033[0m")
+        sys.exit(1)
+
+    agent = CredentialsAgent(args.socket, idle_timeout=args.idle_timeout or None, exit_on_idle=args.exit_on_idle)
+    signal.signal(signal.SIGTERM, lambda *_: agent.shutdown())
+    signal.signal(signal.SIGINT, lambda *_: agent.shutdown())
+
+    try:
+        agent.start()
+    except (RuntimeError, OSError) as e:
+        print(f"\033[1;31m❌ Erro: {e}\033[0m")
+        sys.exit(1)
+
+    print(f"\033[1;32m🔐 cred-agent ouvindo em {agent.socket_path}\033[0m", flush=True)
+    agent.serve_forever()
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+# ==============================================
+# authenticator/commands/ndjson_batch.py
+# version: 0.1.0
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import sys
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Optional, Set, TextIO, Tuple
+
+from credentials.message.msg_code import MsgCode
+
+if TYPE_CHECKING:
+    from concurrent.futures import Future
+    from credentials.config.config_manager import ConfigManager
+    from credentials.credentials import Credentials
+
+# Batch mode shared by the *_json commands: one JSON request per input line,
+# one compact JSON result per output line, written as soon as it is ready.
+# Every result carries "line" (input line number) and the request "id", if any,
+# because with --workers > 1 results come back in completion order.
+
+Handler = Callable[ [ Dict[ str, Any ] ], Dict[ str, Any ] ]
+
+def dumps_compact( data: Dict[ str, Any ] ) -> str:
+    """Single-line JSON (NDJSON record)."""
+    return json.dumps( data, ensure_ascii=False, separators=( ',', ':' ) )
+
+def add_batch_arguments( parser ) -> None:
+    """--batch / --workers options of the JSON commands."""
+    parser.add_argument( "--batch", action="store_true", help="Ler requisições NDJSON do stdin e escrever um resultado NDJSON por linha" )
+    parser.add_argument( "--workers", type=int, default=1, help="Com --batch: número de requisições processadas em paralelo" )
+
+_thread_state = threading.local()
+
+def thread_config_manager() -> 'ConfigManager':
+    """Registry reused by the current worker thread, for handlers that only check status."""
+    if getattr( _thread_state, "config_manager", None ) is None:
+        from credentials.config.config_manager import ConfigManager
+        _thread_state.config_manager = ConfigManager()
+    return _thread_state.config_manager
+
+def thread_credentials( config_name: Optional[ str ] = None ) -> Tuple[ MsgCode, Optional[ 'Credentials' ] ]:
+    """
+    Credentials reused by the current worker thread (one registry load per thread,
+    not per request); named configs are switched with load_config().
+    """
+    # Deferred: check-only commands import this module without the crypto stack
+    from credentials.credentials import Credentials
+
+    if not config_name:
+        if getattr( _thread_state, "default", None ) is None:
+            _thread_state.default = Credentials()
+        return MsgCode.SUCCESS, _thread_state.default
+
+    if getattr( _thread_state, "named", None ) is None:
+        _thread_state.named = Credentials()
+    status = _thread_state.named.load_config( config_name )
+    return status, _thread_state.named if status == MsgCode.SUCCESS else None
+
+def _run_one( handle: Handler, line_number: int, line: str ) -> Dict[ str, Any ]:
+    try:
+        request = json.loads( line )
+        if not isinstance( request, dict ):
+            raise ValueError( "request must be a JSON object" )
+    except ValueError as e:
+        return { "line": line_number, "success": False, "error": f"Invalid request: {e}" }
+
+    try:
+        result = handle( request )
+    except Exception as e:
+        result = { "success": False, "error": f"Unexpected error: {e}" }
+
+    record = { "line": line_number }
+    if "id" in request:
+        record[ "id" ] = request[ "id" ]
+    record.update( result )
+    return record
+
+def run_batch( handle: Handler, workers: int = 1, source: Iterable[ str ] = None, sink: TextIO = None ) -> int:
+    """
+    Process NDJSON requests from source (default stdin) and stream results to sink.
+    Returns:
+        int: 0 if every request succeeded, 1 otherwise (usable as exit code).
+    """
+    source = sys.stdin if source is None else source
+    sink = sys.stdout if sink is None else sink
+    failed = False
+    write_lock = threading.Lock()
+
+    def emit( record: Dict[ str, Any ] ) -> None:
+        nonlocal failed
+        failed = failed or not record.get( "success", False )
+        with write_lock:
+            sink.write( dumps_compact( record ) + "\n" )
+            sink.flush()
+
+    requests = ( ( number, line ) for number, line in enumerate( source, 1 ) if line.strip() )
+
+    if workers <= 1:
+        for number, line in requests:
+            emit( _run_one( handle, number, line ) )
+        return 1 if failed else 0
+
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    # Bounded in-flight work: stdin is consumed as fast as workers free up
+    with ThreadPoolExecutor( max_workers=workers, thread_name_prefix="ndjson" ) as pool:
+        pending: Set[ 'Future' ] = set()
+        for number, line in requests:
+            pending.add( pool.submit( _run_one, handle, number, line ) )
+            if len( pending ) >= workers * 4:
+                done, pending = wait( pending, return_when=FIRST_COMPLETED )
+                for future in done:
+                    emit( future.result() )
+        while pending:
+            done, pending = wait( pending, return_when=FIRST_COMPLETED )
+            for future in done:
+                emit( future.result() )
+
+    return 1 if failed else 0
@@ -9,6 +9,7 @@ try:
     from credentials.credentials import Credentials
     from credentials.message.msg_code import MsgCode
     from credentials.message.msg_handler import MessageHandler
+    from credentials.commands.ndjson_batch import add_batch_arguments, run_batch, thread_credentials
 except ImportError:
     current_dir = Path(__file__).resolve().parent
     root_dir = current_dir.parent.parent
@@ -16,13 +17,29 @@ except ImportError:
     from credentials.credentials import Credentials
     from credentials.message.msg_code import MsgCode
     from credentials.message.msg_handler import MessageHandler
+    from credentials.commands.ndjson_batch import add_batch_arguments, run_batch, thread_credentials
+
+def show_request(request):
+    """Batch handler: {"config_name": "..."} (omitted = default) -> same fields as the single output."""
+    config_name = request.get("config_name")
+    status, creds = thread_credentials(config_name)
+    if status == MsgCode.SUCCESS:
+        status, data = creds.load_credentials()
+    if status != MsgCode.SUCCESS:
+        return {"success": False, "error": MessageHandler.get(status), "config": config_name or "default"}
+    return {"success": True, "config": config_name or "default", "credentials": data}
 
 #echo '{"email": "email@email.com", "password": "minhaSenha123", "username": "silvio"}' | create_cred_json
+#printf '{"config_name": "loja1"}\n{"config_name": "loja2"}\n' | show_cred_json --batch --workers 4
 def main():
     parser = argparse.ArgumentParser(description="Exibe credenciais descriptografadas no formato JSON.")
     parser.add_argument("--config_name", type=str, help="Nome da configuração salva", default=None)
+    add_batch_arguments(parser)
     args = parser.parse_args()
 
+    if args.batch:
+        sys.exit(run_batch(show_request, args.workers))
+
     try:
         creds = Credentials(config_name=args.config_name) if args.config_name else Credentials()
         status, data = creds.load_credentials()
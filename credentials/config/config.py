@@ -28,6 +28,13 @@ from credentials.message.msg_code import MsgCode
 DEFAULT_FOLDER_NAME = '.credentials'
 DEFAULT_CREDENTIALS_NAME = 'credentials.enc'
 DEFAULT_KEY_NAME = 'key.key'
+DEFAULT_SESSION_NAME = 'session.enc'
+DEFAULT_KDF_PROFILE_NAME = 'kdf.json'
+DEFAULT_VAULT_NAME = 'vault.enc'
+DEFAULT_ATTACHMENTS_FOLDER = 'attachments'
+# SQLite registry file name, next to configs_registry.json (kept here so that
+# checking for it does not import sqlite3)
+CONFIGS_REGISTRY_DB = 'configs_registry.db'
 HOME_DIR = Path.home()
 
 # Secure file permissions (read/write for owner only)
@@ -76,6 +83,36 @@ class CredentialsConfig:
         # Get key file path.
         return self._key_file
 
+    @property
+    def session_file( self ) -> Path:
+        # Get persisted browser session file path (encrypted with the same key).
+        return self._credentials_dir / DEFAULT_SESSION_NAME
+
+    @property
+    def kdf_profile_file( self ) -> Path:
+        # Get calibrated key-derivation parameters for this install (no secrets).
+        return self._credentials_dir / DEFAULT_KDF_PROFILE_NAME
+
+    @property
+    def vault_file( self ) -> Path:
+        # Get multi-entry vault path (append-only log, one encrypted record per line).
+        return self._credentials_dir / DEFAULT_VAULT_NAME
+
+    @property
+    def vault_index_file( self ) -> Path:
+        # Get vault index path (entry IDs and offsets only, no plaintext).
+        return self._credentials_dir / ( DEFAULT_VAULT_NAME + '.idx' )
+
+    @property
+    def login_digest_file( self ) -> Path:
+        # Get salted login digest path (verification without decrypting the credentials file).
+        return self._credentials_dir / ( self._credentials_name + '.digest' )
+
+    @property
+    def attachments_dir( self ) -> Path:
+        # Get directory of chunk-encrypted attachments referenced from additional_data.
+        return self._credentials_dir / DEFAULT_ATTACHMENTS_FOLDER
+
     def ensure_secure_directory( self ) -> MsgCode:
         # Ensure the credentials directory exists with secure permissions.
         # Returns:
@@ -87,7 +124,7 @@ class CredentialsConfig:
         except PermissionError:
             return MsgCode.PERMISSION_DIR_ERROR
         except OSError:
-            return MsgCode.IO__DIR_ERROR
+            return MsgCode.IO_DIR_ERROR
         except Exception:
             return MsgCode.UNKNOWN_DIR_ERROR
 
@@ -19,21 +19,56 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import atexit
 import json
 import os
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Tuple, Any
 from dataclasses import dataclass, asdict
 from datetime import datetime
 
 from credentials.message.msg_code import MsgCode
-from credentials.config.config import CredentialsConfig, SECURE_FILE_MODE, SECURE_DIR_MODE
+from credentials.config.config import CredentialsConfig, SECURE_FILE_MODE, SECURE_DIR_MODE, CONFIGS_REGISTRY_DB
+from credentials.config.status_scanner import scan_config_status, iter_config_status, DEFAULT_SCAN_WORKERS
+from credentials.config.rw_lock import ReadWriteLock
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locking, atomic replace only
+    fcntl = None
+
+if TYPE_CHECKING:
+    from credentials.config.sqlite_registry import SQLiteRegistry
 
 # EN: { Name of the file that stores the saved settings. }
 # PT: { Nome do arquivo que armazena as configurações salvas. }
 # ES: { Nombre del archivo que almacena las configuraciones guardadas. }
 CONFIGS_REGISTRY_FILE = 'configs_registry.json'
 
+# EN: { Advisory lock file serializing registry writers across processes. }
+# PT: { Arquivo de trava (advisory) que serializa os escritores do registro entre processos. }
+# ES: { Archivo de bloqueo (advisory) que serializa los escritores del registro entre procesos. }
+CONFIGS_REGISTRY_LOCK = 'configs_registry.lock'
+
+# EN: { last_used updates are buffered and written after this many lookups or seconds. }
+# PT: { Atualizações de last_used ficam em memória e são gravadas após N consultas ou segundos. }
+# ES: { Las actualizaciones de last_used se guardan tras N consultas o segundos. }
+LAST_USED_FLUSH_COUNT = 50
+LAST_USED_FLUSH_INTERVAL = 30.0
+
+# EN: { Registry storage backends. }
+# PT: { Backends de armazenamento do registro. }
+# ES: { Backends de almacenamiento del registro. }
+BACKEND_JSON = 'json'
+BACKEND_SQLITE = 'sqlite'
+
+# EN: { Environment variable selecting the registry backend ('json' or 'sqlite'). }
+# PT: { Variável de ambiente que escolhe o backend do registro ('json' ou 'sqlite'). }
+# ES: { Variable de entorno que elige el backend del registro ('json' o 'sqlite'). }
+REGISTRY_BACKEND_ENV = 'CREDENTIALS_REGISTRY_BACKEND'
+
 @dataclass
 class ConfigInfo:
     """EN: { Information for configuration records. }"""
@@ -53,13 +88,16 @@ class ConfigManager:
     """PT: { Gerenciador de arquivos das credenciais e nomes de diretórios. }"""
     """ES: { Administrador de archivos para credenciales y nombres de directorios. }"""
 
-    def __init__(self, registry_base_dir: Optional[ Path ] = None) -> None:
+    def __init__(self, registry_base_dir: Optional[ Path ] = None, backend: Optional[ str ] = None) -> None:
         """
         EN: {
             Initializes the configuration manager.
             Args:
                 registry_base_dir: Base directory to save the configuration registry
                                   (default: ~/.credentials_manager).
+                backend: 'json' or 'sqlite' (default: $CREDENTIALS_REGISTRY_BACKEND, or
+                         'sqlite' if configs_registry.db already exists, else 'json').
+                         The first SQLite open migrates an existing JSON registry.
         }
         PT: {
             Inicializa o gerenciador de configuração.
@@ -76,13 +114,51 @@ class ConfigManager:
         """
         self._registry_base_dir = registry_base_dir or ( Path.home() / '.credentials_manager' )
         self._registry_file = self._registry_base_dir / CONFIGS_REGISTRY_FILE
+        self._lock_file = self._registry_base_dir / CONFIGS_REGISTRY_LOCK
         self._configs: Dict[ str, ConfigInfo ] = {}
         
+        # EN: { In-process guard of self._configs: lookups share it, reloads and mutations are exclusive.
+        #       Other processes (and other instances) are kept out by the fcntl lock. }
+        # PT: { Proteção de self._configs no processo: consultas compartilham, recargas e alterações são exclusivas.
+        #       Outros processos (e outras instâncias) são barrados pela trava fcntl. }
+        # ES: { Protección de self._configs en el proceso: consultas compartidas, recargas y cambios exclusivos. }
+        self._rw_lock = ReadWriteLock()
+        
+        # EN: { (mtime_ns, inode, size) of the registry as last loaded/written by this instance. }
+        # PT: { (mtime_ns, inode, tamanho) do registro na última leitura/escrita desta instância. }
+        # ES: { (mtime_ns, inodo, tamaño) del registro en la última lectura/escritura de esta instancia. }
+        self._registry_signature: Optional[ Tuple[ int, int, int ] ] = None
+        
+        # EN: { Write-behind buffer of last_used timestamps (name -> ISO timestamp). }
+        # PT: { Buffer write-behind dos timestamps de last_used (nome -> ISO). }
+        # ES: { Búfer write-behind de los timestamps de last_used (nombre -> ISO). }
+        self._pending_last_used: Dict[ str, str ] = {}
+        self._pending_updates = 0
+        self._pending_lock = threading.Lock()
+        self._flush_timer: Optional[ threading.Timer ] = None
+        self._atexit_registered = False
+        
         # EN: { Initializes the directory and loads existing configurations. }
         # PT: { Inicializa o diretório e carrega as configurações existentes. }
         # ES: { Inicializa el directorio y carga las configuraciones existentes. }
         self._initialize_registry()
-        self._load_configs()
+        self._db: Optional[ 'SQLiteRegistry' ] = None
+        
+        db_file = self._registry_base_dir / CONFIGS_REGISTRY_DB
+        backend = backend or os.environ.get( REGISTRY_BACKEND_ENV ) or ( BACKEND_SQLITE if db_file.exists() else BACKEND_JSON )
+        if backend == BACKEND_SQLITE:
+            # EN: { Imported here: the JSON backend never pays for sqlite3. }
+            # PT: { Importado aqui: o backend JSON nunca paga pelo sqlite3. }
+            # ES: { Importado aquí: el backend JSON nunca paga por sqlite3. }
+            from credentials.config.sqlite_registry import SQLiteRegistry, migrate_json_registry
+            self._db = SQLiteRegistry( db_file )
+            migrate_json_registry( self._registry_file, self._db )
+        else:
+            self._reload_if_changed()
+    
+    @property
+    def backend( self ) -> str:
+        return BACKEND_SQLITE if self._db is not None else BACKEND_JSON
     
     def _initialize_registry(self) -> MsgCode:
         """EN: { Initializes the configuration registry directory. }"""
@@ -98,39 +174,231 @@ class ConfigManager:
         except Exception:
             return MsgCode.UNKNOWN_DIR_ERROR
     
+    def _file_signature( self ) -> Optional[ Tuple[ int, int, int ] ]:
+        try:
+            st = os.stat( self._registry_file )
+            return ( st.st_mtime_ns, st.st_ino, st.st_size )
+        except OSError:
+            return None
+    
+    @contextmanager
+    def _registry_lock( self, exclusive: bool ) -> Iterator[ None ]:
+        """EN: { Advisory fcntl lock: shared for readers, exclusive for writers. }"""
+        """PT: { Trava fcntl: compartilhada para leitura, exclusiva para escrita. }"""
+        """ES: { Bloqueo fcntl: compartido para lectura, exclusivo para escritura. }"""
+        if fcntl is None:
+            yield
+            return
+        
+        fd = os.open( self._lock_file, os.O_RDWR | os.O_CREAT, SECURE_FILE_MODE )
+        try:
+            fcntl.flock( fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH )
+            yield
+        finally:
+            os.close( fd )  # EN: { closing releases the lock } PT: { fechar libera a trava }
+    
     def _load_configs(self) -> MsgCode:
         """EN: { Loads saved settings from the registry file. }"""
         """PT: { Carrega configurações salvas do arquivo de registro. }"""
         """ES: { Carga la configuración guardada del archivo de registro. }"""
+        signature = self._file_signature()
+        if signature is None:
+            self._configs = {}
+            self._registry_signature = None
+            return MsgCode.SUCCESS
+        
         try:
-            if self._registry_file.exists():
-                with open( self._registry_file, 'r', encoding='utf-8' ) as f:
-                    data = json.load( f )
-                    self._configs = {
-                        name: ConfigInfo( **config_data ) 
-                        for name, config_data in data.items()
-                    }
+            with open( self._registry_file, 'r', encoding='utf-8' ) as f:
+                data = json.load( f )
+            self._configs = {
+                name: ConfigInfo( **config_data ) 
+                for name, config_data in data.items()
+            }
+            self._registry_signature = signature
+            # EN: { Buffered last_used values are not on disk yet: keep them over the reloaded ones. }
+            # PT: { Valores de last_used em buffer ainda não estão no disco: prevalecem sobre os recarregados. }
+            # ES: { Los last_used en búfer aún no están en disco: prevalecen sobre los recargados. }
+            with self._pending_lock:
+                self._apply_last_used( dict( self._pending_last_used ) )
             return MsgCode.SUCCESS
-        except ( FileNotFoundError, json.JSONDecodeError ):
-            # EN: { If the file does not exist or is corrupted, it starts with empty configs. }
-            # PT: { Se o arquivo não existir ou estiver corrompido, ele começará com configurações vazias. }
-            # EN: { Si el archivo no existe o está corrupto, comenzará con la configuración vacía. }
+        except FileNotFoundError:
             self._configs = {}
+            self._registry_signature = None
             return MsgCode.SUCCESS
+        except ( json.JSONDecodeError, TypeError ):
+            # EN: { Writes are atomic, so a corrupt file was edited by hand: keep what is in memory. }
+            # PT: { As escritas são atômicas; arquivo corrompido foi editado à mão: mantém o que está em memória. }
+            # ES: { Las escrituras son atómicas; un archivo corrupto fue editado a mano: se mantiene la memoria. }
+            return MsgCode.CONFIG_INVALID
         except Exception:
             return MsgCode.UNKNOWN_CREDENTIALS_FILE_ERROR
     
+    def _reload_if_changed( self ) -> None:
+        """EN: { Re-reads the registry only if another process replaced it (one stat call). }"""
+        """PT: { Relê o registro somente se outro processo o substituiu (uma chamada stat). }"""
+        """ES: { Relee el registro solo si otro proceso lo reemplazó (una llamada stat). }"""
+        if self._file_signature() != self._registry_signature:
+            with self._rw_lock.write_locked(), self._registry_lock( exclusive=False ):
+                # EN: { Another thread may have reloaded while this one waited. }
+                # PT: { Outra thread pode ter recarregado enquanto esta esperava. }
+                if self._file_signature() != self._registry_signature:
+                    self._load_configs()
+    
     def _save_configs(self) -> MsgCode:
-        """Saves settings to registry file."""
+        """Saves settings to registry file (caller holds the exclusive lock)."""
+        # EN: { Pending last_used values go out with any full write; they leave the buffer once the file is replaced. }
+        # PT: { Valores pendentes de last_used são gravados junto com qualquer escrita completa e saem do buffer após a substituição. }
+        # ES: { Los last_used pendientes se escriben junto con cualquier escritura completa y salen del búfer tras el reemplazo. }
+        with self._pending_lock:
+            written = dict( self._pending_last_used )
+        self._apply_last_used( written )
+        
+        tmp_file = self._registry_file.with_name( f"{self._registry_file.name}.{os.getpid()}.{threading.get_ident()}.tmp" )
         try:
             data = { name: asdict( config ) for name, config in self._configs.items() }
-            with open( self._registry_file, 'w', encoding='utf-8' ) as f:
+            fd = os.open( tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, SECURE_FILE_MODE )
+            with os.fdopen( fd, 'w', encoding='utf-8' ) as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
-            os.chmod( self._registry_file, SECURE_FILE_MODE )
+                f.flush()
+                os.fsync( f.fileno() )
+            # EN: { Atomic replace: readers never see a half-written registry. }
+            # PT: { Substituição atômica: leitores nunca veem um registro pela metade. }
+            # ES: { Reemplazo atómico: los lectores nunca ven un registro a medias. }
+            os.replace( tmp_file, self._registry_file )
+            self._discard_pending( written )
+            self._fsync_directory()
+            self._registry_signature = self._file_signature()
             return MsgCode.SUCCESS
         except Exception:
+            try:
+                tmp_file.unlink()
+            except OSError:
+                pass
             return MsgCode.UNKNOWN_CREATE_CREDENTIALS_FILE_ERROR
     
+    def _apply_last_used( self, timestamps: Dict[ str, str ] ) -> None:
+        """EN: { Applies last_used values to self._configs, never moving a timestamp backwards. }"""
+        """PT: { Aplica valores de last_used em self._configs, sem nunca retroceder um timestamp. }"""
+        for name, timestamp in timestamps.items():
+            config_info = self._configs.get( name )
+            if config_info is not None and ( config_info.last_used or '' ) < timestamp:
+                config_info.last_used = timestamp
+    
+    def _discard_pending( self, written: Dict[ str, str ] ) -> None:
+        """EN: { Drops written values from the buffer; newer lookups made meanwhile stay pending. }"""
+        """PT: { Remove do buffer os valores gravados; consultas mais novas feitas nesse meio-tempo continuam pendentes. }"""
+        with self._pending_lock:
+            for name, timestamp in written.items():
+                if self._pending_last_used.get( name ) == timestamp:
+                    del self._pending_last_used[ name ]
+            self._pending_updates = len( self._pending_last_used )
+    
+    def _fsync_directory( self ) -> None:
+        # EN: { Makes the rename itself durable. } PT: { Torna o próprio rename durável. }
+        try:
+            dir_fd = os.open( self._registry_base_dir, os.O_RDONLY )
+        except OSError:
+            return
+        try:
+            os.fsync( dir_fd )
+        except OSError:
+            pass
+        finally:
+            os.close( dir_fd )
+    
+    def _update_registry( self, apply: Callable[ [], MsgCode ] ) -> MsgCode:
+        """
+        EN: {
+            Read-modify-write under the exclusive lock: reloads the registry if another
+            process changed it, applies the change and writes atomically, so concurrent
+            writers never lose each other's updates.
+            Args:
+                apply: Function that changes self._configs and returns a MsgCode.
+        }
+        PT: {
+            Leitura-modificação-escrita sob a trava exclusiva: recarrega o registro se
+            outro processo o alterou, aplica a mudança e grava de forma atômica.
+        }
+        ES: {
+            Lectura-modificación-escritura bajo el bloqueo exclusivo.
+        }
+        """
+        with self._rw_lock.write_locked(), self._registry_lock( exclusive=True ):
+            if self._file_signature() != self._registry_signature:
+                self._load_configs()
+            
+            status = apply()
+            if status != MsgCode.SUCCESS:
+                return status
+            
+            save_status = self._save_configs()
+            if save_status != MsgCode.SUCCESS:
+                # EN: { Back to what is on disk. } PT: { Volta ao que está em disco. }
+                self._load_configs()
+            return save_status
+    
+    def _touch_last_used( self, name: str ) -> None:
+        """EN: { Buffers a last_used update; flushes after N updates or on the timer. }"""
+        """PT: { Registra last_used em memória; grava após N atualizações ou pelo timer. }"""
+        """ES: { Registra last_used en memoria; escribe tras N actualizaciones o por el temporizador. }"""
+        timestamp = datetime.now().isoformat()
+        with self._rw_lock.write_locked():
+            if name in self._configs:
+                self._configs[ name ].last_used = timestamp
+        
+        with self._pending_lock:
+            self._pending_last_used[ name ] = timestamp
+            self._pending_updates += 1
+            pending = self._pending_updates
+            
+            if not self._atexit_registered:
+                atexit.register( self.flush )
+                self._atexit_registered = True
+            
+            if self._flush_timer is None and pending < LAST_USED_FLUSH_COUNT:
+                self._flush_timer = threading.Timer( LAST_USED_FLUSH_INTERVAL, self.flush )
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        if pending >= LAST_USED_FLUSH_COUNT:
+            self.flush()
+    
+    def flush( self ) -> MsgCode:
+        """
+        EN: {
+            Writes buffered last_used updates to the registry in one atomic replace.
+            The registry is re-read first so that entries changed by other processes
+            are kept; only last_used values newer than the stored ones are applied.
+            Returns:
+                MsgCode: Status of the operation (SUCCESS if nothing was pending).
+        }
+        PT: {
+            Grava as atualizações de last_used pendentes no registro em uma única substituição atômica.
+            O registro é relido antes, preservando alterações de outros processos.
+        }
+        ES: {
+            Escribe las actualizaciones de last_used pendientes en una sola sustitución atómica.
+        }
+        """
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            pending = dict( self._pending_last_used )
+        
+        if not pending:
+            return MsgCode.SUCCESS
+        
+        if self._db is not None:
+            status = self._db.set_last_used( pending )
+            if status == MsgCode.SUCCESS:
+                self._discard_pending( pending )
+            return status
+        
+        # EN: { _save_configs writes the pending values and clears them only after the replace. }
+        # PT: { _save_configs grava os valores pendentes e só os limpa após a substituição. }
+        return self._update_registry( lambda: MsgCode.SUCCESS )
+    
     def register_config(
         self,
         name: str,
@@ -184,9 +452,6 @@ class ConfigManager:
                     - CredentialsConfig: Configuración creada (o None en caso de error).
         }
         """
-        if name in self._configs:
-            return MsgCode.CONFIG_ALREADY_EXISTS, None
-        
         # EN: { Creates the configuration. }
         # PT: { Cria a configuração. }
         # ES: { Crea la configuración. }
@@ -210,30 +475,35 @@ class ConfigManager:
             description=description
         )
         
-        #EN: { Receives the configuration. }
-        #PT: { Recebe a configuração. }
-        #ES: { { Recibe la configuración. }
-        self._configs[ name ] = config_info
+        if self._db is not None:
+            insert_status = self._db.insert( asdict( config_info ) )
+            return ( MsgCode.SUCCESS, config ) if insert_status == MsgCode.SUCCESS else ( insert_status, None )
         
-        #EN: { Save to file. }
-        #PT: { Salva no arquivo. }
-        #ES: { Almacena en archivo. }
-        save_status = self._save_configs()
+        #EN: { Receives the configuration (the duplicate check sees other processes' entries). }
+        #PT: { Recebe a configuração (a checagem de duplicata vê as entradas de outros processos). }
+        #ES: { { Recibe la configuración (la verificación de duplicados ve otros procesos). }
+        def apply() -> MsgCode:
+            if name in self._configs:
+                return MsgCode.CONFIG_ALREADY_EXISTS
+            self._configs[ name ] = config_info
+            return MsgCode.SUCCESS
+        
+        #EN: { Save to file; on failure the in-memory registry is reloaded from disk. }
+        #PT: { Salva no arquivo; em caso de falha o registro em memória é recarregado do disco. }
+        #ES: { Almacena en archivo; si falla, el registro en memoria se recarga del disco. }
+        save_status = self._update_registry( apply )
         if save_status != MsgCode.SUCCESS:
-            #EN { Delete from memory if you cannot save. }
-            #PT { Remove da memória se não conseguir salvar. }
-            #ES { Eliminar de la memoria si no se puede almacenar. }
-            del self._configs[ name ]
             return save_status, None
         
         return MsgCode.SUCCESS, config
     
-    def get_config( self, name: str ) -> Tuple[ MsgCode, Optional[ CredentialsConfig ] ]:
+    def get_config( self, name: str, touch: bool = True ) -> Tuple[ MsgCode, Optional[ CredentialsConfig ] ]:
         """
         EN: {
             Gets a configuration by name.
             Arguments:
                 name: Configuration name.
+                touch: Record the lookup in last_used (False for status checks).
             Returns:
                 Tuple containing:
                     - MsgCode: Operation status
@@ -243,6 +513,7 @@ class ConfigManager:
             Obtém uma configuração pelo nome.
             Argumentos:
                 name: Nome da configuração.
+                touch: Registra a consulta em last_used (False para verificações de status).
             Retornos:
                 Tuple contendo:
                     - MsgCode: Status da operação
@@ -252,22 +523,22 @@ class ConfigManager:
             Obtiene una configuración por nombre.
             Argumentos:
                 name: Nombre de la configuración.
+                touch: Registra la consulta en last_used (False para verificaciones de estado).
             Devuelve:
                 Tupla que contiene:
                     - MsgCode: Estado de la operación
                     - CredentialsConfig: Configuración (o Ninguna si no se encuentra).
         }
         """
-        if name not in self._configs:
+        config_info = self._lookup( name )
+        if config_info is None:
             return MsgCode.CONFIG_NOT_FOUND, None
         
-        config_info = self._configs[ name ]
-        
-        # EN: { Update last used. }
-        # PT: { Atualiza o último uso. }
-        # ES: { Actualizar último uso. }
-        config_info.last_used = datetime.now().isoformat()
-        self._save_configs()
+        # EN: { Update last used (write-behind: no disk write on lookup). }
+        # PT: { Atualiza o último uso (write-behind: consulta não escreve em disco). }
+        # ES: { Actualizar último uso (write-behind: la consulta no escribe en disco). }
+        if touch:
+            self._touch_last_used( name )
         
         #EN: { Creates and returns the configuration. }
         #PT: { Cria e retorna a configuração. }
@@ -294,7 +565,73 @@ class ConfigManager:
                 Lista de informações das configurações
         }
         """
-        return list( self._configs.values() )
+        if self._db is not None:
+            return [ self._with_pending( ConfigInfo( **row ) ) for row in self._db.all() ]
+        self._reload_if_changed()
+        with self._rw_lock.read_locked():
+            return list( self._configs.values() )
+    
+    def find_configs(
+        self,
+        base_directory: Optional[ str ] = None,
+        used_since: Optional[ str ] = None,
+        unused_since: Optional[ str ] = None,
+        limit: Optional[ int ] = None
+    ) -> List[ ConfigInfo ]:
+        """
+        EN: {
+            Queries configurations by base_directory and last_used (ISO timestamps).
+            Indexed in the SQLite backend; a linear filter in the JSON backend.
+            Pending last_used updates are flushed first so the result is consistent.
+            Args:
+                base_directory: Exact base directory.
+                used_since: Only configs used at or after this timestamp.
+                unused_since: Only configs never used or last used before this timestamp.
+                limit: Maximum number of results (most recently used first).
+        }
+        PT: {
+            Consulta configurações por base_directory e last_used (timestamps ISO).
+            Indexada no backend SQLite; filtro linear no backend JSON.
+        }
+        """
+        self.flush()
+        if self._db is not None:
+            rows = self._db.find( base_directory, used_since, unused_since, limit )
+            return [ ConfigInfo( **row ) for row in rows ]
+        
+        results = [
+            info for info in self.list_configs()
+            if ( base_directory is None or info.base_directory == base_directory )
+            and ( used_since is None or ( info.last_used or '' ) >= used_since )
+            and ( unused_since is None or info.last_used is None or info.last_used < unused_since )
+        ]
+        results.sort( key=lambda info: info.last_used or '', reverse=True )
+        return results if limit is None else results[ :limit ]
+    
+    def get_config_info( self, name: str ) -> Optional[ ConfigInfo ]:
+        """EN: { Registry entry of a configuration (None if unknown); does not touch last_used. }"""
+        """PT: { Entrada do registro de uma configuração (None se desconhecida); não altera last_used. }"""
+        """ES: { Entrada del registro de una configuración (None si no existe); no altera last_used. }"""
+        return self._lookup( name )
+    
+    def _lookup( self, name: str ) -> Optional[ ConfigInfo ]:
+        """EN: { Single config by name from the active backend. }"""
+        """PT: { Uma configuração pelo nome no backend ativo. }"""
+        if self._db is not None:
+            row = self._db.get( name )
+            return self._with_pending( ConfigInfo( **row ) ) if row else None
+        self._reload_if_changed()
+        with self._rw_lock.read_locked():
+            return self._configs.get( name )
+    
+    def _with_pending( self, info: ConfigInfo ) -> ConfigInfo:
+        # EN: { Buffered last_used is newer than what the database has. }
+        # PT: { O last_used em buffer é mais novo que o do banco. }
+        with self._pending_lock:
+            pending = self._pending_last_used.get( info.name )
+        if pending and ( info.last_used or '' ) < pending:
+            info.last_used = pending
+        return info
     
     def remove_config(self, name: str) -> MsgCode:
         """
@@ -304,11 +641,16 @@ class ConfigManager:
         Returns:
             MsgCode: Status da operação
         """
-        if name not in self._configs:
-            return MsgCode.CONFIG_NOT_FOUND
+        if self._db is not None:
+            return self._db.delete( name )
+        
+        def apply() -> MsgCode:
+            if name not in self._configs:
+                return MsgCode.CONFIG_NOT_FOUND
+            del self._configs[name]
+            return MsgCode.SUCCESS
         
-        del self._configs[name]
-        return self._save_configs()
+        return self._update_registry( apply )
     
     def check_config_exists(self, name: str) -> Tuple[MsgCode, bool, Optional[Dict[str, bool]]]:
         """
@@ -321,41 +663,48 @@ class ConfigManager:
                 - bool: Se a configuração está registrada
                 - dict: Status dos arquivos (directory_exists, credentials_exists, key_exists)
         """
-        if name not in self._configs:
+        config_info = self._lookup( name )
+        if config_info is None:
             return MsgCode.CONFIG_NOT_FOUND, False, None
-        
-        config_info = self._configs[name]
-        base_path = Path(config_info.base_directory)
-        credentials_dir = base_path / config_info.folder_name
-        credentials_file = credentials_dir / config_info.credentials_filename
-        key_file = credentials_dir / config_info.key_filename
-        
-        status = {
-            'directory_exists': credentials_dir.exists() and credentials_dir.is_dir(),
-            'credentials_exists': credentials_file.exists() and credentials_file.is_file(),
-            'key_exists': key_file.exists() and key_file.is_file()
-        }
-        
-        return MsgCode.SUCCESS, True, status
+
+        return MsgCode.SUCCESS, True, scan_config_status(config_info)
     
-    def check_all_configs(self) -> Dict[str, Dict[str, Any]]:
+    def iter_config_status(self, max_workers: int = DEFAULT_SCAN_WORKERS) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Verifica todas as configurações em paralelo e entrega (nome, status) à medida que
+        cada diretório é varrido, no mesmo formato de check_all_configs.
+        Args:
+            max_workers: Número máximo de threads de varredura
+        """
+        for config_info, file_status in iter_config_status(self.list_configs(), max_workers):
+            yield config_info.name, {
+                'registered': True,
+                'status_code': MsgCode.SUCCESS,
+                'files': file_status,
+                'config_info': config_info
+            }
+    
+    def check_all_configs(self, max_workers: int = DEFAULT_SCAN_WORKERS) -> Dict[str, Dict[str, Any]]:
         """
         Verifica o status de todas as configurações registradas.
+        Args:
+            max_workers: Número máximo de threads de varredura
         Returns:
             Dicionário com informações de status de cada configuração
         """
-        results = {}
+        configs = self.list_configs()
+        scanned = {info.name: files for info, files in iter_config_status(configs, max_workers)}
         
-        for name in self._configs:
-            status_code, exists, file_status = self.check_config_exists(name)
-            results[name] = {
-                'registered': exists,
-                'status_code': status_code,
-                'files': file_status,
-                'config_info': self._configs[name]
+        # Mantém a ordem do registro, independente da ordem de conclusão
+        return {
+            info.name: {
+                'registered': True,
+                'status_code': MsgCode.SUCCESS,
+                'files': scanned[info.name],
+                'config_info': info
             }
-        
-        return results
+            for info in configs
+        }
     
     def update_config_description(self, name: str, description: str) -> MsgCode:
         """
@@ -366,8 +715,13 @@ class ConfigManager:
         Returns:
             MsgCode: Status da operação
         """
-        if name not in self._configs:
-            return MsgCode.CONFIG_NOT_FOUND
+        if self._db is not None:
+            return self._db.set_description( name, description )
+        
+        def apply() -> MsgCode:
+            if name not in self._configs:
+                return MsgCode.CONFIG_NOT_FOUND
+            self._configs[name].description = description
+            return MsgCode.SUCCESS
         
-        self._configs[name].description = description
-        return self._save_configs()
\ No newline at end of file
+        return self._update_registry( apply )
\ No newline at end of file
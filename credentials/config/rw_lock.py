@@ -0,0 +1,100 @@
+# ==============================================
+# authenticator/config/rw_lock.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+class ReadWriteLock:
+    # In-process reader/writer lock: many readers or one writer.
+    # Waiting writers block new readers, so a steady read load cannot starve them.
+    # Re-entrant per thread: a reader may read again, a writer may read or write again.
+    # A reader asking for the write lock raises RuntimeError instead of deadlocking.
+
+    def __init__( self ) -> None:
+        self._cond = threading.Condition( threading.Lock() )
+        self._readers: Dict[ int, int ] = {}
+        self._writer: Optional[ int ] = None
+        self._write_depth = 0
+        self._waiting_writers = 0
+
+    def acquire_read( self ) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me or me in self._readers:
+                self._readers[ me ] = self._readers.get( me, 0 ) + 1
+                return
+            while self._writer is not None or self._waiting_writers:
+                self._cond.wait()
+            self._readers[ me ] = 1
+
+    def release_read( self ) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            depth = self._readers[ me ] - 1
+            if depth:
+                self._readers[ me ] = depth
+                return
+            del self._readers[ me ]
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write( self ) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+                return
+            if me in self._readers:
+                raise RuntimeError( 'cannot upgrade a read lock to a write lock' )
+            self._waiting_writers += 1
+            try:
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+            finally:
+                self._waiting_writers -= 1
+            self._writer = me
+            self._write_depth = 1
+
+    def release_write( self ) -> None:
+        with self._cond:
+            if self._writer != threading.get_ident():
+                raise RuntimeError( 'write lock not held by this thread' )
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def read_locked( self ) -> Iterator[ None ]:
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked( self ) -> Iterator[ None ]:
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
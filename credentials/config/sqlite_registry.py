@@ -0,0 +1,253 @@
+# ==============================================
+# authenticator/config/sqlite_registry.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from credentials.message.msg_code import MsgCode
+from credentials.config.config import SECURE_FILE_MODE
+
+# EN: { Columns, in ConfigInfo field order. }
+# PT: { Colunas, na ordem dos campos de ConfigInfo. }
+# ES: { Columnas, en el orden de los campos de ConfigInfo. }
+COLUMNS = ( 'name', 'base_directory', 'folder_name', 'credentials_filename',
+            'key_filename', 'created_at', 'last_used', 'description' )
+
+# EN: { PRAGMA user_version once the JSON registry has been imported (it is imported only once). }
+# PT: { PRAGMA user_version depois que o registro JSON foi importado (a importação ocorre uma única vez). }
+# ES: { PRAGMA user_version cuando el registro JSON ya fue importado (se importa una sola vez). }
+JSON_MIGRATED_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS configs (
+    name                 TEXT PRIMARY KEY,
+    base_directory       TEXT NOT NULL,
+    folder_name          TEXT NOT NULL,
+    credentials_filename TEXT NOT NULL,
+    key_filename         TEXT NOT NULL,
+    created_at           TEXT NOT NULL,
+    last_used            TEXT,
+    description          TEXT
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_configs_base_directory ON configs ( base_directory );
+CREATE INDEX IF NOT EXISTS idx_configs_last_used ON configs ( last_used );
+"""
+
+class SQLiteRegistry:
+    """EN: { SQLite storage for ConfigManager: indexed lookups and transactional updates. }"""
+    """PT: { Armazenamento SQLite do ConfigManager: consultas indexadas e atualizações transacionais. }"""
+    """ES: { Almacenamiento SQLite del ConfigManager: búsquedas indexadas y actualizaciones transaccionales. }"""
+
+    def __init__( self, db_file: Path ) -> None:
+        """
+        EN: {
+            Opens (or creates, with owner-only permissions) the registry database.
+            WAL mode lets many processes read while one writes; busy_timeout makes
+            concurrent writers wait instead of failing.
+        }
+        PT: {
+            Abre (ou cria, com permissão só do dono) o banco do registro. O modo WAL permite
+            vários processos lendo enquanto um escreve.
+        }
+        """
+        self._db_file = Path( db_file )
+        if not self._db_file.exists():
+            os.close( os.open( self._db_file, os.O_WRONLY | os.O_CREAT, SECURE_FILE_MODE ) )
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect( str( self._db_file ), timeout=10.0, check_same_thread=False, isolation_level=None )
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute( 'PRAGMA journal_mode=WAL' )
+        self._conn.execute( 'PRAGMA synchronous=NORMAL' )
+        self._conn.executescript( _SCHEMA )
+
+    @property
+    def db_file( self ) -> Path:
+        return self._db_file
+
+    def close( self ) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _query( self, sql: str, params: Iterable[ Any ] = () ) -> List[ Dict[ str, Any ] ]:
+        with self._lock:
+            return [ dict( row ) for row in self._conn.execute( sql, tuple( params ) ) ]
+
+    def _transaction( self, statements: Iterable[ tuple ] ) -> List[ int ]:
+        """EN: { Runs statements atomically (BEGIN IMMEDIATE) and returns each rowcount. }"""
+        """PT: { Executa os comandos de forma atômica e retorna o rowcount de cada um. }"""
+        with self._lock:
+            self._conn.execute( 'BEGIN IMMEDIATE' )
+            try:
+                counts = []
+                for sql, params in statements:
+                    if params and isinstance( params[ 0 ], ( list, tuple ) ):
+                        counts.append( self._conn.executemany( sql, params ).rowcount )
+                    else:
+                        counts.append( self._conn.execute( sql, params ).rowcount )
+                self._conn.execute( 'COMMIT' )
+                return counts
+            except Exception:
+                self._conn.execute( 'ROLLBACK' )
+                raise
+
+    def count( self ) -> int:
+        return self._query( 'SELECT COUNT(*) AS n FROM configs' )[ 0 ][ 'n' ]
+
+    def get( self, name: str ) -> Optional[ Dict[ str, Any ] ]:
+        rows = self._query( 'SELECT * FROM configs WHERE name = ?', ( name, ) )
+        return rows[ 0 ] if rows else None
+
+    def all( self ) -> List[ Dict[ str, Any ] ]:
+        return self._query( 'SELECT * FROM configs ORDER BY name' )
+
+    def names( self ) -> List[ str ]:
+        return [ row[ 'name' ] for row in self._query( 'SELECT name FROM configs ORDER BY name' ) ]
+
+    def find(
+        self,
+        base_directory: Optional[ str ] = None,
+        used_since: Optional[ str ] = None,
+        unused_since: Optional[ str ] = None,
+        limit: Optional[ int ] = None
+    ) -> List[ Dict[ str, Any ] ]:
+        """
+        EN: {
+            Indexed queries by base_directory and last_used (ISO timestamps compare as text).
+            Args:
+                base_directory: Exact base directory.
+                used_since: Only configs with last_used >= this timestamp.
+                unused_since: Only configs never used or with last_used < this timestamp.
+                limit: Maximum number of rows (most recently used first).
+        }
+        PT: { Consultas indexadas por base_directory e last_used. }
+        """
+        clauses, params = [], []
+        if base_directory is not None:
+            clauses.append( 'base_directory = ?' )
+            params.append( base_directory )
+        if used_since is not None:
+            clauses.append( 'last_used >= ?' )
+            params.append( used_since )
+        if unused_since is not None:
+            clauses.append( '( last_used IS NULL OR last_used < ? )' )
+            params.append( unused_since )
+
+        sql = 'SELECT * FROM configs'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join( clauses )
+        sql += ' ORDER BY last_used DESC, name'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append( int( limit ) )
+        return self._query( sql, params )
+
+    def insert( self, row: Dict[ str, Any ] ) -> MsgCode:
+        try:
+            self._transaction( [ (
+                f"INSERT INTO configs ( {', '.join( COLUMNS )} ) VALUES ( {', '.join( '?' * len( COLUMNS ) )} )",
+                tuple( row.get( column ) for column in COLUMNS )
+            ) ] )
+            return MsgCode.SUCCESS
+        except sqlite3.IntegrityError:
+            return MsgCode.CONFIG_ALREADY_EXISTS
+        except sqlite3.Error:
+            return MsgCode.UNKNOWN_CREATE_CREDENTIALS_FILE_ERROR
+
+    def delete( self, name: str ) -> MsgCode:
+        try:
+            ( deleted, ) = self._transaction( [ ( 'DELETE FROM configs WHERE name = ?', ( name, ) ) ] )
+            return MsgCode.SUCCESS if deleted else MsgCode.CONFIG_NOT_FOUND
+        except sqlite3.Error:
+            return MsgCode.UNKNOWN_CREATE_CREDENTIALS_FILE_ERROR
+
+    def set_description( self, name: str, description: Optional[ str ] ) -> MsgCode:
+        try:
+            ( updated, ) = self._transaction( [ ( 'UPDATE configs SET description = ? WHERE name = ?', ( description, name ) ) ] )
+            return MsgCode.SUCCESS if updated else MsgCode.CONFIG_NOT_FOUND
+        except sqlite3.Error:
+            return MsgCode.UNKNOWN_CREATE_CREDENTIALS_FILE_ERROR
+
+    def set_last_used( self, timestamps: Dict[ str, str ] ) -> MsgCode:
+        """EN: { Batch update in one transaction; never moves last_used backwards. }"""
+        """PT: { Atualização em lote numa transação; nunca retrocede o last_used. }"""
+        if not timestamps:
+            return MsgCode.SUCCESS
+        try:
+            self._transaction( [ (
+                'UPDATE configs SET last_used = ? WHERE name = ? AND ( last_used IS NULL OR last_used < ? )',
+                [ ( ts, name, ts ) for name, ts in timestamps.items() ]
+            ) ] )
+            return MsgCode.SUCCESS
+        except sqlite3.Error:
+            return MsgCode.UNKNOWN_CREATE_CREDENTIALS_FILE_ERROR
+
+    @property
+    def json_migrated( self ) -> bool:
+        return self._query( 'PRAGMA user_version' )[ 0 ][ 'user_version' ] >= JSON_MIGRATED_VERSION
+
+    def import_rows( self, rows: Iterable[ Dict[ str, Any ] ], mark_migrated: bool = False ) -> int:
+        """EN: { Inserts rows in one transaction, skipping names that already exist; mark_migrated records the JSON import in the same transaction. }"""
+        """PT: { Insere as linhas numa transação, ignorando nomes já existentes; mark_migrated registra a importação do JSON na mesma transação. }"""
+        values = [ tuple( row.get( column ) for column in COLUMNS ) for row in rows ]
+        statements = []
+        if values:
+            statements.append( (
+                f"INSERT OR IGNORE INTO configs ( {', '.join( COLUMNS )} ) VALUES ( {', '.join( '?' * len( COLUMNS ) )} )",
+                values
+            ) )
+        if mark_migrated:
+            statements.append( ( f'PRAGMA user_version = {JSON_MIGRATED_VERSION}', () ) )
+        if not statements:
+            return 0
+        return self._transaction( statements )[ 0 ] if values else 0
+
+def migrate_json_registry( json_file: Path, registry: SQLiteRegistry ) -> int:
+    """
+    EN: {
+        Copies every config of a JSON registry (configs_registry.json) into SQLite in a
+        single transaction, once: the database records the import (PRAGMA user_version),
+        so configs removed later are not brought back from the JSON file, which is left
+        untouched. Databases populated before the marker existed count as migrated.
+        Returns:
+            Number of configs inserted.
+    }
+    PT: {
+        Copia todas as configurações do registro JSON para o SQLite numa única transação,
+        uma única vez: o banco registra a importação, então configurações removidas depois
+        não voltam do arquivo JSON, que não é alterado.
+    }
+    """
+    if registry.json_migrated:
+        return 0
+    if registry.count():
+        registry.import_rows( [], mark_migrated=True )
+        return 0
+    try:
+        with open( json_file, 'r', encoding='utf-8' ) as f:
+            data = json.load( f )
+    except FileNotFoundError:
+        data = {}
+    return registry.import_rows( ( dict( row, name=name ) for name, row in data.items() ), mark_migrated=True )
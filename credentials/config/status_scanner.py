@@ -0,0 +1,103 @@
+# ==============================================
+# authenticator/config/status_scanner.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+# EN: { Parallel directory scans; I/O bound (NFS latency), so more threads than CPUs. }
+# PT: { Varreduras de diretório em paralelo; limitadas por I/O (latência do NFS). }
+# ES: { Escaneos de directorios en paralelo; limitados por E/S (latencia de NFS). }
+DEFAULT_SCAN_WORKERS = 16
+
+def scan_credentials_dir( credentials_dir: Path, credentials_filename: str, key_filename: str ) -> Dict[ str, bool ]:
+    """
+    EN: {
+        Status of one credentials directory with a single os.scandir() call
+        (a directory listing) instead of one stat per exists()/is_dir()/is_file().
+        Returns:
+            The same 'files' dict as ConfigManager.check_config_exists:
+            directory_exists, credentials_exists, key_exists.
+    }
+    PT: {
+        Estado de um diretório de credenciais com um único os.scandir() em vez de um
+        stat por exists()/is_dir()/is_file().
+    }
+    """
+    files = set()
+    try:
+        with os.scandir( credentials_dir ) as entries:
+            for entry in entries:
+                if entry.name in ( credentials_filename, key_filename ) and entry.is_file():
+                    files.add( entry.name )
+    except ( FileNotFoundError, NotADirectoryError, PermissionError, OSError ):
+        # EN: { Unreadable or missing directory: report it as absent. }
+        # PT: { Diretório ausente ou ilegível: reportado como inexistente. }
+        return { 'directory_exists': False, 'credentials_exists': False, 'key_exists': False }
+
+    return {
+        'directory_exists': True,
+        'credentials_exists': credentials_filename in files,
+        'key_exists': key_filename in files
+    }
+
+def scan_config_status( config_info: Any ) -> Dict[ str, bool ]:
+    """EN: { scan_credentials_dir for a ConfigInfo. } PT: { scan_credentials_dir para um ConfigInfo. }"""
+    return scan_credentials_dir(
+        Path( config_info.base_directory ) / config_info.folder_name,
+        config_info.credentials_filename,
+        config_info.key_filename
+    )
+
+def iter_config_status(
+    configs: Iterable[ Any ],
+    max_workers: int = DEFAULT_SCAN_WORKERS
+) -> Iterator[ Tuple[ Any, Dict[ str, bool ] ] ]:
+    """
+    EN: {
+        Scans many configs concurrently and yields (config_info, files) as each scan
+        finishes, so callers can stream the first results immediately. Configs that
+        share a credentials directory are scanned once.
+    }
+    PT: {
+        Varre várias configurações em paralelo e entrega (config_info, files) à medida que
+        cada varredura termina. Configurações que compartilham diretório são varridas uma vez.
+    }
+    """
+    configs = list( configs )
+    if not configs:
+        return
+
+    by_dir: Dict[ Tuple[ str, str, str ], list ] = {}
+    for info in configs:
+        key = ( str( Path( info.base_directory ) / info.folder_name ), info.credentials_filename, info.key_filename )
+        by_dir.setdefault( key, [] ).append( info )
+
+    # Deferred: single-config status checks never start a pool
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    workers = max( 1, min( max_workers, len( by_dir ) ) )
+    with ThreadPoolExecutor( max_workers=workers, thread_name_prefix='cred-scan' ) as pool:
+        futures = { pool.submit( scan_credentials_dir, Path( key[ 0 ] ), key[ 1 ], key[ 2 ] ): key for key in by_dir }
+        for future in as_completed( futures ):
+            files = future.result()
+            for info in by_dir[ futures[ future ] ]:
+                yield info, dict( files )
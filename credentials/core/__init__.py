@@ -6,7 +6,29 @@
 
 #
 
-from .credentials_checker import CredentialsChecker
-from .credentials_reader import CredentialsReader
+from importlib import import_module
 
-__all__ = [ 'CredentialsReader', 'CredentialsChecker' ]
\ No newline at end of file
+# Resolved on first access, so importing the checker does not load the reader's cryptography stack
+_LAZY_EXPORTS = {
+    'CredentialsChecker': '.credentials_checker',
+    'CredentialsReader': '.credentials_reader',
+    'CredentialsSnapshot': '.credentials_reader',
+    'SessionStore': '.session_store',
+    'CredentialsCache': '.credentials_cache',
+    'credentials_cache': '.credentials_cache',
+    'CredentialsVault': '.vault',
+    'AttachmentStore': '.attachment_store',
+}
+
+__all__ = [ 'CredentialsReader', 'CredentialsSnapshot', 'CredentialsChecker', 'SessionStore', 'CredentialsCache', 'credentials_cache', 'CredentialsVault', 'AttachmentStore' ]
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,256 @@
+# ==============================================
+# authenticator/core/agent.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import hmac
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from credentials.message.msg_code import MsgCode
+from credentials.config.config import CredentialsConfig, HOME_DIR, DEFAULT_FOLDER_NAME, SECURE_DIR_MODE
+from credentials.core.credentials_cache import CredentialsCache
+from credentials.crypto.decrypto_manager import DecryptoManager
+
+# Local credentials agent (cred-agent): unlocks once and answers get/verify over a
+# Unix socket, so CLI calls and new Credentials() skip key read and decryption.
+# Protocol: one JSON object per line in each direction.
+#   {"op": "ping"}                                  -> {"status": 0, "pid": ...}
+#   {"op": "get", "config": {...}}                  -> {"status": 0, "data": {...}}
+#   {"op": "verify", "config": {...}, "email", "password"} -> {"status": 0 | 170}
+#   {"op": "invalidate", "config": {...} | null}    -> {"status": 0}
+#   {"op": "stop"}                                  -> {"status": 0}
+
+AGENT_SOCKET_ENV = 'CREDENTIALS_AGENT_SOCK'
+AGENT_DISABLE_ENV = 'CREDENTIALS_AGENT'
+AGENT_SOCKET_NAME = 'agent.sock'
+DEFAULT_IDLE_TIMEOUT = 900.0
+CLIENT_TIMEOUT = 2.0
+MAX_REQUEST_SIZE = 64 * 1024
+
+def agent_socket_path() -> Path:
+    # Socket path: $CREDENTIALS_AGENT_SOCK or ~/.credentials/agent.sock (0700 directory).
+    return Path( os.environ.get( AGENT_SOCKET_ENV ) or HOME_DIR / DEFAULT_FOLDER_NAME / AGENT_SOCKET_NAME )
+
+def agent_enabled() -> bool:
+    # CREDENTIALS_AGENT=0 turns off transparent use of the agent.
+    return os.environ.get( AGENT_DISABLE_ENV, '1' ).lower() not in ( '0', 'false', 'off', 'no' )
+
+def _config_payload( config: CredentialsConfig ) -> Dict[ str, str ]:
+    return {
+        'credentials_dir': str( config.credentials_dir ),
+        'credentials_filename': config.credentials_file.name,
+        'key_filename': config.key_file.name
+    }
+
+def _config_from_payload( payload: Dict[ str, str ] ) -> CredentialsConfig:
+    credentials_dir = Path( payload[ 'credentials_dir' ] )
+    return CredentialsConfig(
+        base_directory=credentials_dir.parent,
+        folder_name=credentials_dir.name,
+        credentials_filename=payload[ 'credentials_filename' ],
+        key_filename=payload[ 'key_filename' ]
+    )
+
+class AgentClient:
+    # Client side of cred-agent. Every call returns None when no agent is listening,
+    # so callers fall back to reading the files themselves.
+
+    def __init__( self, socket_path: Optional[ Path ] = None, timeout: float = CLIENT_TIMEOUT ) -> None:
+        self.socket_path = Path( socket_path ) if socket_path else agent_socket_path()
+        self.timeout = timeout
+
+    def request( self, payload: Dict[ str, Any ] ) -> Optional[ Dict[ str, Any ] ]:
+        # Send one request; None if the agent is not running or does not answer.
+        if not self.socket_path.exists():
+            return None
+        try:
+            with socket.socket( socket.AF_UNIX, socket.SOCK_STREAM ) as sock:
+                sock.settimeout( self.timeout )
+                sock.connect( str( self.socket_path ) )
+                sock.sendall( json.dumps( payload ).encode() + b'\n' )
+                with sock.makefile( 'rb' ) as reply:
+                    line = reply.readline( MAX_REQUEST_SIZE * 16 )
+            return json.loads( line ) if line else None
+        except ( OSError, ValueError ):
+            return None
+
+    def ping( self ) -> bool:
+        reply = self.request( { 'op': 'ping' } )
+        return bool( reply ) and reply.get( 'status' ) == MsgCode.SUCCESS
+
+    def get( self, config: CredentialsConfig ) -> Optional[ Tuple[ MsgCode, Optional[ Dict[ str, Any ] ] ] ]:
+        # Decrypted credentials of a config, or None without agent.
+        reply = self.request( { 'op': 'get', 'config': _config_payload( config ) } )
+        if not reply or 'status' not in reply:
+            return None
+        return reply[ 'status' ], reply.get( 'data' )
+
+    def verify( self, config: CredentialsConfig, email: str, password: str ) -> Optional[ MsgCode ]:
+        reply = self.request( { 'op': 'verify', 'config': _config_payload( config ), 'email': email, 'password': password } )
+        return reply.get( 'status' ) if reply else None
+
+    def invalidate( self, config: Optional[ CredentialsConfig ] = None ) -> None:
+        # Drop the agent's copy after rewriting the files (best effort).
+        self.request( { 'op': 'invalidate', 'config': _config_payload( config ) if config else None } )
+
+    def stop( self ) -> bool:
+        return self.request( { 'op': 'stop' } ) is not None
+
+class _AgentHandler( socketserver.StreamRequestHandler ):
+
+    def handle( self ) -> None:
+        agent: 'CredentialsAgent' = self.server.agent
+        if not agent.peer_allowed( self.connection ):
+            return
+        line = self.rfile.readline( MAX_REQUEST_SIZE )
+        request = None
+        try:
+            request = json.loads( line )
+            reply = agent.handle_request( request )
+        except ( ValueError, KeyError, TypeError, AttributeError ):
+            reply = { 'status': MsgCode.CONFIG_INVALID }
+        self.wfile.write( json.dumps( reply ).encode() + b'\n' )
+        if isinstance( request, dict ) and request.get( 'op' ) == 'stop':
+            threading.Thread( target=agent.shutdown, daemon=True ).start()
+
+class _AgentServer( socketserver.ThreadingMixIn, socketserver.UnixStreamServer ):
+    daemon_threads = True
+
+class CredentialsAgent:
+    # Server side: keeps decrypted credentials in memory (per config, re-read when the
+    # files change) and wipes them after idle_timeout seconds without requests.
+
+    def __init__(
+        self,
+        socket_path: Optional[ Path ] = None,
+        idle_timeout: Optional[ float ] = DEFAULT_IDLE_TIMEOUT,
+        exit_on_idle: bool = False
+    ) -> None:
+        # Args:
+            # socket_path: Listening socket (default: agent_socket_path()).
+            # idle_timeout: Seconds without requests before the decrypted entries are dropped.
+            # exit_on_idle: Also stop the agent when idle.
+
+        self.socket_path = Path( socket_path ) if socket_path else agent_socket_path()
+        self.idle_timeout = idle_timeout
+        self.exit_on_idle = exit_on_idle
+        self._cache = CredentialsCache( ttl=None )
+        self._last_request = time.monotonic()
+        self._server: Optional[ _AgentServer ] = None
+        self._stopped = threading.Event()
+
+    def peer_allowed( self, connection: socket.socket ) -> bool:
+        # Only processes of the same user (SO_PEERCRED on Linux; elsewhere the 0600 socket).
+        if not hasattr( socket, 'SO_PEERCRED' ):
+            return True
+        try:
+            creds = connection.getsockopt( socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize( '3i' ) )
+        except OSError:
+            return False
+        _, uid, _ = struct.unpack( '3i', creds )
+        return uid == os.getuid()
+
+    def handle_request( self, request: Dict[ str, Any ] ) -> Dict[ str, Any ]:
+        self._last_request = time.monotonic()
+        op = request.get( 'op' )
+
+        if op == 'ping':
+            return { 'status': MsgCode.SUCCESS, 'pid': os.getpid(), 'entries': self._cache.stats()[ 'entries' ] }
+        if op == 'stop':
+            return { 'status': MsgCode.SUCCESS }
+        if op == 'invalidate':
+            config = request.get( 'config' )
+            self._cache.invalidate( _config_from_payload( config ) if config else None )
+            return { 'status': MsgCode.SUCCESS }
+
+        config = _config_from_payload( request[ 'config' ] )
+        status, data = self._cache.get( config, DecryptoManager( config ).load_and_decrypt_credentials )
+
+        if op == 'get':
+            return { 'status': status, 'data': data if status == MsgCode.SUCCESS else None }
+        if op == 'verify':
+            if status != MsgCode.SUCCESS or not data:
+                return { 'status': status }
+            matches = (
+                hmac.compare_digest( str( data.get( 'email' ) ).encode(), str( request.get( 'email' ) ).encode() ) &
+                hmac.compare_digest( str( data.get( 'password' ) ).encode(), str( request.get( 'password' ) ).encode() )
+            )
+            return { 'status': MsgCode.SUCCESS if matches else MsgCode.CREDENTIALS_INVALID }
+        return { 'status': MsgCode.CONFIG_INVALID }
+
+    def expire_idle( self ) -> bool:
+        # Drop decrypted entries once idle; True when the agent should also exit.
+        if not self.idle_timeout or time.monotonic() - self._last_request < self.idle_timeout:
+            return False
+        if self._cache.stats()[ 'entries' ]:
+            self._cache.invalidate()
+        return self.exit_on_idle
+
+    def _watch_idle( self ) -> None:
+        while not self._stopped.wait( min( self.idle_timeout, 5.0 ) ):
+            if self.expire_idle():
+                self.shutdown()
+                return
+
+    def start( self ) -> None:
+        # Bind the socket (owner-only) and serve in a background thread.
+        self.socket_path.parent.mkdir( mode=SECURE_DIR_MODE, parents=True, exist_ok=True )
+        if self.socket_path.exists():
+            if AgentClient( self.socket_path, timeout=0.5 ).ping():
+                raise RuntimeError( f'cred-agent already running on {self.socket_path}' )
+            self.socket_path.unlink()   # stale socket from a crashed agent
+
+        old_umask = os.umask( 0o177 )
+        try:
+            self._server = _AgentServer( str( self.socket_path ), _AgentHandler )
+        finally:
+            os.umask( old_umask )
+        self._server.agent = self
+
+        threading.Thread( target=self._server.serve_forever, name='cred-agent', daemon=True ).start()
+        if self.idle_timeout:
+            threading.Thread( target=self._watch_idle, name='cred-agent-idle', daemon=True ).start()
+
+    def serve_forever( self ) -> None:
+        # Block until stop/shutdown (starts the agent if needed).
+        if self._server is None:
+            self.start()
+        self._stopped.wait()
+
+    def shutdown( self ) -> None:
+        # Stop serving, wipe decrypted entries and remove the socket.
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._cache.invalidate()
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+        try:
+            self.socket_path.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,223 @@
+# ==============================================
+# authenticator/core/attachment_store.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import io
+import os
+import secrets
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Optional, Tuple, Union
+
+from credentials.message.msg_code import MsgCode
+from credentials.config.config import CredentialsConfig, SECURE_FILE_MODE, SECURE_DIR_MODE
+from credentials.crypto.crypto_manager import CryptoManager
+from credentials.crypto.stream_cipher import encrypt_stream, decrypt_stream, StreamCipherError, DEFAULT_CHUNK_SIZE
+
+# Reference stored in additional_data instead of the blob itself.
+ATTACHMENT_REF_KEY = '$attachment'
+
+Source = Union[ str, os.PathLike, BinaryIO ]
+
+def is_attachment_ref( value: Any ) -> bool:
+    return isinstance( value, dict ) and isinstance( value.get( ATTACHMENT_REF_KEY ), str )
+
+class AttachmentStore:
+    # Large blobs (A1 certificate PFX, documents) kept out of credentials.enc.
+    # Each attachment is its own chunk-encrypted file; credentials.enc only holds a
+    # small reference, so loading the password never reads or decrypts the blob.
+
+    def __init__( self, config: CredentialsConfig ) -> None:
+        # Initialize attachment store with configuration.
+        # Args:
+            # config: Configuration instance with file paths (same key as credentials.enc).
+
+        self._config = config
+        self._crypto_manager = CryptoManager( config )
+
+    def _path( self, attachment_id: str ) -> Path:
+        # Attachment IDs are generated hex; anything else never maps to a path.
+        if not attachment_id or not all( c in '0123456789abcdef' for c in attachment_id ):
+            raise ValueError( 'invalid attachment id' )
+        return self._config.attachments_dir / f'{attachment_id}.att'
+
+    def add( self, source: Source, chunk_size: int = DEFAULT_CHUNK_SIZE ) -> Tuple[ MsgCode, Optional[ Dict[ str, Any ] ] ]:
+        # Encrypt a file or binary stream into a new attachment.
+        # Args:
+            # source: Path or readable binary file object.
+            # chunk_size: Plaintext bytes per encrypted chunk.
+        # Returns:
+            # Tuple containing:
+                # - MsgCode: Operation status.
+                # - dict: Reference to store in additional_data (or None on failure).
+
+        status, key = self._crypto_manager.load_key()
+        if status != MsgCode.SUCCESS or not key:
+            return status or MsgCode.PROVIDED_KEY_NULL, None
+
+        attachment_id = secrets.token_hex( 16 )
+        path = self._path( attachment_id )
+        tmp_file = path.with_name( path.name + '.tmp' )
+        try:
+            self._config.attachments_dir.mkdir( mode=SECURE_DIR_MODE, parents=True, exist_ok=True )
+            fd = os.open( tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, SECURE_FILE_MODE )
+            with os.fdopen( fd, 'wb' ) as destination:
+                if isinstance( source, ( str, os.PathLike ) ):
+                    with open( source, 'rb' ) as source_file:
+                        size = encrypt_stream( key, source_file, destination, chunk_size )
+                else:
+                    size = encrypt_stream( key, source, destination, chunk_size )
+                destination.flush()
+                os.fsync( destination.fileno() )
+            os.replace( tmp_file, path )
+        except FileNotFoundError:
+            return MsgCode.ATTACHMENT_NOT_FOUND, None
+        except PermissionError:
+            return MsgCode.PERMISSION_ERROR, None
+        except OSError:
+            return MsgCode.IO_ERROR, None
+        except Exception:
+            return MsgCode.ENCRYPTION_ERROR, None
+        finally:
+            if tmp_file.exists():
+                tmp_file.unlink()
+
+        return MsgCode.SUCCESS, { ATTACHMENT_REF_KEY: attachment_id, 'size': size }
+
+    def extract( self, ref: Dict[ str, Any ], destination: Source ) -> MsgCode:
+        # Decrypt an attachment to a path or writable binary stream.
+        # A path destination is written atomically and only appears if every chunk authenticates.
+        # Returns:
+            # MsgCode: Operation status.
+
+        if not is_attachment_ref( ref ):
+            return MsgCode.ATTACHMENT_NOT_FOUND
+        status, key = self._crypto_manager.load_key()
+        if status != MsgCode.SUCCESS or not key:
+            return status or MsgCode.PROVIDED_KEY_NULL
+
+        tmp_file = None
+        try:
+            with open( self._path( ref[ ATTACHMENT_REF_KEY ] ), 'rb' ) as source:
+                if isinstance( destination, ( str, os.PathLike ) ):
+                    tmp_file = Path( f'{os.fspath( destination )}.{os.getpid()}.tmp' )
+                    fd = os.open( tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, SECURE_FILE_MODE )
+                    with os.fdopen( fd, 'wb' ) as output:
+                        decrypt_stream( key, source, output )
+                    os.replace( tmp_file, destination )
+                    tmp_file = None
+                else:
+                    decrypt_stream( key, source, destination )
+            return MsgCode.SUCCESS
+        except ( FileNotFoundError, ValueError ):
+            return MsgCode.ATTACHMENT_NOT_FOUND
+        except StreamCipherError:
+            return MsgCode.ATTACHMENT_CORRUPTED
+        except PermissionError:
+            return MsgCode.PERMISSION_ERROR
+        except OSError:
+            return MsgCode.IO_ERROR
+        finally:
+            if tmp_file is not None and tmp_file.exists():
+                tmp_file.unlink()
+
+    def read( self, ref: Dict[ str, Any ] ) -> Tuple[ MsgCode, Optional[ bytes ] ]:
+        # Decrypt an attachment into memory (e.g. PFX bytes for pkcs12.load_key_and_certificates).
+        buffer = io.BytesIO()
+        status = self.extract( ref, buffer )
+        return status, buffer.getvalue() if status == MsgCode.SUCCESS else None
+
+    def remove( self, ref: Dict[ str, Any ] ) -> MsgCode:
+        # Delete an attachment file.
+        if not is_attachment_ref( ref ):
+            return MsgCode.ATTACHMENT_NOT_FOUND
+        try:
+            self._path( ref[ ATTACHMENT_REF_KEY ] ).unlink()
+            return MsgCode.SUCCESS
+        except ( FileNotFoundError, ValueError ):
+            return MsgCode.ATTACHMENT_NOT_FOUND
+        except PermissionError:
+            return MsgCode.PERMISSION_ERROR
+        except OSError:
+            return MsgCode.IO_ERROR
+
+    def rekey( self, new_key: bytes, save_key: Callable[ [], MsgCode ], keep: Iterable[ Dict[ str, Any ] ] ) -> MsgCode:
+        # Attachment keys are derived from the credentials key: before save_key() runs, every
+        # attachment in keep is decrypted with the current key and re-encrypted under new_key
+        # into a temp file, swapped in only if the save succeeds. After a successful save every
+        # other .att file is deleted, since nothing references it any more.
+        # Args:
+            # new_key: Key about to be saved (raw Fernet key, as returned by create_key).
+            # save_key: Writes new_key to the key file; its status is returned.
+            # keep: Attachment references still present in the rewritten credentials.
+        # Returns:
+            # MsgCode: save_key() status, or the error that prevented re-encryption.
+
+        kept_ids = { ref[ ATTACHMENT_REF_KEY ] for ref in keep if is_attachment_ref( ref ) }
+        try:
+            paths = sorted( self._config.attachments_dir.glob( '*.att' ) )
+        except OSError:
+            paths = []
+        live = [ path for path in paths if path.stem in kept_ids ]
+
+        key = None
+        if live:
+            status, key = self._crypto_manager.load_key()
+            if status != MsgCode.SUCCESS or not key:
+                return status or MsgCode.PROVIDED_KEY_NULL
+
+        pending = []
+        try:
+            for path in live:
+                tmp_file = path.with_name( path.name + '.tmp' )
+                pending.append( ( tmp_file, path ) )
+                # Whole plaintext in memory: attachments are certificates and small documents
+                plaintext = io.BytesIO()
+                with open( path, 'rb' ) as source:
+                    decrypt_stream( key, source, plaintext )
+                plaintext.seek( 0 )
+                fd = os.open( tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, SECURE_FILE_MODE )
+                with os.fdopen( fd, 'wb' ) as destination:
+                    encrypt_stream( new_key, plaintext, destination )
+                    destination.flush()
+                    os.fsync( destination.fileno() )
+        except StreamCipherError:
+            status = MsgCode.ATTACHMENT_CORRUPTED
+        except PermissionError:
+            status = MsgCode.PERMISSION_ERROR
+        except OSError:
+            status = MsgCode.IO_ERROR
+        else:
+            status = save_key()
+
+        try:
+            for tmp_file, path in pending:
+                if status == MsgCode.SUCCESS:
+                    os.replace( tmp_file, path )
+                elif tmp_file.exists():
+                    tmp_file.unlink()
+            if status == MsgCode.SUCCESS:
+                for path in paths:
+                    if path.stem not in kept_ids:
+                        path.unlink( missing_ok=True )
+        except PermissionError:
+            return MsgCode.PERMISSION_ERROR
+        except OSError:
+            return MsgCode.IO_ERROR
+        return status
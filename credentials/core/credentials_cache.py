@@ -0,0 +1,161 @@
+# ==============================================
+# authenticator/core/credentials_cache.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import copy
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from credentials.message.msg_code import MsgCode
+from credentials.config.config import CredentialsConfig
+from credentials.config.rw_lock import ReadWriteLock
+
+# Default time-to-live (seconds) of a cached decryption.
+DEFAULT_CACHE_TTL = 300.0
+
+# (st_mtime_ns, st_ino, st_size) of the credentials and key files.
+FileSignature = Tuple[ Optional[ Tuple[ int, int, int ] ], Optional[ Tuple[ int, int, int ] ] ]
+
+def _file_signature( config: CredentialsConfig ) -> FileSignature:
+    # Cheap change detection: two stat() calls instead of read + decrypt.
+    signature = []
+    for path in ( config.credentials_file, config.key_file ):
+        try:
+            st = os.stat( path )
+            signature.append( ( st.st_mtime_ns, st.st_ino, st.st_size ) )
+        except OSError:
+            signature.append( None )
+    return tuple( signature )
+
+class CredentialsCache:
+    # Process-wide, thread-safe cache of decrypted credentials.
+    # Entries are keyed by the config's credentials/key file paths and are
+    # invalidated when either file changes (mtime, inode or size) or the TTL expires.
+    # Each key has a reader/writer lock: hits run concurrently, a miss loads under the
+    # write lock (one decrypt at a time), and write_locked() keeps readers out while
+    # the key and credentials files are rewritten.
+
+    def __init__( self, ttl: Optional[ float ] = DEFAULT_CACHE_TTL ) -> None:
+        # Initialize an empty cache.
+        # Args:
+            # ttl: Seconds an entry stays valid; None keeps it until the files change.
+
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: Dict[ Tuple[ str, str ], Tuple[ FileSignature, float, Dict[ str, Any ] ] ] = {}
+        self._key_locks: Dict[ Tuple[ str, str ], ReadWriteLock ] = {}
+        self._stats = { 'hits': 0, 'misses': 0, 'invalidations': 0 }
+
+    @staticmethod
+    def _key( config: CredentialsConfig ) -> Tuple[ str, str ]:
+        return ( str( config.credentials_file ), str( config.key_file ) )
+
+    def _key_lock( self, key: Tuple[ str, str ] ) -> ReadWriteLock:
+        with self._lock:
+            return self._key_locks.setdefault( key, ReadWriteLock() )
+
+    def _cached( self, key: Tuple[ str, str ], signature: FileSignature, now: float ) -> Optional[ Dict[ str, Any ] ]:
+        # Private copy of a current entry (counted as a hit), else None; stale entries are dropped.
+        with self._lock:
+            entry = self._entries.get( key )
+            if entry is None:
+                return None
+            cached_signature, loaded_at, data = entry
+            expired = self.ttl is not None and now - loaded_at > self.ttl
+            if cached_signature == signature and not expired:
+                self._stats[ 'hits' ] += 1
+                return copy.deepcopy( data )
+            del self._entries[ key ]
+            self._stats[ 'invalidations' ] += 1
+            return None
+
+    def get(
+        self,
+        config: CredentialsConfig,
+        loader: Callable[ [], Tuple[ MsgCode, Optional[ Dict[ str, Any ] ] ] ]
+    ) -> Tuple[ MsgCode, Optional[ Dict[ str, Any ] ] ]:
+        # Return cached credentials or call loader (load + decrypt) on a miss.
+        # Only successful loads are cached; failures always go back to disk.
+        # Args:
+            # config: Configuration whose files back the entry.
+            # loader: Callable returning (MsgCode, credentials dict).
+        # Returns:
+            # Tuple containing:
+                # - MsgCode: Operation status.
+                # - dict: Private copy of the credentials (or None on failure).
+
+        key = self._key( config )
+        key_lock = self._key_lock( key )
+
+        with key_lock.read_locked():
+            data = self._cached( key, _file_signature( config ), time.monotonic() )
+        if data is not None:
+            return MsgCode.SUCCESS, data
+
+        # One decrypt per config at a time: concurrent misses wait for the first one
+        with key_lock.write_locked():
+            signature = _file_signature( config )
+            now = time.monotonic()
+            data = self._cached( key, signature, now )
+            if data is not None:
+                return MsgCode.SUCCESS, data
+            with self._lock:
+                self._stats[ 'misses' ] += 1
+
+            status, data = loader()
+            if status == MsgCode.SUCCESS and data is not None:
+                with self._lock:
+                    self._entries[ key ] = ( signature, now, copy.deepcopy( data ) )
+            return status, data
+
+    @contextmanager
+    def write_locked( self, config: CredentialsConfig ) -> Iterator[ None ]:
+        # Exclusive access while the config's files are rewritten; the entry is dropped on exit.
+        # The writing thread may still call get() (e.g. read-modify-write).
+        key_lock = self._key_lock( self._key( config ) )
+        with key_lock.write_locked():
+            try:
+                yield
+            finally:
+                self.invalidate( config )
+
+    def invalidate( self, config: Optional[ CredentialsConfig ] = None ) -> None:
+        # Drop one entry (after writing its files) or the whole cache.
+        # Args:
+            # config: Configuration to drop; None clears every entry.
+
+        with self._lock:
+            if config is None:
+                dropped = len( self._entries )
+                self._entries.clear()
+            else:
+                dropped = 1 if self._entries.pop( self._key( config ), None ) else 0
+            self._stats[ 'invalidations' ] += dropped
+
+    def stats( self ) -> Dict[ str, int ]:
+        # Hit/miss/invalidation counters and current number of entries.
+        with self._lock:
+            return dict( self._stats, entries=len( self._entries ) )
+
+# Global cache shared by every Credentials/CredentialsReader in the process.
+credentials_cache = CredentialsCache()
@@ -19,8 +19,9 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import hmac
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 from credentials.message.msg_code import MsgCode
 from credentials.config.config import CredentialsConfig
@@ -42,7 +43,7 @@ class CredentialsChecker:
         try:
             if Path( self._config.credentials_dir ).is_dir():
                 return MsgCode.SUCCESS
-            return MISSING_DIR
+            return MsgCode.MISSING_DIR
         except PermissionError:
             return MsgCode.PERMISSION_DIR_ERROR
         except OSError:
@@ -93,6 +94,17 @@ class CredentialsChecker:
         except Exception:
             return MsgCode.UNKNOWN_KEY_FILE_ERROR
 
+    def check_all( self ) -> Tuple[ MsgCode, MsgCode, MsgCode ]:
+        # Directory, credentials file and key file status, in that order.
+        # Files are not checked when the directory check fails.
+        # Returns:
+            # Tuple[MsgCode, MsgCode, MsgCode]: The three status codes.
+
+        directory = self.check_directory()
+        if directory != MsgCode.SUCCESS:
+            return directory, MsgCode.CREDENTIALS_NULL, MsgCode.PROVIDED_KEY_NULL
+        return directory, self.check_credentials_file(), self.check_key_file()
+
     def verify_credentials(
         self,
         stored_credentials: Optional[ Dict [ str, Any ] ],
@@ -110,11 +122,26 @@ class CredentialsChecker:
         if not stored_credentials:
             return MsgCode.CREDENTIALS_NULL
         
-        if( stored_credentials.get( 'email' ) == email and
-            stored_credentials.get( 'password' ) == password ):
-            return MsgCode.SUCCESS
-        
-        return MsgCode.CREDENTIALS_INVALID
+        # Constant-time, and both fields always compared
+        matches = (
+            hmac.compare_digest( str( stored_credentials.get( 'email' ) ).encode(), str( email ).encode() ) &
+            hmac.compare_digest( str( stored_credentials.get( 'password' ) ).encode(), str( password ).encode() )
+        )
+        return MsgCode.SUCCESS if matches else MsgCode.CREDENTIALS_INVALID
+
+    def verify_digest( self, email: str, password: str ) -> Optional[ MsgCode ]:
+        # Verify a login against the stored salted digest (no key read, no decryption).
+        # Args:
+            # email: Email to verify.
+            # password: Password to verify.
+        # Returns:
+            # MsgCode: SUCCESS or CREDENTIALS_INVALID; None without a current digest.
+
+        # Deferred: the status commands import this module without the crypto stack
+        from credentials.crypto.login_digest import load_digest, verify_digest
+
+        record = load_digest( self._config.login_digest_file )
+        return verify_digest( record, email, password, self._config.credentials_file )
     
     def _check_file_permissions( self, file_path: Path ) -> bool:
         # Verify file has secure permissions (no group/other access).
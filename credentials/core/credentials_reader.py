@@ -19,23 +19,140 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from typing import Any, Dict, Optional, Tuple
+import copy
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple
 
 from credentials.message.msg_code import MsgCode
 from credentials.config.config import CredentialsConfig
 from credentials.core.credentials_checker import CredentialsChecker
 from credentials.crypto.decrypto_manager import DecryptoManager
+from credentials.crypto.login_digest import credentials_signature, store_digest
+from credentials.core.credentials_cache import credentials_cache
+from credentials.core.agent import AgentClient, agent_enabled
+
+# Default window (seconds) in which getters reuse the last snapshot instead of reading again.
+DEFAULT_SNAPSHOT_FRESHNESS = 2.0
+
+def _freeze( value: Any ) -> Any:
+    # Read-only copy: dicts become mappingproxy, lists become tuples.
+    if isinstance( value, dict ):
+        return MappingProxyType( { k: _freeze( v ) for k, v in value.items() } )
+    if isinstance( value, ( list, tuple ) ):
+        return tuple( _freeze( v ) for v in value )
+    return value
+
+def _thaw( value: Any ) -> Any:
+    # Plain, mutable copy of a frozen value (for the legacy getters).
+    if isinstance( value, Mapping ):
+        return { k: _thaw( v ) for k, v in value.items() }
+    if isinstance( value, tuple ):
+        return [ _thaw( v ) for v in value ]
+    return copy.copy( value )
+
+class CredentialsSnapshot( Mapping ):
+    # Immutable view of the credentials decrypted in a single read.
+
+    def __init__( self, data: Dict[ str, Any ] ) -> None:
+        self._data = _freeze( data )
+        self.taken_at = time.monotonic()
+
+    def __getitem__( self, field_name: str ) -> Any:
+        return self._data[ field_name ]
+
+    def __iter__( self ) -> Iterator[ str ]:
+        return iter( self._data )
+
+    def __len__( self ) -> int:
+        return len( self._data )
+
+    def age( self ) -> float:
+        # Seconds since the snapshot was taken.
+        return time.monotonic() - self.taken_at
+
+    def to_dict( self ) -> Dict[ str, Any ]:
+        # Plain, mutable copy of all fields.
+        return _thaw( self._data )
+
+    def __repr__( self ) -> str:
+        # Never print secrets by accident (logs, tracebacks).
+        return f"CredentialsSnapshot(fields={sorted( self._data )})"
 
 class CredentialsReader:
     # Reader for encrypted credentials with security checks.
     
-    def __init__( self, config: CredentialsConfig ) -> None:
+    def __init__(
+        self,
+        config: CredentialsConfig,
+        freshness: float = DEFAULT_SNAPSHOT_FRESHNESS,
+        agent: Optional[ AgentClient ] = None
+    ) -> None:
         # Initialize credentials reader with configuration.
         # Args:
             # config: Configuration instance with file paths.
+            # freshness: Seconds the getters reuse the last snapshot (0 = always read).
+            # agent: cred-agent client (default: the user's agent unless CREDENTIALS_AGENT=0).
 
         self._config = config
         self._decrypto_manager = DecryptoManager( config )
+        self._checker = CredentialsChecker( config )
+        self._agent = agent if agent is not None else ( AgentClient() if agent_enabled() else None )
+        self.freshness = freshness
+        self._snapshot: Optional[ CredentialsSnapshot ] = None
+    
+    def snapshot( self, max_age: Optional[ float ] = None ) -> Tuple[ MsgCode, Optional[ CredentialsSnapshot ] ]:
+        # Decrypt once and return an immutable view of every field.
+        # Args:
+            # max_age: Reuse the previous snapshot if younger than this (default: freshness).
+        # Returns:
+            # Tuple containing:
+                # - MsgCode: Operation status.
+                # - CredentialsSnapshot: Read-only credentials (or None on failure).
+
+        max_age = self.freshness if max_age is None else max_age
+        current = self._snapshot
+        if current is not None and current.age() <= max_age:
+            return MsgCode.SUCCESS, current
+
+        read_status, credentials = self._read_credentials()
+        if read_status != MsgCode.SUCCESS or not credentials:
+            return read_status, None
+
+        self._snapshot = CredentialsSnapshot( credentials )
+        return MsgCode.SUCCESS, self._snapshot
+    
+    def invalidate_snapshot( self ) -> None:
+        # Forget the last snapshot (e.g. after rewriting the credentials file).
+        self._snapshot = None
+
+    def invalidate_agent( self ) -> None:
+        # Make the cred-agent drop its copy (the file signature may not change within mtime granularity).
+        if self._agent is not None:
+            self._agent.invalidate( self._config )
+    
+    def get_fields( self, field_names: Iterable[ str ] ) -> Tuple[ MsgCode, Optional[ Mapping[ str, Any ] ] ]:
+        # Get several fields from a single decryption.
+        # Args:
+            # field_names: Names of the fields to retrieve.
+        # Returns:
+            # Tuple containing:
+                # - MsgCode: Operation status (FIELD_NOT_FOUND if any field is missing).
+                # - Mapping: Read-only mapping of the requested fields (or None on failure).
+
+        snapshot_status, snapshot = self.snapshot()
+        if snapshot_status != MsgCode.SUCCESS:
+            return snapshot_status, None
+
+        field_names = list( field_names )
+        if any( name not in snapshot for name in field_names ):
+            return MsgCode.FIELD_NOT_FOUND, None
+
+        return MsgCode.SUCCESS, MappingProxyType( { name: snapshot[ name ] for name in field_names } )
+    
+    def get_credential_field( self, field_name: str ) -> Tuple[ MsgCode, Optional[ Any ] ]:
+        # Public accessor for any field (see _get_credential_field).
+        return self._get_credential_field( field_name )
     
     def _get_credential_field( self, field_name: str ) -> Tuple[ MsgCode, Optional[ Any ] ]:
         # Get specific field from credentials.
@@ -46,14 +163,15 @@ class CredentialsReader:
                 # - MsgCode: Operation status.
                 # - Any: Field value (or None on failure).
 
-        read_status, credentials = self._read_credentials()
-        if read_status != MsgCode.SUCCESS or not credentials:
-            return read_status, None
+        # Served from the last snapshot while it is within the freshness window
+        snapshot_status, snapshot = self.snapshot()
+        if snapshot_status != MsgCode.SUCCESS:
+            return snapshot_status, None
         
-        if field_name not in credentials:
+        if field_name not in snapshot:
             return MsgCode.FIELD_NOT_FOUND, None
         
-        return MsgCode.SUCCESS, credentials[ field_name ]
+        return MsgCode.SUCCESS, _thaw( snapshot[ field_name ] )
     
     def get_username( self ) -> Tuple[ MsgCode, Optional[ str ] ]:
         # Get username from credentials.
@@ -98,7 +216,15 @@ class CredentialsReader:
                 # - MsgCode: Operation status.
                 # - dict: Decrypted credentials (or None on failure).
 
-        # Load and decrypt credentials
+        # Load and decrypt credentials (served from the process-wide cache while the files are unchanged)
+        return credentials_cache.get( self._config, self._load_credentials )
+
+    def _load_credentials( self ) -> Tuple[ MsgCode, Optional[ Dict[ str, Any ] ] ]:
+        # Ask the running cred-agent first (no key read, no decryption), else decrypt locally.
+        if self._agent is not None:
+            reply = self._agent.get( self._config )
+            if reply is not None:
+                return reply
         return self._decrypto_manager.load_and_decrypt_credentials()
 
     def verify_login( self, email: str, password: str ) -> MsgCode:
@@ -109,8 +235,23 @@ class CredentialsReader:
         # Returns:
             # MsgCode: Verification result.
 
+        if self._agent is not None:
+            status = self._agent.verify( self._config, email, password )
+            if status is not None:
+                return status
+
+        # Salted digest: no key read, no decryption
+        digest_status = self._checker.verify_digest( email, password )
+        if digest_status is not None:
+            return digest_status
+
+        signature = credentials_signature( self._config.credentials_file )
         read_status, credentials = self._read_credentials()
         if read_status != MsgCode.SUCCESS:
             return read_status
         
-        return self._checker.verify_credentials( credentials, email, password )
\ No newline at end of file
+        status = self._checker.verify_credentials( credentials, email, password )
+        if status == MsgCode.SUCCESS and signature is not None:
+            # Files written before the digest existed get one now; the next check skips decryption
+            store_digest( self._config.login_digest_file, email, password, signature )
+        return status
\ No newline at end of file
@@ -0,0 +1,174 @@
+# ==============================================
+# authenticator/core/session_store.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import json
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cryptography.fernet import Fernet
+
+from credentials.message.msg_code import MsgCode
+from credentials.config.config import CredentialsConfig, SECURE_FILE_MODE
+from credentials.crypto.crypto_manager import CryptoManager
+from credentials.crypto.decrypto_manager import DecryptoManager
+
+class SessionStore:
+    # Encrypted storage for an authenticated browser session (Playwright storage_state).
+    # Uses the same key as the credentials file; the session lives in its own file so
+    # that loading credentials never pays for decrypting cookies and localStorage.
+
+    def __init__( self, config: CredentialsConfig ) -> None:
+        # Initialize session store with configuration.
+        # Args:
+            # config: Configuration instance with file paths.
+
+        self._config = config
+        self._crypto_manager = CryptoManager( config )
+        self._decrypto_manager = DecryptoManager( config )
+
+    def save_session( self, storage_state: Dict[ str, Any ] ) -> MsgCode:
+        # Encrypt and save a storage_state (cookies and origins).
+        # Args:
+            # storage_state: Dictionary returned by BrowserContext.storage_state().
+        # Returns:
+            # MsgCode: Operation status.
+
+        if not isinstance( storage_state, dict ) or 'cookies' not in storage_state:
+            return MsgCode.SESSION_INVALID
+
+        encrypt_status, encrypted_data = self._crypto_manager.encrypt_data( {
+            'saved_at': time.time(),
+            'storage_state': storage_state
+        } )
+        if encrypt_status != MsgCode.SUCCESS or not encrypted_data:
+            return encrypt_status or MsgCode.ENCRYPTION_ERROR
+
+        # Atomic replace: a crash mid-write never leaves a truncated session behind
+        try:
+            os.replace( self._write_tmp( encrypted_data ), self._config.session_file )
+            return MsgCode.SUCCESS
+        except PermissionError:
+            return MsgCode.PERMISSION_ERROR
+        except OSError:
+            return MsgCode.IO_ERROR
+
+    def _write_tmp( self, encrypted_data: bytes ) -> Path:
+        # Write encrypted data to a temp file next to the session; the caller replaces or unlinks it.
+        tmp_file = self._config.session_file.with_name( self._config.session_file.name + '.tmp' )
+        fd = os.open( tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, SECURE_FILE_MODE )
+        with os.fdopen( fd, 'wb' ) as session_file:
+            session_file.write( encrypted_data )
+        return tmp_file
+
+    def load_session( self, max_age: Optional[ float ] = None ) -> Tuple[ MsgCode, Optional[ Dict[ str, Any ] ] ]:
+        # Load and decrypt the saved storage_state.
+        # Args:
+            # max_age: Maximum age in seconds; older sessions return SESSION_EXPIRED.
+        # Returns:
+            # Tuple containing:
+                # - MsgCode: Operation status.
+                # - dict: storage_state (or None on failure).
+
+        try:
+            with open( self._config.session_file, 'rb' ) as session_file:
+                encrypted_data = session_file.read()
+        except FileNotFoundError:
+            return MsgCode.MISSING_SESSION_FILE, None
+        except PermissionError:
+            return MsgCode.PERMISSION_ERROR, None
+        except OSError:
+            return MsgCode.IO_ERROR, None
+
+        decrypt_status, payload = self._decrypto_manager.decrypt_data( encrypted_data )
+        if decrypt_status != MsgCode.SUCCESS or not payload:
+            return decrypt_status or MsgCode.DECRYPTION_ERROR, None
+
+        storage_state = payload.get( 'storage_state' )
+        if not isinstance( storage_state, dict ):
+            return MsgCode.SESSION_INVALID, None
+
+        if max_age is not None and time.time() - payload.get( 'saved_at', 0 ) > max_age:
+            return MsgCode.SESSION_EXPIRED, None
+
+        return MsgCode.SUCCESS, storage_state
+
+    def clear_session( self ) -> MsgCode:
+        # Remove the saved session (e.g. after the server rejected it).
+        # Returns:
+            # MsgCode: Operation status.
+
+        try:
+            self._config.session_file.unlink()
+            return MsgCode.SUCCESS
+        except FileNotFoundError:
+            return MsgCode.MISSING_SESSION_FILE
+        except PermissionError:
+            return MsgCode.PERMISSION_ERROR
+        except OSError:
+            return MsgCode.IO_ERROR
+
+    def rekey( self, new_key: bytes, save_key: Callable[ [], MsgCode ] ) -> MsgCode:
+        # The session is encrypted with the credentials key: re-encrypt it under new_key before
+        # save_key() runs and swap it in only if the save succeeds. A session that cannot be
+        # decrypted is dropped with the old key (it only saves a login).
+        # Args:
+            # new_key: Key about to be saved (raw Fernet key, as returned by create_key).
+            # save_key: Writes new_key to the key file; its status is returned.
+        # Returns:
+            # MsgCode: save_key() status, or the error that prevented re-encryption.
+
+        try:
+            with open( self._config.session_file, 'rb' ) as session_file:
+                encrypted_data = session_file.read()
+        except FileNotFoundError:
+            return save_key()
+        except OSError:
+            encrypted_data = None
+
+        status, payload = self._decrypto_manager.decrypt_data( encrypted_data ) if encrypted_data else ( MsgCode.DECRYPTION_ERROR, None )
+        if status != MsgCode.SUCCESS or not payload:
+            status = save_key()
+            if status == MsgCode.SUCCESS:
+                self.clear_session()
+            return status
+
+        try:
+            tmp_file = self._write_tmp( Fernet( new_key ).encrypt( json.dumps( payload ).encode() ) )
+        except PermissionError:
+            return MsgCode.PERMISSION_ERROR
+        except OSError:
+            return MsgCode.IO_ERROR
+        except Exception:
+            return MsgCode.ENCRYPTION_ERROR
+
+        status = save_key()
+        try:
+            if status == MsgCode.SUCCESS:
+                os.replace( tmp_file, self._config.session_file )
+            else:
+                tmp_file.unlink()
+        except PermissionError:
+            return MsgCode.PERMISSION_ERROR
+        except OSError:
+            return MsgCode.IO_ERROR
+        return status
@@ -0,0 +1,405 @@
+# ==============================================
+# authenticator/core/vault.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import hmac
+import json
+import hashlib
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from cryptography.fernet import Fernet
+
+from credentials.message.msg_code import MsgCode
+from credentials.config.config import CredentialsConfig, SECURE_FILE_MODE
+from credentials.crypto.crypto_manager import CryptoManager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locking
+    fcntl = None
+
+# Vault file: append-only log, one record per line, latest record of an ID wins:
+#   <entry id> P <fernet token>\n     put (token = encrypted entry JSON)
+#   <entry id> D -\n                  delete (tombstone)
+# Entry IDs are HMAC-SHA256(key, name): neither the vault nor the index reveal names.
+
+VAULT_INDEX_VERSION = 1
+ENTRY_ID_SIZE = 32
+OP_PUT = b'P'
+OP_DELETE = b'D'
+
+# Offsets of the latest record of each ID: { entry_id: ( token_offset, token_length ) }
+VaultIndex = Dict[ str, Tuple[ int, int ] ]
+
+def _entry_id( key: bytes, name: str ) -> str:
+    # Keyed, plaintext-free ID of an entry name.
+    return hmac.new( key, b'vault-entry:' + name.encode(), hashlib.sha256 ).hexdigest()[ :ENTRY_ID_SIZE ]
+
+class CredentialsVault:
+    # Many named credential entries in one encrypted file, each encrypted separately.
+    # Reading an entry seeks to its record and decrypts only that token; writing an
+    # entry appends one record. compact() drops superseded records.
+
+    def __init__( self, config: CredentialsConfig ) -> None:
+        # Initialize vault with configuration.
+        # Args:
+            # config: Configuration instance with file paths (same key as credentials.enc).
+
+        self._config = config
+        self._crypto_manager = CryptoManager( config )
+        self._lock = threading.RLock()
+        self._index: VaultIndex = {}
+        self._indexed_size = 0
+        self._indexed_inode: Optional[ int ] = None
+
+    # ---------- IDs and locking ----------
+
+    def entry_id( self, name: str ) -> Tuple[ MsgCode, Optional[ str ] ]:
+        # Keyed, plaintext-free ID of an entry name.
+        status, key = self._crypto_manager.load_key()
+        if status != MsgCode.SUCCESS or not key:
+            return status or MsgCode.PROVIDED_KEY_NULL, None
+        return MsgCode.SUCCESS, _entry_id( key, name )
+
+    @contextmanager
+    def _file_lock( self ) -> Iterator[ None ]:
+        # Exclusive advisory lock serializing writers across processes.
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fd = os.open( str( self._config.vault_file ) + '.lock', os.O_RDWR | os.O_CREAT, SECURE_FILE_MODE )
+            try:
+                fcntl.flock( fd, fcntl.LOCK_EX )
+                yield
+            finally:
+                os.close( fd )  # closing releases the lock
+
+    # ---------- Index ----------
+
+    @staticmethod
+    def _scan( data: bytes, base: int, index: VaultIndex ) -> int:
+        # Parse complete records of data (starting at file offset base) into index.
+        # Returns the file offset after the last complete record.
+        position = 0
+        while True:
+            end = data.find( b'\n', position )
+            if end < 0:
+                return base + position
+            line = data[ position:end ]
+            entry_id, op, token = line[ :ENTRY_ID_SIZE ], line[ ENTRY_ID_SIZE + 1:ENTRY_ID_SIZE + 2 ], line[ ENTRY_ID_SIZE + 3: ]
+            if len( entry_id ) == ENTRY_ID_SIZE and op == OP_PUT and token:
+                index[ entry_id.decode( 'ascii', 'replace' ) ] = ( base + position + ENTRY_ID_SIZE + 3, len( token ) )
+            elif len( entry_id ) == ENTRY_ID_SIZE and op == OP_DELETE:
+                index.pop( entry_id.decode( 'ascii', 'replace' ), None )
+            position = end + 1
+
+    def _load_index_file( self, inode: int ) -> None:
+        # Start from the persisted index when it belongs to this vault file.
+        try:
+            saved = json.loads( self._config.vault_index_file.read_text() )
+            if saved.get( 'v' ) == VAULT_INDEX_VERSION and saved.get( 'inode' ) == inode:
+                self._index = { entry_id: tuple( span ) for entry_id, span in saved[ 'entries' ].items() }
+                self._indexed_size = int( saved[ 'size' ] )
+                self._indexed_inode = inode
+                return
+        except ( OSError, ValueError, KeyError, TypeError, AttributeError ):
+            pass
+        self._index, self._indexed_size, self._indexed_inode = {}, 0, inode
+
+    def _save_index_file( self ) -> None:
+        # Persist the index (IDs and offsets only); best effort, it is rebuilt by scanning.
+        tmp_file = self._config.vault_index_file.with_name( f'.{self._config.vault_index_file.name}.{os.getpid()}.tmp' )
+        try:
+            fd = os.open( tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, SECURE_FILE_MODE )
+            with os.fdopen( fd, 'w' ) as index_file:
+                json.dump( {
+                    'v': VAULT_INDEX_VERSION,
+                    'inode': self._indexed_inode,
+                    'size': self._indexed_size,
+                    'entries': self._index
+                }, index_file )
+            os.replace( tmp_file, self._config.vault_index_file )
+        except OSError:
+            pass
+
+    def _refresh_index( self ) -> MsgCode:
+        # Bring the index up to date, reading only bytes appended since the last scan.
+        try:
+            st = os.stat( self._config.vault_file )
+        except FileNotFoundError:
+            self._index, self._indexed_size, self._indexed_inode = {}, 0, None
+            return MsgCode.SUCCESS
+        except PermissionError:
+            return MsgCode.PERMISSION_ERROR
+        except OSError:
+            return MsgCode.IO_ERROR
+
+        if self._indexed_inode != st.st_ino or self._indexed_size > st.st_size:
+            # New or compacted vault: persisted index, else full scan
+            self._load_index_file( st.st_ino )
+            if self._indexed_size > st.st_size:
+                self._index, self._indexed_size = {}, 0
+
+        if self._indexed_size == st.st_size:
+            return MsgCode.SUCCESS
+
+        try:
+            with open( self._config.vault_file, 'rb' ) as vault_file:
+                vault_file.seek( self._indexed_size )
+                data = vault_file.read( st.st_size - self._indexed_size )
+        except PermissionError:
+            return MsgCode.PERMISSION_ERROR
+        except OSError:
+            return MsgCode.IO_ERROR
+
+        scanned = self._scan( data, self._indexed_size, self._index )
+        if scanned != self._indexed_size:
+            self._indexed_size = scanned
+            self._save_index_file()
+        return MsgCode.SUCCESS
+
+    def entry_ids( self ) -> Tuple[ MsgCode, List[ str ] ]:
+        # IDs of live entries (no decryption).
+        with self._lock:
+            status = self._refresh_index()
+            return status, sorted( self._index ) if status == MsgCode.SUCCESS else []
+
+    # ---------- Entries ----------
+
+    def _append( self, records: List[ bytes ] ) -> MsgCode:
+        # Append complete records under the writer lock.
+        with self._file_lock():
+            status = self._refresh_index()
+            if status != MsgCode.SUCCESS:
+                return status
+            try:
+                fd = os.open( self._config.vault_file, os.O_RDWR | os.O_CREAT, SECURE_FILE_MODE )
+                with os.fdopen( fd, 'r+b' ) as vault_file:
+                    # Drop a torn record left by a crash so the next one starts on its own line
+                    if os.fstat( vault_file.fileno() ).st_size > self._indexed_size:
+                        vault_file.truncate( self._indexed_size )
+                    vault_file.seek( self._indexed_size )
+                    vault_file.write( b''.join( records ) )
+                    vault_file.flush()
+                    os.fsync( vault_file.fileno() )
+            except PermissionError:
+                return MsgCode.PERMISSION_ERROR
+            except OSError:
+                return MsgCode.IO_ERROR
+            return self._refresh_index()
+
+    def put_entry(
+        self,
+        name: str,
+        username: Optional[ str ] = None,
+        email: Optional[ str ] = None,
+        password: Optional[ str ] = None,
+        additional_data: Optional[ Dict[ str, Any ] ] = None
+    ) -> MsgCode:
+        # Add or replace one entry by appending a single encrypted record.
+        # Args:
+            # name: Entry name (e.g. store or operator); only its HMAC is stored in clear.
+        # Returns:
+            # MsgCode: Operation status.
+
+        status, entry_id = self.entry_id( name )
+        if status != MsgCode.SUCCESS:
+            return status
+
+        status, token = self._crypto_manager.encrypt_data( {
+            'name': name,
+            'username': username,
+            'email': email,
+            'password': password,
+            'additional_data': additional_data or {},
+            'updated_at': time.time()
+        } )
+        if status != MsgCode.SUCCESS or not token:
+            return status or MsgCode.ENCRYPTION_ERROR
+
+        return self._append( [ entry_id.encode() + b' ' + OP_PUT + b' ' + token + b'\n' ] )
+
+    def get_entry( self, name: str ) -> Tuple[ MsgCode, Optional[ Dict[ str, Any ] ] ]:
+        # Read one entry: seek to its record and decrypt only that token.
+        # Returns:
+            # Tuple containing:
+                # - MsgCode: Operation status (ENTRY_NOT_FOUND when absent).
+                # - dict: Entry fields (or None on failure).
+
+        status, entry_id = self.entry_id( name )
+        if status != MsgCode.SUCCESS:
+            return status, None
+
+        with self._lock:
+            status = self._refresh_index()
+            if status != MsgCode.SUCCESS:
+                return status, None
+            span = self._index.get( entry_id )
+            if span is None:
+                return MsgCode.ENTRY_NOT_FOUND, None
+            try:
+                with open( self._config.vault_file, 'rb' ) as vault_file:
+                    vault_file.seek( span[ 0 ] )
+                    token = vault_file.read( span[ 1 ] )
+            except PermissionError:
+                return MsgCode.PERMISSION_ERROR, None
+            except OSError:
+                return MsgCode.IO_ERROR, None
+
+        status, fernet = self._crypto_manager._get_fernet()
+        if status != MsgCode.SUCCESS or not fernet:
+            return status or MsgCode.FERNET_NULL, None
+        try:
+            entry = json.loads( fernet.decrypt( token ).decode() )
+        except Exception:
+            return MsgCode.DECRYPTION_ERROR, None
+        if entry.get( 'name' ) != name:
+            return MsgCode.VAULT_CORRUPTED, None
+        return MsgCode.SUCCESS, entry
+
+    def remove_entry( self, name: str ) -> MsgCode:
+        # Delete one entry by appending a tombstone.
+        status, entry_id = self.entry_id( name )
+        if status != MsgCode.SUCCESS:
+            return status
+        status, ids = self.entry_ids()
+        if status != MsgCode.SUCCESS:
+            return status
+        if entry_id not in ids:
+            return MsgCode.ENTRY_NOT_FOUND
+        return self._append( [ entry_id.encode() + b' ' + OP_DELETE + b' -\n' ] )
+
+    def list_names( self ) -> Tuple[ MsgCode, List[ str ] ]:
+        # Names of all entries; decrypts every entry, use entry_ids() when IDs suffice.
+        status, fernet = self._crypto_manager._get_fernet()
+        if status != MsgCode.SUCCESS or not fernet:
+            return status or MsgCode.FERNET_NULL, []
+
+        try:
+            records = self._live_records()
+        except PermissionError:
+            return MsgCode.PERMISSION_ERROR, []
+        except OSError:
+            return MsgCode.IO_ERROR, []
+
+        names = []
+        for _, token in records:
+            try:
+                names.append( json.loads( fernet.decrypt( token ).decode() )[ 'name' ] )
+            except Exception:
+                return MsgCode.DECRYPTION_ERROR, []
+        return MsgCode.SUCCESS, sorted( names )
+
+    def _live_records( self ) -> List[ Tuple[ str, bytes ] ]:
+        # ( entry_id, token ) of every live entry, in file order.
+        with self._lock:
+            if self._refresh_index() != MsgCode.SUCCESS or not self._index:
+                return []
+            spans = sorted( self._index.items(), key=lambda item: item[ 1 ][ 0 ] )
+            with open( self._config.vault_file, 'rb' ) as vault_file:
+                records = []
+                for entry_id, ( offset, length ) in spans:
+                    vault_file.seek( offset )
+                    records.append( ( entry_id, vault_file.read( length ) ) )
+                return records
+
+    def _write_tmp( self, records: List[ Tuple[ str, bytes ] ] ) -> Path:
+        # Write PUT records to a synced temp file next to the vault; the caller replaces or unlinks it.
+        tmp_file = self._config.vault_file.with_name( f'.{self._config.vault_file.name}.{os.getpid()}.tmp' )
+        fd = os.open( tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, SECURE_FILE_MODE )
+        with os.fdopen( fd, 'wb' ) as vault_file:
+            for entry_id, token in records:
+                vault_file.write( entry_id.encode() + b' ' + OP_PUT + b' ' + token + b'\n' )
+            vault_file.flush()
+            os.fsync( vault_file.fileno() )
+        return tmp_file
+
+    def compact( self ) -> MsgCode:
+        # Rewrite the vault with only the latest record of each live entry (atomic replace).
+        with self._file_lock():
+            try:
+                os.replace( self._write_tmp( self._live_records() ), self._config.vault_file )
+            except PermissionError:
+                return MsgCode.PERMISSION_ERROR
+            except OSError:
+                return MsgCode.IO_ERROR
+            return self._refresh_index()
+
+    def rekey( self, new_key: bytes, save_key: Callable[ [], MsgCode ] ) -> MsgCode:
+        # Replace the shared key without orphaning entries: IDs and tokens depend on the key,
+        # so every live entry is decrypted with the current key and re-encrypted under new_key
+        # before save_key() runs; the re-encrypted vault replaces the old one only if it succeeds.
+        # With live entries that cannot be decrypted the key is not replaced.
+        # Args:
+            # new_key: Key about to be saved (raw Fernet key, as returned by create_key).
+            # save_key: Writes new_key to the key file; its status is returned.
+        # Returns:
+            # MsgCode: save_key() status, or the error that prevented re-encryption.
+
+        if not self._config.vault_file.exists():
+            return save_key()   # no vault yet: nothing to re-encrypt, and no lock file to leave behind
+
+        with self._file_lock():
+            try:
+                records = self._live_records()
+            except PermissionError:
+                return MsgCode.PERMISSION_ERROR
+            except OSError:
+                return MsgCode.IO_ERROR
+            if not records:
+                return save_key()
+
+            status, fernet = self._crypto_manager._get_fernet()
+            if status != MsgCode.SUCCESS or not fernet:
+                return status or MsgCode.FERNET_NULL
+            try:
+                new_fernet = Fernet( new_key )
+                rekeyed = []
+                for _, token in records:
+                    entry = json.loads( fernet.decrypt( token ).decode() )
+                    rekeyed.append( ( _entry_id( new_key, entry[ 'name' ] ), new_fernet.encrypt( json.dumps( entry ).encode() ) ) )
+            except Exception:
+                return MsgCode.DECRYPTION_ERROR
+
+            try:
+                tmp_file = self._write_tmp( rekeyed )
+            except PermissionError:
+                return MsgCode.PERMISSION_ERROR
+            except OSError:
+                return MsgCode.IO_ERROR
+
+            status = save_key()
+            try:
+                if status == MsgCode.SUCCESS:
+                    os.replace( tmp_file, self._config.vault_file )
+                else:
+                    os.unlink( tmp_file )
+            except PermissionError:
+                return MsgCode.PERMISSION_ERROR
+            except OSError:
+                return MsgCode.IO_ERROR
+            refresh_status = self._refresh_index()
+            return status if status != MsgCode.SUCCESS else refresh_status
@@ -19,18 +19,57 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import functools
+import threading
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple, List
+from typing import Any, Dict, Iterable, Mapping, Optional, Tuple, List
 
 from credentials.message.msg_code import MsgCode
 from credentials.config.config import CredentialsConfig
 from credentials.config.config_manager import ConfigManager, ConfigInfo
+from credentials.config.rw_lock import ReadWriteLock
 from credentials.core.credentials_checker import CredentialsChecker
 from credentials.crypto.crypto_manager import CryptoManager
-from credentials.core.credentials_reader import CredentialsReader
+from credentials.crypto.kdf import calibrate, save_profile, load_profile, DEFAULT_TARGET_MS
+from credentials.crypto.login_digest import credentials_signature, remove_digest, store_digest
+from credentials.core.credentials_reader import CredentialsReader, CredentialsSnapshot, DEFAULT_SNAPSHOT_FRESHNESS
+from credentials.core.session_store import SessionStore
+from credentials.core.vault import CredentialsVault
+from credentials.core.attachment_store import AttachmentStore, is_attachment_ref
+from credentials.core.credentials_cache import credentials_cache
+
+def _reading(method):
+    # Instance read lock: load_config() cannot swap the components mid-call.
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock.read_locked():
+            return method(self, *args, **kwargs)
+    return locked
+
+def _writing(method):
+    # Instance write lock: for calls that replace the config and its components.
+    @functools.wraps(method)
+    def locked(self, *args, **kwargs):
+        with self._lock.write_locked():
+            return method(self, *args, **kwargs)
+    return locked
 
 class Credentials:
-    """Core Credential Manager"""
+    """
+    Core Credential Manager
+
+    Thread safety: one instance may be shared by many threads, and threads may
+    also each build their own instance for the same files.
+    - load_config()/save_current_config() take the instance write lock; calls that use
+      more than one component take its read lock, so they never mix two configs.
+    - Rewrites of the key/credentials files (create_credentials, attachments) hold the
+      process-wide write lock of credentials_cache for those files: readers in any
+      instance see the old or the new credentials, never a new key with old data.
+    - Decrypted credentials and Fernet keys are shared process-wide (credentials_cache,
+      key_cache); concurrent cache hits do not serialize.
+    - The registry (ConfigManager) guards its in-memory state with a reader/writer lock
+      and other processes with fcntl.
+    """
 
     def __init__(
         self,
@@ -38,7 +77,8 @@ class Credentials:
         base_directory: Optional[ Path ] = None,
         folder_name: Optional[ str ] = None,
         credentials_filename: Optional[ str ] = None,
-        key_filename: Optional[ str ] = None
+        key_filename: Optional[ str ] = None,
+        snapshot_freshness: Optional[ float ] = None
     ) -> None:
         """
         Initializes the credential manager.
@@ -48,9 +88,13 @@ class Credentials:
             folder_name: Name of the credentials folder (default: .credentials)
             credentials_filename: Name of the credentials file (default: credentials.enc)
             key_filename: Name of the key file (default: key.key)
+            snapshot_freshness: Seconds the field getters reuse the last decrypted snapshot
         """
     
-        self._config_manager = ConfigManager()
+        # Registry (~/.credentials_manager) is only opened by the first registry operation
+        self._registry: Optional[ ConfigManager ] = None
+        self._registry_lock = threading.Lock()
+        self._lock = ReadWriteLock()
 
         if config_name:
             # Use saved configuration
@@ -72,8 +116,22 @@ class Credentials:
         # Initializes components
         self._checker = CredentialsChecker( self._config )
         self._crypto_manager = CryptoManager( self._config )
-        self._reader = CredentialsReader( self._config )
+        self._snapshot_freshness = DEFAULT_SNAPSHOT_FRESHNESS if snapshot_freshness is None else snapshot_freshness
+        self._reader = CredentialsReader( self._config, self._snapshot_freshness )
+        self._session_store = SessionStore( self._config )
+        self._vault = CredentialsVault( self._config )
+        self._attachments = AttachmentStore( self._config )
 
+    @property
+    def _config_manager(self) -> ConfigManager:
+        # Created on first use: explicit-path instances never create or read the registry
+        if self._registry is None:
+            with self._registry_lock:
+                if self._registry is None:
+                    self._registry = ConfigManager()
+        return self._registry
+
+    @_writing
     def save_current_config(self, name: str, description: Optional[str] = None) -> MsgCode:
         """
         Salva a configuração atual no registro.
@@ -97,6 +155,7 @@ class Credentials:
         
         return status
     
+    @_writing
     def load_config(self, name: str) -> MsgCode:
         """
         Carrega uma configuração salva.
@@ -114,7 +173,10 @@ class Credentials:
         self._current_config_name = name
         self._checker = CredentialsChecker(self._config)
         self._crypto_manager = CryptoManager(self._config)
-        self._reader = CredentialsReader(self._config)
+        self._reader = CredentialsReader(self._config, self._snapshot_freshness)
+        self._session_store = SessionStore(self._config)
+        self._vault = CredentialsVault(self._config)
+        self._attachments = AttachmentStore(self._config)
         
         return MsgCode.SUCCESS
     
@@ -126,6 +188,17 @@ class Credentials:
         """
         return self._config_manager.list_configs()
     
+    def _store_login_digest(self, credentials_data: Optional[Dict[str, Any]]) -> None:
+        # Digest salgado do login ao lado do arquivo: verify_credentials não precisa decifrar.
+        # Sem email/senha (ou se a gravação falhou) o digest antigo é removido.
+        digest_file = self._config.login_digest_file
+        if not credentials_data or credentials_data.get('email') is None or credentials_data.get('password') is None:
+            remove_digest(digest_file)
+            return
+        signature = credentials_signature(self._config.credentials_file)
+        store_digest(digest_file, credentials_data['email'], credentials_data['password'], signature)
+    
+    @_reading
     def check_config_status(self, config_name: Optional[str] = None) -> Tuple[MsgCode, Optional[Dict[str, Any]]]:
         """
         Verifica o status de uma configuração (atual ou especificada).
@@ -172,14 +245,9 @@ class Credentials:
 
     # Métodos originais mantidos para compatibilidade
     def checker(self) -> Tuple[MsgCode, MsgCode, MsgCode]:
-        msg00 = self._checker.check_directory()
-        if msg00 != MsgCode.SUCCESS:
-            return msg00, MsgCode.CREDENTIALS_NULL, MsgCode.PROVIDED_KEY_NULL
-        
-        msg01 = self._checker.check_credentials_file()
-        msg02 = self._checker.check_key_file()
-        return msg00, msg01, msg02
+        return self._checker.check_all()
 
+    @_reading
     def create_credentials(
         self,
         username: Optional[str] = None,
@@ -193,31 +261,51 @@ class Credentials:
         if ensure_status != MsgCode.SUCCESS:
             return ensure_status
         
-        # Gera e salva chave
-        key_status, key = self._crypto_manager.create_key(key_password)
-        if key_status != MsgCode.SUCCESS or not key:
-            return key_status or MsgCode.CREATE_KEY_ERROR
+        with credentials_cache.write_locked(self._config):
+            # Gera e salva chave
+            key_status, key = self._crypto_manager.create_key(key_password)
+            if key_status != MsgCode.SUCCESS or not key:
+                return key_status or MsgCode.CREATE_KEY_ERROR
         
-        save_key_status = self._crypto_manager.save_key(key)
-        if save_key_status != MsgCode.SUCCESS:
-            return save_key_status
+            # Cofre, anexos e sessão usam a mesma chave: são recifrados antes da troca e
+            # substituídos só se a nova chave for gravada; anexos que deixam de ser
+            # referenciados em additional_data são apagados
+            attachments = (additional_data or {}).get('attachments')
+            kept = list(attachments.values()) if isinstance(attachments, dict) else []
+            save_key = lambda: self._crypto_manager.save_key(key)
+            save_attachments = lambda: self._attachments.rekey(key, save_key, kept)
+            save_session = lambda: self._session_store.rekey(key, save_attachments)
+            save_key_status = self._vault.rekey(key, save_session)
+            if save_key_status != MsgCode.SUCCESS:
+                return save_key_status
         
-        # Prepara dados das credenciais
-        credentials_data = {
-            'username': username,
-            'email': email,
-            'password': password,
-            'additional_data': additional_data or {}
-        }
+            # Prepara dados das credenciais
+            credentials_data = {
+                'username': username,
+                'email': email,
+                'password': password,
+                'additional_data': additional_data or {}
+            }
         
-        # Criptografa dados
-        encrypt_status, encrypted_data = self._crypto_manager.encrypt_data(credentials_data)
-        if encrypt_status != MsgCode.SUCCESS or not encrypted_data:
-            return encrypt_status or MsgCode.ENCRYPTION_ERROR
+            return self._store_credentials(credentials_data)
+    
+    def _store_credentials(self, credentials_data: Dict[str, Any]) -> MsgCode:
+        with credentials_cache.write_locked(self._config):
+            # Criptografa dados
+            encrypt_status, encrypted_data = self._crypto_manager.encrypt_data(credentials_data)
+            if encrypt_status != MsgCode.SUCCESS or not encrypted_data:
+                return encrypt_status or MsgCode.ENCRYPTION_ERROR
         
-        # Salva dados criptografados
-        return self._crypto_manager.save_encrypted_data(encrypted_data)
+            # Salva dados criptografados; a entrada em cache deixa de valer mesmo que
+            # o mtime não mude (sistemas de arquivos com resolução grosseira)
+            save_status = self._crypto_manager.save_encrypted_data(encrypted_data)
+            self._store_login_digest(credentials_data if save_status == MsgCode.SUCCESS else None)
+            credentials_cache.invalidate(self._config)
+            self._reader.invalidate_snapshot()
+            self._reader.invalidate_agent()
+            return save_status
     
+    @_reading
     def check_config_status(self, config_name: Optional[str] = None) -> Tuple[MsgCode, Optional[Dict[str, Any]]]:
         """
         Verifica o status de uma configuração (atual ou especificada).
@@ -275,6 +363,141 @@ class Credentials:
     def get_credential_field(self, field_name: str) -> Tuple[MsgCode, Optional[Any]]:
         return self._reader.get_credential_field(field_name)
     
+    def get_fields(self, field_names: Iterable[str]) -> Tuple[MsgCode, Optional[Mapping[str, Any]]]:
+        """Vários campos com uma única decifragem (ex.: ['email', 'password'])."""
+        return self._reader.get_fields(field_names)
+    
+    def snapshot(self, max_age: Optional[float] = None) -> Tuple[MsgCode, Optional[CredentialsSnapshot]]:
+        """Visão imutável de todos os campos, reaproveitada dentro da janela de frescor."""
+        return self._reader.snapshot(max_age)
+    
+    @staticmethod
+    def cache_stats() -> Dict[str, int]:
+        """Contadores do cache de credenciais do processo (hits, misses, invalidations, entries)."""
+        return credentials_cache.stats()
+    
+    # Sessão autenticada do navegador (storage_state), cifrada com a mesma chave
+    def save_session(self, storage_state: Dict[str, Any]) -> MsgCode:
+        return self._session_store.save_session(storage_state)
+    
+    def load_session(self, max_age: Optional[float] = None) -> Tuple[MsgCode, Optional[Dict[str, Any]]]:
+        return self._session_store.load_session(max_age)
+    
+    def clear_session(self) -> MsgCode:
+        return self._session_store.clear_session()
+    
+    # Cofre com várias entradas nomeadas (lojas/operadores) num único arquivo e chave
+    def vault_put(
+        self,
+        name: str,
+        username: Optional[str] = None,
+        email: Optional[str] = None,
+        password: Optional[str] = None,
+        additional_data: Optional[Dict[str, Any]] = None
+    ) -> MsgCode:
+        """Adiciona ou substitui uma entrada (um registro anexado, sem reescrever o cofre)."""
+        return self._vault.put_entry(name, username, email, password, additional_data)
+    
+    def vault_get(self, name: str) -> Tuple[MsgCode, Optional[Dict[str, Any]]]:
+        """Lê uma entrada decifrando apenas ela."""
+        return self._vault.get_entry(name)
+    
+    def vault_remove(self, name: str) -> MsgCode:
+        return self._vault.remove_entry(name)
+    
+    def vault_names(self) -> Tuple[MsgCode, List[str]]:
+        """Nomes de todas as entradas (decifra cada uma)."""
+        return self._vault.list_names()
+    
+    def vault_compact(self) -> MsgCode:
+        """Descarta registros substituídos/removidos."""
+        return self._vault.compact()
+    
+    # Anexos grandes (certificado A1/PFX etc.): arquivo próprio cifrado em blocos;
+    # additional_data['attachments'][nome] guarda só a referência
+    @_reading
+    def add_attachment(self, name: str, source: Any) -> MsgCode:
+        """Cifra um arquivo (caminho ou stream binário) e o referencia em additional_data."""
+        with credentials_cache.write_locked(self._config):
+            status, data = self._reader._read_credentials()
+            if status != MsgCode.SUCCESS or not data:
+                return status or MsgCode.CREDENTIALS_NULL
+        
+            status, ref = self._attachments.add(source)
+            if status != MsgCode.SUCCESS:
+                return status
+        
+            attachments = data.setdefault('additional_data', {}).setdefault('attachments', {})
+            previous = attachments.get(name)
+            attachments[name] = ref
+            status = self._store_credentials(data)
+            if status != MsgCode.SUCCESS:
+                self._attachments.remove(ref)
+            elif is_attachment_ref(previous):
+                self._attachments.remove(previous)
+            return status
+    
+    def _attachment_ref(self, name: str) -> Tuple[MsgCode, Optional[Dict[str, Any]]]:
+        status, additional_data = self._reader.get_additional_data()
+        if status != MsgCode.SUCCESS:
+            return status, None
+        ref = (additional_data or {}).get('attachments', {}).get(name)
+        return (MsgCode.SUCCESS, ref) if is_attachment_ref(ref) else (MsgCode.ATTACHMENT_NOT_FOUND, None)
+    
+    @_reading
+    def get_attachment(self, name: str, destination: Any) -> MsgCode:
+        """Decifra o anexo em blocos para um caminho (gravação atômica) ou stream binário."""
+        status, ref = self._attachment_ref(name)
+        return self._attachments.extract(ref, destination) if status == MsgCode.SUCCESS else status
+    
+    @_reading
+    def read_attachment(self, name: str) -> Tuple[MsgCode, Optional[bytes]]:
+        """Conteúdo do anexo em memória (ex.: bytes do PFX)."""
+        status, ref = self._attachment_ref(name)
+        return self._attachments.read(ref) if status == MsgCode.SUCCESS else (status, None)
+    
+    @_reading
+    def remove_attachment(self, name: str) -> MsgCode:
+        with credentials_cache.write_locked(self._config):
+            status, data = self._reader._read_credentials()
+            if status != MsgCode.SUCCESS or not data:
+                return status or MsgCode.CREDENTIALS_NULL
+            ref = data.get('additional_data', {}).get('attachments', {}).pop(name, None)
+            if not is_attachment_ref(ref):
+                return MsgCode.ATTACHMENT_NOT_FOUND
+            status = self._store_credentials(data)
+            if status == MsgCode.SUCCESS:
+                self._attachments.remove(ref)
+            return status
+    
+    # Derivação de chave por senha (key_password)
+    def calibrate_kdf(
+        self,
+        target_ms: float = DEFAULT_TARGET_MS,
+        algorithm: Optional[str] = None,
+        max_memory_mib: int = 64,
+        save: bool = True
+    ) -> Tuple[MsgCode, Dict[str, Any]]:
+        """
+        Mede esta máquina e escolhe os custos do KDF para o tempo de desbloqueio alvo.
+        Com save=True grava o perfil (kdf.json) usado pelas próximas chaves criadas com senha.
+        """
+        profile = calibrate(target_ms, algorithm, max_memory_mib)
+        if not save:
+            return MsgCode.SUCCESS, profile
+        ensure_status = self._config.ensure_secure_directory()
+        if ensure_status != MsgCode.SUCCESS:
+            return ensure_status, profile
+        return save_profile(self._config.kdf_profile_file, profile), profile
+    
+    def kdf_profile(self) -> Optional[Dict[str, Any]]:
+        """Perfil de KDF calibrado desta instalação (None se nunca calibrado)."""
+        return load_profile(self._config.kdf_profile_file)
+    
+    def verify_key_password(self, key_password: str) -> MsgCode:
+        """Confere a senha da chave re-derivando com os parâmetros do cabeçalho."""
+        return self._crypto_manager.verify_key_password(key_password)
+    
     # Propriedades de configuração
     @property
     def credentials_file_path(self) -> Path:
@@ -284,6 +507,14 @@ class Credentials:
     def key_file_path(self) -> Path:
         return self._config.key_file
     
+    @property
+    def session_file_path(self) -> Path:
+        return self._config.session_file
+    
+    @property
+    def kdf_profile_path(self) -> Path:
+        return self._config.kdf_profile_file
+    
     @property
     def credentials_directory(self) -> Path:
         return self._config.credentials_dir
@@ -6,7 +6,29 @@
 
 # 
 
-from .crypto_manager import CryptoManager
-from .decrypto_manager import DecryptoManager
+from importlib import import_module
 
-__all__ = [ 'CryptoManager', 'DecryptoManager' ]
\ No newline at end of file
+# Resolved on first access, so importing e.g. crypto.kdf alone does not load Fernet
+_LAZY_EXPORTS = {
+    'CryptoManager': '.crypto_manager',
+    'DecryptoManager': '.decrypto_manager',
+    'available_kdfs': '.kdf',
+    'calibrate': '.kdf',
+    'derive_key': '.kdf',
+    'new_kdf_params': '.kdf',
+    'KeyCache': '.key_cache',
+    'key_cache': '.key_cache',
+}
+
+__all__ = [ 'CryptoManager', 'DecryptoManager', 'available_kdfs', 'calibrate', 'derive_key', 'new_kdf_params', 'KeyCache', 'key_cache' ]
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -20,16 +20,18 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import os
+import hmac
 import json
-import base64
 from typing import Any, Dict, Optional, Tuple
 
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 
 from credentials.message.msg_code import MsgCode
 from credentials.config.config import CredentialsConfig, SECURE_FILE_MODE
+from credentials.crypto.kdf import (
+    LEGACY_KDF_PARAMS, new_kdf_params, derive_key, encode_key_file, decode_key_file, load_profile
+)
+from credentials.crypto.key_cache import key_cache
 
 class CryptoManager:
     # Encryption and key management for credentials.
@@ -41,15 +43,25 @@ class CryptoManager:
 
         self._config = config
         self._fernet: Optional[ Fernet ] = None
+        # KDF header of the last key created/loaded (None for random keys)
+        self._kdf_params: Optional[ Dict[ str, Any ] ] = None
+        self._kdf_key: Optional[ bytes ] = None
     
     def __del__(self) -> None:
         # Clean up resources on deletion.
         self._fernet = None
     
-    def create_key( self, password: Optional[ str ] = None ) -> Tuple[ MsgCode, Optional[ bytes ] ]:
+    def create_key(
+        self,
+        password: Optional[ str ] = None,
+        kdf_params: Optional[ Dict[ str, Any ] ] = None
+    ) -> Tuple[ MsgCode, Optional[ bytes ] ]:
         # Generate encryption key from password or create random key.
+        # Password keys use a random per-install salt and the KDF calibrated for this
+        # terminal (kdf.json, see calibrate_kdf); save_key() stores the parameters as header.
         # Args:
             # password: Optional password for key derivation.
+            # kdf_params: Explicit KDF parameters (default: calibrated profile or defaults).
         # Returns:
             # Tuple containing:
                 # - MsgCode: Operation status.
@@ -57,17 +69,14 @@ class CryptoManager:
 
         try:
             if password:
-                # Use stable salt for consistency
-                salt = b'stable_salt_for_consistency'
-                kdf = PBKDF2HMAC(
-                    algorithm=hashes.SHA256(),
-                    length=32,
-                    salt=salt,
-                    iterations=100000
-                )
-                key = base64.urlsafe_b64encode( kdf.derive( password.encode() ) )
+                params = kdf_params or new_kdf_params( profile=load_profile( self._config.kdf_profile_file ) )
+                status, key = derive_key( password, params )
+                if status != MsgCode.SUCCESS:
+                    return status, None
+                self._kdf_params, self._kdf_key = params, key
             else:
                 key = Fernet.generate_key()
+                self._kdf_params, self._kdf_key = None, None
             
             return MsgCode.SUCCESS, key
         except Exception:
@@ -80,9 +89,12 @@ class CryptoManager:
         # Returns:
             # MsgCode: Operation status.
 
+        # Header only belongs to the key it was derived for
+        params = self._kdf_params if key == self._kdf_key else None
+
         try:
             with open( self._config.key_file, 'wb' ) as key_file:
-                key_file.write( key )
+                key_file.write( encode_key_file( key, params ) )
             os.chmod( self._config.key_file, SECURE_FILE_MODE )
             return MsgCode.SUCCESS
         except PermissionError:
@@ -91,18 +103,34 @@ class CryptoManager:
             return MsgCode.IO_KEY_ERROR
         except Exception:
             return MsgCode.SAVING_KEY_ERROR
+        finally:
+            # Same size and mtime granularity could hide the new key from the signature check
+            key_cache.invalidate( self._config.key_file )
+            self._fernet = None
     
     def load_key( self ) -> Tuple[ MsgCode, Optional[ bytes ] ]:
-        # Load encryption key from file.
+        # Load encryption key (shared process-wide cache, re-read when the file changes).
         # Returns:
             # Tuple containing:
                 # - MsgCode: Operation status.
                 # - bytes: Loaded key (or None on failure).
 
+        status, key, params = key_cache.get_key( self._config.key_file, self._read_key_file )
+        if status != MsgCode.SUCCESS:
+            return status, None
+        self._kdf_params, self._kdf_key = params, key
+        return MsgCode.SUCCESS, key
+    
+    def _read_key_file( self ) -> Tuple[ MsgCode, Optional[ Tuple[ bytes, Optional[ Dict[ str, Any ] ] ] ] ]:
+        # Read and split the key file (key_cache loader).
+        # Returns:
+            # Tuple containing:
+                # - MsgCode: Operation status.
+                # - tuple: (key, KDF header params or None), or None on failure.
+
         try:
             with open( self._config.key_file, 'rb' ) as key_file:
-                key = key_file.read()
-                return MsgCode.SUCCESS, key
+                data = key_file.read()
         except FileNotFoundError:
             return MsgCode.MISSING_KEY_FILE, None
         except PermissionError:
@@ -111,6 +139,36 @@ class CryptoManager:
             return MsgCode.IO_KEY_ERROR, None
         except Exception:
             return MsgCode.LOADING_KEY_ERROR, None
+
+        status, params, key = decode_key_file( data )
+        if status != MsgCode.SUCCESS:
+            return status, None
+        return MsgCode.SUCCESS, ( key, params )
+    
+    def load_kdf_params( self ) -> Tuple[ MsgCode, Optional[ Dict[ str, Any ] ] ]:
+        # KDF parameters stored in the key file header.
+        # Returns:
+            # Tuple containing:
+                # - MsgCode: Operation status.
+                # - dict: Header parameters (None for random or pre-header keys).
+
+        status, _ = self.load_key()
+        return status, self._kdf_params if status == MsgCode.SUCCESS else None
+    
+    def verify_key_password( self, password: str ) -> MsgCode:
+        # Re-derive the key from its password and header and compare with the stored key.
+        # Keys without header are checked against the pre-header PBKDF2 parameters.
+        # Returns:
+            # MsgCode: SUCCESS, KEY_PASSWORD_MISMATCH or error code.
+
+        status, stored_key = self.load_key()
+        if status != MsgCode.SUCCESS or not stored_key:
+            return status or MsgCode.PROVIDED_KEY_NULL
+        
+        status, key = derive_key( password, self._kdf_params or LEGACY_KDF_PARAMS )
+        if status != MsgCode.SUCCESS:
+            return status
+        return MsgCode.SUCCESS if hmac.compare_digest( key, stored_key ) else MsgCode.KEY_PASSWORD_MISMATCH
     
     def _get_fernet( self ) -> Tuple[ MsgCode, Optional[ Fernet ] ]:
         # Get Fernet instance for encryption/decryption.
@@ -119,18 +177,13 @@ class CryptoManager:
                 # - MsgCode: Operation status.
                 # - Fernet: Initialized Fernet instance (or None).
 
-        if self._fernet is not None:
-            return MsgCode.SUCCESS, self._fernet
-        
-        key_status, key = self.load_key()
-        if key_status != MsgCode.SUCCESS or not key:
-            return key_status, None
+        # Shared with every manager of the same key file; a stat() per call picks up a new key
+        status, fernet = key_cache.get_fernet( self._config.key_file, self._read_key_file )
+        if status != MsgCode.SUCCESS or not fernet:
+            return status, None
         
-        try:
-            self._fernet = Fernet( key )
-            return MsgCode.SUCCESS, self._fernet
-        except Exception:
-            return MsgCode.ENCRYPTION_FERNET_ERROR, None
+        self._fernet = fernet
+        return MsgCode.SUCCESS, fernet
     
     def encrypt_data( self, data: Dict[ str, Any ] ) -> Tuple[ MsgCode, Optional[ bytes ] ]:
         # Encrypt credentials data.
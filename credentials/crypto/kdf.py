@@ -0,0 +1,272 @@
+# ==============================================
+# authenticator/crypto/kdf.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import json
+import time
+import base64
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+try:
+    from cryptography.hazmat.primitives.kdf.argon2 import Argon2id
+except ImportError:  # cryptography < 44
+    Argon2id = None
+
+from credentials.message.msg_code import MsgCode
+from credentials.config.config import SECURE_FILE_MODE
+
+# Versioned key derivation for password-derived keys.
+# The parameters travel with the key in a one-line header of the key file:
+#   #credkdf {"v":1,"kdf":"scrypt","salt":"...","n":32768,"r":8,"p":1}\n<fernet key>
+# Key files without header (random keys and keys from older versions) load unchanged.
+
+KDF_VERSION = 1
+KDF_PBKDF2 = 'pbkdf2-sha256'
+KDF_SCRYPT = 'scrypt'
+KDF_ARGON2 = 'argon2id'
+
+KEY_HEADER_PREFIX = b'#credkdf '
+SALT_SIZE = 16
+KEY_LENGTH = 32
+DEFAULT_TARGET_MS = 150
+
+# Parameters used before the header existed (fixed salt, 100k iterations).
+LEGACY_KDF_PARAMS: Dict[ str, Any ] = {
+    'v': 0,
+    'kdf': KDF_PBKDF2,
+    'salt': base64.b64encode( b'stable_salt_for_consistency' ).decode(),
+    'iterations': 100000
+}
+
+# Defaults when the install was never calibrated.
+DEFAULT_COSTS: Dict[ str, Dict[ str, int ] ] = {
+    KDF_PBKDF2: { 'iterations': 600000 },
+    KDF_SCRYPT: { 'n': 2 ** 15, 'r': 8, 'p': 1 },
+    KDF_ARGON2: { 'iterations': 3, 'memory_cost': 64 * 1024, 'lanes': 1 }
+}
+
+# Accepted ranges; a tampered header must not make the terminal derive for minutes or run out of memory.
+COST_LIMITS: Dict[ str, Dict[ str, Tuple[ int, int ] ] ] = {
+    KDF_PBKDF2: { 'iterations': ( 1000, 50000000 ) },
+    KDF_SCRYPT: { 'n': ( 2 ** 10, 2 ** 22 ), 'r': ( 1, 32 ), 'p': ( 1, 16 ) },
+    KDF_ARGON2: { 'iterations': ( 1, 100 ), 'memory_cost': ( 8 * 1024, 4 * 1024 * 1024 ), 'lanes': ( 1, 16 ) }
+}
+
+def available_kdfs() -> List[ str ]:
+    # Key-derivation functions usable on this system.
+    kdfs = [ KDF_PBKDF2, KDF_SCRYPT ]
+    if Argon2id is not None:
+        kdfs.append( KDF_ARGON2 )
+    return kdfs
+
+def default_kdf() -> str:
+    # Strongest available function: Argon2id, otherwise scrypt.
+    return KDF_ARGON2 if Argon2id is not None else KDF_SCRYPT
+
+def _costs( params: Dict[ str, Any ] ) -> Dict[ str, int ]:
+    return { name: params[ name ] for name in COST_LIMITS[ params[ 'kdf' ] ] }
+
+def validate_params( params: Dict[ str, Any ] ) -> MsgCode:
+    # Check algorithm, salt and cost parameters of a header or profile.
+    # Returns:
+        # MsgCode: SUCCESS, KDF_UNSUPPORTED or KDF_HEADER_INVALID.
+
+    if not isinstance( params, dict ) or params.get( 'kdf' ) not in COST_LIMITS:
+        return MsgCode.KDF_HEADER_INVALID
+    if params[ 'kdf' ] not in available_kdfs():
+        return MsgCode.KDF_UNSUPPORTED
+
+    for name, ( low, high ) in COST_LIMITS[ params[ 'kdf' ] ].items():
+        value = params.get( name )
+        if not isinstance( value, int ) or isinstance( value, bool ) or not low <= value <= high:
+            return MsgCode.KDF_HEADER_INVALID
+
+    if params[ 'kdf' ] == KDF_SCRYPT and params[ 'n' ] & ( params[ 'n' ] - 1 ):
+        return MsgCode.KDF_HEADER_INVALID
+    if params[ 'kdf' ] == KDF_ARGON2 and params[ 'memory_cost' ] < 8 * params[ 'lanes' ]:
+        return MsgCode.KDF_HEADER_INVALID
+    return MsgCode.SUCCESS
+
+def new_kdf_params( algorithm: Optional[ str ] = None, profile: Optional[ Dict[ str, Any ] ] = None ) -> Dict[ str, Any ]:
+    # Parameters for a new key with a fresh random salt.
+    # Args:
+        # algorithm: KDF name (default: profile algorithm or default_kdf()).
+        # profile: Calibrated costs (see calibrate()); ignored when it is for another algorithm.
+
+    algorithm = algorithm or ( profile or {} ).get( 'kdf' ) or default_kdf()
+    costs = dict( DEFAULT_COSTS[ algorithm ] ) if algorithm in DEFAULT_COSTS else {}
+    if profile and profile.get( 'kdf' ) == algorithm:
+        costs.update( { name: profile[ name ] for name in costs if name in profile } )
+
+    params = { 'v': KDF_VERSION, 'kdf': algorithm, 'salt': base64.b64encode( os.urandom( SALT_SIZE ) ).decode() }
+    params.update( costs )
+    return params
+
+def _derive_raw( password: bytes, params: Dict[ str, Any ] ) -> bytes:
+    salt = base64.b64decode( params[ 'salt' ] )
+    if params[ 'kdf' ] == KDF_PBKDF2:
+        kdf = PBKDF2HMAC( algorithm=hashes.SHA256(), length=KEY_LENGTH, salt=salt, iterations=params[ 'iterations' ] )
+    elif params[ 'kdf' ] == KDF_SCRYPT:
+        kdf = Scrypt( salt=salt, length=KEY_LENGTH, n=params[ 'n' ], r=params[ 'r' ], p=params[ 'p' ] )
+    else:
+        kdf = Argon2id(
+            salt=salt, length=KEY_LENGTH, iterations=params[ 'iterations' ],
+            lanes=params[ 'lanes' ], memory_cost=params[ 'memory_cost' ]
+        )
+    return kdf.derive( password )
+
+def derive_key( password: str, params: Dict[ str, Any ] ) -> Tuple[ MsgCode, Optional[ bytes ] ]:
+    # Derive a Fernet key from a password.
+    # Args:
+        # password: Key password.
+        # params: Header parameters (new_kdf_params(), a key file header or LEGACY_KDF_PARAMS).
+    # Returns:
+        # Tuple containing:
+            # - MsgCode: Operation status.
+            # - bytes: urlsafe-base64 Fernet key (or None on failure).
+
+    status = validate_params( params )
+    if status != MsgCode.SUCCESS:
+        return status, None
+
+    try:
+        return MsgCode.SUCCESS, base64.urlsafe_b64encode( _derive_raw( password.encode(), params ) )
+    except ( KeyError, ValueError, TypeError ):
+        return MsgCode.KDF_HEADER_INVALID, None
+    except Exception:
+        return MsgCode.CREATE_KEY_ERROR, None
+
+def encode_key_file( key: bytes, params: Optional[ Dict[ str, Any ] ] = None ) -> bytes:
+    # Key file contents: optional KDF header line followed by the key.
+    if not params:
+        return key
+    header = json.dumps( params, sort_keys=True, separators=( ',', ':' ) ).encode()
+    return KEY_HEADER_PREFIX + header + b'\n' + key
+
+def decode_key_file( data: bytes ) -> Tuple[ MsgCode, Optional[ Dict[ str, Any ] ], Optional[ bytes ] ]:
+    # Split key file contents into header parameters and key.
+    # Returns:
+        # Tuple containing:
+            # - MsgCode: Operation status.
+            # - dict: KDF parameters (None for files without header).
+            # - bytes: Key.
+
+    if not data.startswith( KEY_HEADER_PREFIX ):
+        return MsgCode.SUCCESS, None, data
+
+    header, _, key = data[ len( KEY_HEADER_PREFIX ): ].partition( b'\n' )
+    try:
+        params = json.loads( header.decode() )
+    except ( ValueError, UnicodeDecodeError ):
+        return MsgCode.KDF_HEADER_INVALID, None, None
+    if not isinstance( params, dict ) or not key:
+        return MsgCode.KDF_HEADER_INVALID, None, None
+    return MsgCode.SUCCESS, params, key.strip()
+
+def load_profile( profile_file: Path ) -> Optional[ Dict[ str, Any ] ]:
+    # Calibrated costs of this install, or None when missing/invalid/unsupported here.
+    try:
+        profile = json.loads( Path( profile_file ).read_text() )
+    except ( OSError, ValueError ):
+        return None
+    if validate_params( profile ) != MsgCode.SUCCESS:
+        return None
+    return profile
+
+def save_profile( profile_file: Path, profile: Dict[ str, Any ] ) -> MsgCode:
+    # Persist calibrated costs (no salt, no secrets) next to the key file.
+    try:
+        profile_file = Path( profile_file )
+        tmp_file = profile_file.with_name( f'.{profile_file.name}.{os.getpid()}.tmp' )
+        tmp_file.write_text( json.dumps( profile, indent=2 ) )
+        os.chmod( tmp_file, SECURE_FILE_MODE )
+        os.replace( tmp_file, profile_file )
+        return MsgCode.SUCCESS
+    except PermissionError:
+        return MsgCode.PERMISSION_ERROR
+    except OSError:
+        return MsgCode.IO_ERROR
+
+def measure( params: Dict[ str, Any ], rounds: int = 2 ) -> float:
+    # Best-of-n derivation time in milliseconds.
+    best = float( 'inf' )
+    for _ in range( max( 1, rounds ) ):
+        start = time.perf_counter()
+        _derive_raw( b'calibration', params )
+        best = min( best, ( time.perf_counter() - start ) * 1000 )
+    return best
+
+def calibrate(
+    target_ms: float = DEFAULT_TARGET_MS,
+    algorithm: Optional[ str ] = None,
+    max_memory_mib: int = 64,
+    timer: Callable[ [ Dict[ str, Any ] ], float ] = measure
+) -> Dict[ str, Any ]:
+    # Benchmark this machine and pick the strongest costs that derive within target_ms.
+    # Args:
+        # target_ms: Desired unlock time on this machine.
+        # algorithm: KDF to calibrate (default: default_kdf()).
+        # max_memory_mib: Memory ceiling for scrypt/Argon2id.
+        # timer: Measurement function (params -> ms).
+    # Returns:
+        # Profile dict: kdf, costs, target_ms, measured_ms, calibrated_at (save with save_profile()).
+
+    algorithm = algorithm or default_kdf()
+    if algorithm not in available_kdfs():
+        raise ValueError( f'KDF not available: {algorithm}' )
+
+    params = new_kdf_params( algorithm )
+    limits = COST_LIMITS[ algorithm ]
+
+    if algorithm == KDF_PBKDF2:
+        # Linear in iterations: scale a probe measurement.
+        params[ 'iterations' ] = 100000
+        elapsed = timer( params )
+        iterations = int( params[ 'iterations' ] * target_ms / max( elapsed, 0.001 ) )
+        params[ 'iterations' ] = max( limits[ 'iterations' ][ 0 ], min( iterations, limits[ 'iterations' ][ 1 ] ) )
+    elif algorithm == KDF_SCRYPT:
+        # Memory = 128 * n * r; double n while it fits the time and memory budget.
+        params.update( n=2 ** 12, r=8, p=1 )
+        max_n = min( limits[ 'n' ][ 1 ], max_memory_mib * 1024 * 1024 // ( 128 * params[ 'r' ] ) )
+        while params[ 'n' ] * 2 <= max_n and timer( params ) * 2 <= target_ms:
+            params[ 'n' ] *= 2
+    else:
+        # Spend the budget on memory first, then on passes.
+        params.update( iterations=1, lanes=1, memory_cost=8 * 1024 )
+        max_memory = min( limits[ 'memory_cost' ][ 1 ], max_memory_mib * 1024 )
+        while params[ 'memory_cost' ] * 2 <= max_memory and timer( params ) * 2 <= target_ms:
+            params[ 'memory_cost' ] *= 2
+        elapsed = timer( params )
+        params[ 'iterations' ] = max( 1, min( int( target_ms / max( elapsed, 0.001 ) ), limits[ 'iterations' ][ 1 ] ) )
+
+    profile = { 'v': KDF_VERSION, 'kdf': algorithm }
+    profile.update( _costs( params ) )
+    profile.update(
+        target_ms=target_ms,
+        measured_ms=round( timer( params ), 1 ),
+        calibrated_at=time.strftime( '%Y-%m-%dT%H:%M:%S' )
+    )
+    return profile
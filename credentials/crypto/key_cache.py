@@ -0,0 +1,140 @@
+# ==============================================
+# authenticator/crypto/key_cache.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from cryptography.fernet import Fernet
+
+from credentials.message.msg_code import MsgCode
+
+# (st_ino, st_mtime_ns, st_size) of a key file.
+KeySignature = Optional[ Tuple[ int, int, int ] ]
+
+# Loader result: (MsgCode, (key bytes, KDF header params or None)).
+KeyLoader = Callable[ [], Tuple[ MsgCode, Optional[ Tuple[ bytes, Optional[ Dict[ str, Any ] ] ] ] ] ]
+
+def _key_signature( path: str ) -> KeySignature:
+    try:
+        st = os.stat( path )
+        return ( st.st_ino, st.st_mtime_ns, st.st_size )
+    except OSError:
+        return None
+
+class KeyCache:
+    # Process-wide, thread-safe cache of key files and their Fernet instances.
+    # Shared by every CryptoManager/DecryptoManager: the key file is read once per
+    # identity (path, inode, mtime, size) and a single Fernet is built for it.
+
+    def __init__( self ) -> None:
+        # Initialize an empty cache.
+        self._lock = threading.Lock()
+        self._entries: Dict[ str, Tuple[ KeySignature, bytes, Optional[ Dict[ str, Any ] ], Optional[ Fernet ] ] ] = {}
+        self._stats = { 'hits': 0, 'misses': 0, 'invalidations': 0 }
+
+    def _entry( self, path: str, loader: KeyLoader ) -> Tuple[ MsgCode, Optional[ tuple ] ]:
+        # Stat before reading: a file replaced in between leaves an entry with the
+        # old signature, which the next call detects and reloads.
+        signature = _key_signature( path )
+
+        with self._lock:
+            entry = self._entries.get( path )
+            if entry is not None:
+                if signature is not None and entry[ 0 ] == signature:
+                    self._stats[ 'hits' ] += 1
+                    return MsgCode.SUCCESS, entry
+                del self._entries[ path ]
+                self._stats[ 'invalidations' ] += 1
+            self._stats[ 'misses' ] += 1
+
+        status, loaded = loader()
+        if status != MsgCode.SUCCESS or not loaded or not loaded[ 0 ]:
+            return status, None
+
+        entry = ( signature, loaded[ 0 ], loaded[ 1 ], None )
+        if signature is not None:
+            with self._lock:
+                self._entries[ path ] = entry
+        return MsgCode.SUCCESS, entry
+
+    def get_key(
+        self,
+        key_file: os.PathLike,
+        loader: KeyLoader
+    ) -> Tuple[ MsgCode, Optional[ bytes ], Optional[ Dict[ str, Any ] ] ]:
+        # Key bytes and KDF header, from cache or loader on a miss.
+        # Returns:
+            # Tuple containing:
+                # - MsgCode: Operation status.
+                # - bytes: Key (or None on failure).
+                # - dict: KDF header params (None for header-less keys).
+
+        status, entry = self._entry( str( key_file ), loader )
+        if status != MsgCode.SUCCESS or entry is None:
+            return status, None, None
+        return MsgCode.SUCCESS, entry[ 1 ], entry[ 2 ]
+
+    def get_fernet( self, key_file: os.PathLike, loader: KeyLoader ) -> Tuple[ MsgCode, Optional[ Fernet ] ]:
+        # Shared Fernet for the key file, built once per key identity.
+        # Returns:
+            # Tuple containing:
+                # - MsgCode: Operation status.
+                # - Fernet: Initialized Fernet instance (or None).
+
+        path = str( key_file )
+        status, entry = self._entry( path, loader )
+        if status != MsgCode.SUCCESS or entry is None:
+            return status, None
+        if entry[ 3 ] is not None:
+            return MsgCode.SUCCESS, entry[ 3 ]
+
+        try:
+            fernet = Fernet( entry[ 1 ] )
+        except Exception:
+            return MsgCode.ENCRYPTION_FERNET_ERROR, None
+
+        with self._lock:
+            # Only attach to the entry it was built from
+            if self._entries.get( path ) is entry:
+                self._entries[ path ] = entry[ :3 ] + ( fernet, )
+        return MsgCode.SUCCESS, fernet
+
+    def invalidate( self, key_file: Optional[ os.PathLike ] = None ) -> None:
+        # Drop one key file (after writing it) or the whole cache.
+        # Args:
+            # key_file: Key file to drop; None clears every entry.
+
+        with self._lock:
+            if key_file is None:
+                dropped = len( self._entries )
+                self._entries.clear()
+            else:
+                dropped = 1 if self._entries.pop( str( key_file ), None ) else 0
+            self._stats[ 'invalidations' ] += dropped
+
+    def stats( self ) -> Dict[ str, int ]:
+        # Hit/miss/invalidation counters and current number of entries.
+        with self._lock:
+            return dict( self._stats, entries=len( self._entries ) )
+
+# Global cache shared by every CryptoManager in the process.
+key_cache = KeyCache()
@@ -0,0 +1,127 @@
+# ==============================================
+# authenticator/crypto/login_digest.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import hmac
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from credentials.message.msg_code import MsgCode
+from credentials.config.config import SECURE_FILE_MODE
+from credentials.crypto.kdf import KDF_ARGON2, KDF_PBKDF2, KDF_SCRYPT, default_kdf, derive_key, new_kdf_params, validate_params
+
+# Salted, memory-hard digest of the login (email + password), written next to the
+# credentials file when they are stored:
+#   {"v":1,"params":{"kdf":"argon2id","salt":"...",...},"digest":"...","credentials":[size, mtime_ns]}
+# verify_login checks a candidate against it without reading the key or decrypting.
+# "credentials" binds the digest to the file it was made for: a credentials file
+# replaced by other means makes the digest stale and verification falls back to decrypting.
+
+DIGEST_VERSION = 1
+
+# Lighter than the key-unlock defaults: verification runs per login attempt, not once per unlock.
+DIGEST_COSTS: Dict[ str, Dict[ str, int ] ] = {
+    KDF_PBKDF2: { 'iterations': 600000 },
+    KDF_SCRYPT: { 'n': 2 ** 14, 'r': 8, 'p': 1 },
+    KDF_ARGON2: { 'iterations': 2, 'memory_cost': 19 * 1024, 'lanes': 1 }
+}
+
+def _login_secret( email: Any, password: Any ) -> str:
+    # Unambiguous encoding: ("a", "bc") and ("ab", "c") must not collide.
+    return json.dumps( [ str( email ), str( password ) ], ensure_ascii=False )
+
+def credentials_signature( credentials_file: Path ) -> Optional[ List[ int ] ]:
+    # [size, mtime_ns] of the credentials file, or None when it cannot be read.
+    try:
+        stat = os.stat( credentials_file )
+    except OSError:
+        return None
+    return [ stat.st_size, stat.st_mtime_ns ]
+
+def create_digest( email: str, password: str, signature: List[ int ] ) -> Tuple[ MsgCode, Optional[ Dict[ str, Any ] ] ]:
+    # Digest record for a login with a fresh random salt.
+    # Args:
+        # email, password: Login being stored.
+        # signature: credentials_signature() of the file holding that login.
+
+    algorithm = default_kdf()
+    params = new_kdf_params( algorithm, { 'kdf': algorithm, **DIGEST_COSTS[ algorithm ] } )
+    status, digest = derive_key( _login_secret( email, password ), params )
+    if status != MsgCode.SUCCESS or digest is None:
+        return status, None
+    return MsgCode.SUCCESS, { 'v': DIGEST_VERSION, 'params': params, 'digest': digest.decode(), 'credentials': list( signature ) }
+
+def save_digest( digest_file: Path, record: Dict[ str, Any ] ) -> MsgCode:
+    # Atomic, owner-only write.
+    try:
+        digest_file = Path( digest_file )
+        tmp_file = digest_file.with_name( f'.{digest_file.name}.{os.getpid()}.tmp' )
+        tmp_file.write_text( json.dumps( record, separators=( ',', ':' ) ) )
+        os.chmod( tmp_file, SECURE_FILE_MODE )
+        os.replace( tmp_file, digest_file )
+        return MsgCode.SUCCESS
+    except PermissionError:
+        return MsgCode.PERMISSION_ERROR
+    except OSError:
+        return MsgCode.IO_ERROR
+
+def store_digest( digest_file: Path, email: str, password: str, signature: Optional[ List[ int ] ] ) -> MsgCode:
+    # create_digest() + save_digest(); without a signature any old digest is removed instead.
+    if signature is None:
+        remove_digest( digest_file )
+        return MsgCode.MISSING_CREDENTIALS_FILE
+    status, record = create_digest( email, password, signature )
+    if status != MsgCode.SUCCESS or record is None:
+        remove_digest( digest_file )
+        return status
+    return save_digest( digest_file, record )
+
+def remove_digest( digest_file: Path ) -> None:
+    try:
+        Path( digest_file ).unlink()
+    except OSError:
+        pass
+
+def load_digest( digest_file: Path ) -> Optional[ Dict[ str, Any ] ]:
+    # Digest record, or None when missing, malformed or for a KDF this install lacks.
+    try:
+        record = json.loads( Path( digest_file ).read_text() )
+    except ( OSError, ValueError ):
+        return None
+    if not isinstance( record, dict ) or record.get( 'v' ) != DIGEST_VERSION or not isinstance( record.get( 'digest' ), str ):
+        return None
+    if validate_params( record.get( 'params' ) ) != MsgCode.SUCCESS:
+        return None
+    return record
+
+def verify_digest( record: Optional[ Dict[ str, Any ] ], email: str, password: str, credentials_file: Path ) -> Optional[ MsgCode ]:
+    # Check a candidate login against a digest record.
+    # Returns:
+        # MsgCode: SUCCESS or CREDENTIALS_INVALID; None when the record is missing or
+        # stale (the caller must then verify against the decrypted credentials).
+
+    if record is None or record.get( 'credentials' ) != credentials_signature( credentials_file ):
+        return None
+    status, candidate = derive_key( _login_secret( email, password ), record[ 'params' ] )
+    if status != MsgCode.SUCCESS or candidate is None:
+        return None
+    return MsgCode.SUCCESS if hmac.compare_digest( candidate, record[ 'digest' ].encode() ) else MsgCode.CREDENTIALS_INVALID
@@ -0,0 +1,140 @@
+# ==============================================
+# authenticator/crypto/stream_cipher.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import base64
+import struct
+from typing import BinaryIO
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+# Chunked authenticated encryption for large blobs (certificates, attachments).
+# Only one chunk is in memory at a time; each chunk is sealed with AES-256-GCM.
+#
+#   header: MAGIC | chunk_size (u32) | salt (16)
+#   chunk:  length (u32) | ciphertext + tag
+#
+# The file key is HKDF(Fernet key, salt). The nonce is chunk counter + final flag,
+# so reordered, dropped or truncated chunks fail authentication (STREAM construction).
+
+STREAM_MAGIC = b'CAT1'
+SALT_SIZE = 16
+TAG_SIZE = 16
+DEFAULT_CHUNK_SIZE = 64 * 1024
+MAX_CHUNK_SIZE = 16 * 1024 * 1024
+HEADER = struct.Struct( '>4sI16s' )
+LENGTH = struct.Struct( '>I' )
+
+class StreamCipherError( Exception ):
+    # Corrupted, truncated or tampered stream, or wrong key.
+    pass
+
+def _file_key( fernet_key: bytes, salt: bytes ) -> AESGCM:
+    # Per-file AES-256 key derived from the credentials (Fernet) key.
+    master = base64.urlsafe_b64decode( fernet_key )
+    hkdf = HKDF( algorithm=hashes.SHA256(), length=32, salt=salt, info=b'credentials-attachment-v1' )
+    return AESGCM( hkdf.derive( master ) )
+
+def _nonce( counter: int, final: bool ) -> bytes:
+    return struct.pack( '>Q3xB', counter, 1 if final else 0 )
+
+def _read_exact( source: BinaryIO, size: int ) -> bytes:
+    data = source.read( size )
+    while data is not None and len( data ) < size:
+        more = source.read( size - len( data ) )
+        if not more:
+            break
+        data += more
+    return data or b''
+
+def encrypt_stream( fernet_key: bytes, source: BinaryIO, destination: BinaryIO, chunk_size: int = DEFAULT_CHUNK_SIZE ) -> int:
+    # Encrypt source into destination chunk by chunk.
+    # Args:
+        # fernet_key: Credentials key (urlsafe base64, as stored in key.key).
+        # source: Readable binary file object.
+        # destination: Writable binary file object.
+        # chunk_size: Plaintext bytes per chunk.
+    # Returns:
+        # int: Plaintext size in bytes.
+
+    if not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise ValueError( 'invalid chunk size' )
+
+    salt = os.urandom( SALT_SIZE )
+    header = HEADER.pack( STREAM_MAGIC, chunk_size, salt )
+    aead = _file_key( fernet_key, salt )
+    destination.write( header )
+
+    total, counter = 0, 0
+    chunk = _read_exact( source, chunk_size )
+    while True:
+        # One chunk look-ahead tells whether the current one is the last
+        following = _read_exact( source, chunk_size ) if len( chunk ) == chunk_size else b''
+        final = not following
+        sealed = aead.encrypt( _nonce( counter, final ), chunk, header )
+        destination.write( LENGTH.pack( len( sealed ) ) )
+        destination.write( sealed )
+        total += len( chunk )
+        if final:
+            return total
+        chunk, counter = following, counter + 1
+
+def decrypt_stream( fernet_key: bytes, source: BinaryIO, destination: BinaryIO ) -> int:
+    # Decrypt and authenticate source into destination chunk by chunk.
+    # Plaintext of a chunk is written only after that chunk authenticates, but a
+    # later failure leaves earlier chunks written: callers discard the output on error.
+    # Raises:
+        # StreamCipherError: Bad header, wrong key, tampering or truncation.
+    # Returns:
+        # int: Plaintext size in bytes.
+
+    header = _read_exact( source, HEADER.size )
+    if len( header ) != HEADER.size:
+        raise StreamCipherError( 'truncated header' )
+    magic, chunk_size, salt = HEADER.unpack( header )
+    if magic != STREAM_MAGIC or not 0 < chunk_size <= MAX_CHUNK_SIZE:
+        raise StreamCipherError( 'not an attachment stream' )
+    aead = _file_key( fernet_key, salt )
+
+    total, counter = 0, 0
+    length = _read_exact( source, LENGTH.size )
+    while True:
+        if len( length ) != LENGTH.size:
+            raise StreamCipherError( 'truncated stream' )
+        ( size, ) = LENGTH.unpack( length )
+        if size > chunk_size + TAG_SIZE:
+            raise StreamCipherError( 'chunk too large' )
+        sealed = _read_exact( source, size )
+        if len( sealed ) != size:
+            raise StreamCipherError( 'truncated chunk' )
+        length = _read_exact( source, LENGTH.size )
+        final = not length
+        try:
+            chunk = aead.decrypt( _nonce( counter, final ), sealed, header )
+        except Exception:
+            raise StreamCipherError( 'authentication failed' ) from None
+        destination.write( chunk )
+        total += len( chunk )
+        if final:
+            return total
+        counter += 1
@@ -16,6 +16,7 @@ class _MsgCode( IntEnum ):
     MISSING_KEY_FILE = 101
     MISSING_CREDENTIALS_FILE = 102
     MISSING_DIR = 103
+    MISSING_SESSION_FILE = 104
 
     # Encryption/Decryption Errors (120-139)
     ENCRYPTION_ERROR = 120
@@ -40,17 +41,28 @@ class _MsgCode( IntEnum ):
     CREATE_KEY_ERROR = 162
     FERNET_NULL = 163
     LOADING_KEY_ERROR = 164
+    KDF_UNSUPPORTED = 165
+    KDF_HEADER_INVALID = 166
+    KEY_PASSWORD_MISMATCH = 167
     
     # Credentials Management Erros (170 - 179)
     CREDENTIALS_INVALID = 170
     CREDENTIALS_NULL = 171
     FIELD_NOT_FOUND = 172
+    ENTRY_NOT_FOUND = 173
+    VAULT_CORRUPTED = 174
+    ATTACHMENT_NOT_FOUND = 175
+    ATTACHMENT_CORRUPTED = 176
 
     # Config Management Errors (180-189)
     CONFIG_ALREADY_EXISTS = 180
     CONFIG_NOT_FOUND = 181
     CONFIG_INVALID = 182
 
+    # Session State Errors (190-199)
+    SESSION_INVALID = 190
+    SESSION_EXPIRED = 191
+
     # Unknown Errors (250-255)
     UNKNOWN_DIR_ERROR = 251
     UNKNOWN_FERNET_ERROR = 252
@@ -70,5 +82,12 @@ class MsgCodeSingleton:
         except AttributeError:
             raise AttributeError( f"'{self.__class__.__name__}' object has no attribute '{name}'" )
 
+    def name_of( self, code: int ) -> str:
+        # Symbolic name for a numeric code (e.g. 171 -> 'CREDENTIALS_NULL').
+        try:
+            return _MsgCode( int( code ) ).name
+        except ValueError:
+            return f"UNKNOWN_{code}"
+
 # Create singleton instance.
 MsgCode = MsgCodeSingleton()
\ No newline at end of file
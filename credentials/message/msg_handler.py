@@ -22,6 +22,7 @@ class MessageHandler:
         101: "Key file is missing.",
         102: "Credentials file is missing.",
         103: "Directory missing",
+        104: "Session state file is missing.",
 
         # Encryption/Decryption Errors (120-139)
         120: "Error occurred during encryption.",
@@ -46,17 +47,28 @@ class MessageHandler:
         162: "Error occurred while creating the encryption key.",
         163: "Fernet encryption object is null or invalid.",
         164: "Error occurred while loading the encryption key.",
+        165: "Key derivation function is not available on this system.",
+        166: "Invalid key derivation header in key file.",
+        167: "Key password does not match the stored key.",
         
         # Credentials Management Erros (170 - 179)
         170: "Invalid credentials provided.",
         171: "Null credentials file.",
         172: "FIELD_NOT_FOUND.",
+        173: "Vault entry not found.",
+        174: "Vault file is corrupted.",
+        175: "Attachment not found.",
+        176: "Attachment is corrupted or was tampered with.",
 
         # Config Management Errors (180-189)
         180: "Configuration with this name already exists.",
         181: "Configuration not found.",
         182: "Invalid configuration data.",
 
+        # Session State Errors (190-199)
+        190: "Invalid session state data.",
+        191: "Stored session state has expired.",
+
         # Unknown Errors (240-255)
         249: "Unknown error occurred in directory.",
         250: "Unknown error occurred during Fernet operations.",
@@ -6,7 +6,14 @@
 # I -> Imports.
 # ==============================================
 
-from browser.browser_cdp import BrowserCDP
+from browser.browser_cdp import BrowserCDP, MODE_ATTACH, MODE_LAUNCH, SESSION_RESTORED, start_driver, load_credentials
+from browser.chrome_launcher import ChromeLauncher, read_active_port
+from browser.profile_snapshot import snapshot_profile
+from credentials.credentials import Credentials
+from credentials.message.msg_code import MsgCode
+from runtime.metrics import metrics, MetricsServer, chrome_rss_bytes, DEFAULT_METRICS_PORT
+from runtime.session import SessionRecorder
+from runtime.startup import StartupTimer, StartupOrchestrator
 import threading
 import random
 import time
@@ -35,6 +42,32 @@ pdv_ready = False
 command_queue = []
 command_lock = threading.Lock()
 
+# Porta de depuração do Chrome. Use 0 para porta efêmera (evita colisões);
+# a porta real é descoberta no lançamento e guardada em CHROME_DEBUG_PORT
+CHROME_LAUNCH_PORT = 9222
+CHROME_DEBUG_PORT = 9222
+CHROME_DEBUG_PROFILE = os.path.expanduser("~/.config/google-chrome-debug")
+chrome_pid = None
+
+# Modo do browser: MODE_ATTACH conecta a um Chrome debug já aberto (padrão);
+# MODE_LAUNCH (--managed) faz o BrowserCDP do PDV iniciar o Chromium sozinho
+BROWSER_MODE = MODE_ATTACH
+BROWSER_HEADLESS = False
+
+# Endpoint local de métricas/saúde (Prometheus). Use --metrics-port N ou --no-metrics
+METRICS_PORT = DEFAULT_METRICS_PORT
+metrics_server = None
+
+# Cronômetro e orquestrador das fases de inicialização (relatório ao final do startup)
+startup_timer = StartupTimer()
+startup = StartupOrchestrator(startup_timer)
+
+# Tempo máximo até o PDV ficar pronto (inclui subir o Chrome, que roda em paralelo)
+PDV_READY_TIMEOUT = 60
+
+# Gravação opcional da sessão de voz para replay (--record-session ARQUIVO)
+session_recorder = None
+
 # Configuração do botão do mouse
 # Button.button8 = botão lateral 1 (voltar) - comum em mouses
 # Button.button9 = botão lateral 2 (avançar) - comum em mouses
@@ -112,6 +145,57 @@ class MouseButtonIdentifier:
             except KeyboardInterrupt:
                 print("\n✅ Identificação interrompida!")
 
+# ==============================================
+# Métricas e saúde do daemon
+# ==============================================
+
+def setup_metrics():
+    """Declara as métricas do daemon e registra o coletor sob demanda"""
+    metrics.describe('pdv_ready', 'gauge', 'PDV pronto para comandos (1) ou nao (0)')
+    metrics.describe('pdv_command_queue_depth', 'gauge', 'Comandos aguardando a thread PDV')
+    metrics.describe('pdv_command_latency_seconds', 'histogram', 'Tempo entre o envio e a conclusao de um comando PDV')
+    metrics.describe('pdv_command_errors_total', 'counter', 'Comandos PDV que falharam com excecao')
+    metrics.describe('pdv_reconnects_total', 'counter', 'Reconexoes da aba PDV por motivo')
+    metrics.describe('chrome_rss_bytes', 'gauge', 'Memoria residente do Chrome debug e processos filhos')
+    metrics.describe('voice_capture_duration_seconds', 'histogram', 'Duracao da captura de voz (microfone ate leitura do texto)')
+    metrics.describe('voice_errors_total', 'counter', 'Falhas na captura de voz por etapa')
+    metrics.describe('credentials_errors_total', 'counter', 'Falhas ao carregar credenciais por MsgCode')
+    metrics.describe('credentials_cache_hits_total', 'counter', 'Leituras de credenciais servidas pelo cache')
+    metrics.describe('credentials_cache_misses_total', 'counter', 'Leituras de credenciais que exigiram decifrar o arquivo')
+
+    def collect_runtime(registry):
+        registry.set_gauge('pdv_ready', 1 if pdv_ready else 0)
+        with command_lock:
+            depth = len(command_queue)
+        registry.set_gauge('pdv_command_queue_depth', depth)
+        rss = chrome_rss_bytes(CHROME_DEBUG_PORT, pid=chrome_pid)
+        if rss is not None:
+            registry.set_gauge('chrome_rss_bytes', rss)
+        cache = Credentials.cache_stats()
+        registry.set_counter('credentials_cache_hits_total', cache['hits'])
+        registry.set_counter('credentials_cache_misses_total', cache['misses'])
+
+    metrics.add_collector(collect_runtime)
+
+def start_metrics_server():
+    """Inicia o endpoint local de métricas, se habilitado"""
+    global metrics_server
+    
+    if METRICS_PORT is None:
+        return None
+    
+    setup_metrics()
+    metrics_server = MetricsServer(metrics, port=METRICS_PORT, health_check=lambda: pdv_ready)
+    if not metrics_server.start():
+        metrics_server = None
+    return metrics_server
+
+def record_credentials_status(browser):
+    """Contabiliza falhas de carregamento de credenciais de um BrowserCDP por MsgCode"""
+    status = getattr(browser, 'status', MsgCode.SUCCESS)
+    if status != MsgCode.SUCCESS:
+        metrics.inc('credentials_errors_total', labels={'code': str(status), 'name': MsgCode.name_of(status)})
+
 # ==============================================
 # NOVO: Sistema de Comunicação Entre Threads
 # ==============================================
@@ -120,11 +204,17 @@ def send_command_to_pdv(command, data=None):
     """Envia comando para a thread PDV de forma thread-safe"""
     global command_queue, command_lock
     
+    utterance = None
+    if session_recorder:
+        utterance = session_recorder.current_utterance
+        session_recorder.intent(command, data)
+    
     with command_lock:
         command_queue.append({
             'command': command,
             'data': data,
-            'timestamp': time.time()
+            'timestamp': time.time(),
+            'utterance': utterance
         })
     
     print(f"   📤 Comando '{command}' enviado para PDV")
@@ -140,6 +230,7 @@ def process_pdv_commands():
     for cmd in commands_to_process:
         command = cmd['command']
         data = cmd['data']
+        ok = True
         
         try:
             print(f"   📥 Processando comando PDV: '{command}'")
@@ -251,7 +342,14 @@ def process_pdv_commands():
                 running = False
                 
         except Exception as e:
+            ok = False
+            metrics.inc('pdv_command_errors_total', labels={'command': command})
             print(f"   ❌ Erro ao processar comando '{command}': {e}")
+        
+        latency = time.time() - cmd['timestamp']
+        metrics.observe('pdv_command_latency_seconds', latency, labels={'command': command})
+        if session_recorder:
+            session_recorder.dispatch(command, latency, ok, cmd.get('utterance'))
 
 def desligar_computador():
     """Desliga o computador com contagem regressiva"""
@@ -293,92 +391,82 @@ def desligar_computador():
 # III -> Funções para controle do voice
 # ==============================================
 
-def initialize_connection():
-    """Inicializa e testa a conexão CDP - apenas para verificação inicial"""
-    print("\n🔄 Verificando conexão CDP...")
-    
-    test_browser = BrowserCDP()
-    
-    if not test_browser.connect():
-        print("❌ O navegador Chrome não foi aberto em modo depuração.")
-        print("\n📋 SOLUÇÕES PARA MANTER SEU PERFIL:")
-        print("\n🔧 RECOMENDADO - Duas instâncias simultâneas:")
-        print("   1. Mantenha seu Chrome normal aberto")
-        print("   2. Execute em outro terminal:")
-        print("      cp -r \"$HOME/.config/google-chrome\" \"$HOME/.config/google-chrome-debug\"")
-        print("      google-chrome --remote-debugging-port=9222 --user-data-dir=\"$HOME/.config/google-chrome-debug\" &")
-        return False
-    
-    print("✅ Conexão CDP disponível!")
-    
-    # Fechar conexão de teste
-    try:
-        test_browser.close()
-    except:
-        pass
-    
-    return True
+def print_cdp_help():
+    """Orienta o usuário quando a conexão CDP com o Chrome debug falha"""
+    print("❌ O navegador Chrome não foi aberto em modo depuração.")
+    print("\n📋 SOLUÇÕES PARA MANTER SEU PERFIL:")
+    print("\n🔧 RECOMENDADO - Duas instâncias simultâneas:")
+    print("   1. Mantenha seu Chrome normal aberto")
+    print("   2. Execute em outro terminal:")
+    print("      python3 -m browser.profile_snapshot")
+    print("      google-chrome --remote-debugging-port=9222 --user-data-dir=\"$HOME/.config/google-chrome-debug\" &")
 
 def check_chrome_debug_and_start():
     """Verifica se Chrome debug está ativo e oferece opções para iniciar"""
     import requests
-    import subprocess
-    import os
+    global CHROME_DEBUG_PORT, chrome_pid
     
     print("\n🔍 Verificando Chrome em modo debug...")
     
-    try:
-        response = requests.get("http://localhost:9222/json", timeout=2)
-        if response.status_code == 200:
-            data = response.json()
-            print(f"   ✅ Chrome debug já está ativo com {len(data)} páginas")
-            return True
-    except:
-        pass
+    # Porta fixa ou a anunciada pelo perfil debug (se já houver instância rodando)
+    candidate_ports = []
+    active = read_active_port(CHROME_DEBUG_PROFILE)
+    if active:
+        candidate_ports.append(active[0])
+    if CHROME_LAUNCH_PORT and CHROME_LAUNCH_PORT not in candidate_ports:
+        candidate_ports.append(CHROME_LAUNCH_PORT)
     
-    print("   ❌ Chrome debug não está ativo na porta 9222")
+    for port in candidate_ports:
+        try:
+            response = requests.get(f"http://localhost:{port}/json", timeout=2)
+            if response.status_code == 200:
+                data = response.json()
+                CHROME_DEBUG_PORT = port
+                print(f"   ✅ Chrome debug já está ativo na porta {port} com {len(data)} páginas")
+                return True
+        except:
+            pass
+    
+    print(f"   ❌ Chrome debug não está ativo")
     print("\n🚀 Iniciando Chrome debug automaticamente...")
     
     # Verifica se perfil debug já existe
-    debug_profile = os.path.expanduser("~/.config/google-chrome-debug")
+    debug_profile = CHROME_DEBUG_PROFILE
     original_profile = os.path.expanduser("~/.config/google-chrome")
     
     try:
-        # Se perfil debug não existe, cria copiando o original
-        if not os.path.exists(debug_profile) and os.path.exists(original_profile):
-            print(f"   📂 Criando perfil debug com suas configurações...")
-            subprocess.run([
-                "cp", "-r", original_profile, debug_profile
-            ], check=True, capture_output=True)
-            print(f"   ✅ Perfil copiado para {debug_profile}")
-        
-        # Inicia Chrome debug
+        # Cria ou atualiza incrementalmente o perfil debug (só cookies, logins,
+        # preferências e localStorage; sem caches), usando hard links/reflinks
+        if os.path.exists(original_profile):
+            print(f"   📂 Sincronizando perfil debug com suas configurações...")
+            report = snapshot_profile(original_profile, debug_profile)
+            if report.skipped_reason:
+                print(f"   ⚠️ Perfil não sincronizado: {report.skipped_reason}")
+            else:
+                print(f"   ✅ Perfil debug em {debug_profile}: {report}")
+        
+        # Inicia Chrome debug e aguarda o DevToolsActivePort (sem polling de 1 s)
         print("   🔧 Iniciando Chrome debug...")
-        subprocess.Popen([
-            "google-chrome",
-            "--remote-debugging-port=9222",
-            f"--user-data-dir={debug_profile}",
-            "--no-first-run",
-            "--disable-web-security"
-        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-        
-        # Aguarda inicialização
+        launcher = ChromeLauncher(
+            debug_profile,
+            port=CHROME_LAUNCH_PORT,
+            extra_args=["--no-first-run", "--disable-web-security"]
+        )
+        
         print("   ⏳ Aguardando Chrome inicializar...")
-        for i in range(10):  # Tenta por 10 segundos
-            time.sleep(1)
-            try:
-                response = requests.get("http://localhost:9222/json", timeout=1)
-                if response.status_code == 200:
-                    print(f"   ✅ Chrome debug ativo após {i+1} segundos")
-                    return True
-            except:
-                continue
+        endpoint = launcher.launch(timeout=10)
+        
+        if endpoint:
+            CHROME_DEBUG_PORT = endpoint.port
+            chrome_pid = endpoint.pid
+            print(f"   ✅ Chrome debug ativo na porta {endpoint.port} após {endpoint.time_to_ready * 1000:.0f} ms (via {endpoint.source})")
+            return True
         
         print("   ⚠️ Chrome debug não respondeu dentro do tempo esperado")
         return False
         
-    except subprocess.CalledProcessError as e:
-        print(f"   ❌ Erro ao copiar perfil: {e}")
+    except OSError as e:
+        print(f"   ❌ Erro ao preparar perfil ou iniciar Chrome: {e}")
         return False
     except Exception as e:
         print(f"   ❌ Erro ao iniciar Chrome: {e}")
@@ -398,7 +486,7 @@ def auto_setup_chrome():
     print("1. Abra um novo terminal")
     print("2. Execute um dos comandos abaixo:")
     print("\n   # OPÇÃO 1 - Perfil separado (RECOMENDADO)")
-    print("   cp -r ~/.config/google-chrome ~/.config/google-chrome-debug")
+    print("   python3 -m browser.profile_snapshot")
     print("   google-chrome --remote-debugging-port=9222 --user-data-dir=\"$HOME/.config/google-chrome-debug\" &")
     print("\n   # OPÇÃO 2 - Perfil temporário")  
     print("   google-chrome --remote-debugging-port=9222 --user-data-dir=\"/tmp/chrome-debug\" &")
@@ -406,6 +494,27 @@ def auto_setup_chrome():
     
     return False
 
+def prepare_chrome():
+    """Fase 'chrome' do startup: sonda/inicia o Chrome debug ou prepara o perfil gerenciado"""
+    if BROWSER_MODE == MODE_ATTACH:
+        return auto_setup_chrome()
+    
+    # No modo gerenciado o PDV inicia o Chromium; aqui só o perfil é sincronizado
+    report = snapshot_profile(os.path.expanduser("~/.config/google-chrome"), CHROME_DEBUG_PROFILE)
+    print(f"📂 Perfil gerenciado: {report}")
+    return True
+
+def start_input_listeners():
+    """Fase 'listeners' do startup: listener do mouse e monitor de input do usuário"""
+    mouse_listener = mouse.Listener(on_click=on_mouse_click)
+    mouse_listener.start()
+    print(f"🖱️  Listener do mouse ativo - Botão {VOICE_TRIGGER_BUTTON} configurado para voice")
+    
+    # Thread para monitorar input do usuário
+    input_thread = threading.Thread(target=input_monitor, daemon=True)
+    input_thread.start()
+    return mouse_listener, input_thread
+
 def voice_thread_runner():
     """Thread runner para voice"""
     global voice_active
@@ -433,43 +542,88 @@ def on_mouse_click(x, y, button, pressed):
 
 def initialize_pdv_browser():
     """Inicializa e mantém o browser PDV em loop"""
-    global pdv_browser, pdv_ready, running
+    global pdv_browser, pdv_ready, running, CHROME_DEBUG_PORT
     
     try:
         print("\n🏪 Inicializando browser PDV...")
         
-        # Criar instância BrowserCDP para PDV
-        pdv_browser = BrowserCDP()
+        # O driver do Playwright não depende do Chrome: sobe nesta thread (os objetos
+        # síncronos ficam presos a ela) enquanto o Chrome e as credenciais ficam prontos
+        with startup.step("playwright"):
+            driver = start_driver()
+        
+        if not startup.wait_all(("chrome", "credentials")):
+            print("   ❌ Chrome ou credenciais indisponíveis para o PDV")
+            driver.stop()
+            startup.signal("pdv_ready", ok=False)
+            return False
         
-        if not pdv_browser.connect():
+        # Criar instância BrowserCDP para PDV
+        pdv_browser = BrowserCDP(
+            debug_port=CHROME_DEBUG_PORT,
+            mode=BROWSER_MODE,
+            user_data_dir=CHROME_DEBUG_PROFILE,
+            headless=BROWSER_HEADLESS,
+            playwright=driver,
+            credentials=startup.result("credentials")
+        )
+        record_credentials_status(pdv_browser)
+        
+        # Única conexão CDP do startup: o Chrome já foi sondado via HTTP na fase
+        # 'chrome', e esta conexão é a que o PDV usa daqui em diante
+        with startup.step("pdv_connect", requires=("playwright", "chrome", "credentials")):
+            connected = pdv_browser.connect()
+        
+        if not connected:
             print("   ❌ Erro ao conectar com Chrome debug para PDV")
+            if BROWSER_MODE == MODE_ATTACH:
+                print_cdp_help()
+            startup.signal("pdv_ready", ok=False)
             return False
         
+        # No modo gerenciado a porta pode ser efêmera; as threads de voz usam a real
+        CHROME_DEBUG_PORT = pdv_browser.debug_port
+        
         print("   ✅ Conexão CDP estabelecida para PDV")
         
+        # Restaura a sessão autenticada salva (evita o login completo quando ainda válida)
+        with startup.step("pdv_session", requires=("pdv_connect",)):
+            # Sem check_url: a rota do PDV é da SPA e responde 200 mesmo sem sessão;
+            # a validação real é a checagem de login logo abaixo
+            session_result = pdv_browser.restore_session()
+        
         # Acessar página PDV
-        pdv_page = pdv_browser.access("https://app.gdoorweb.com.br/movimentos/pdv/nova", "pdv")
-        pdv_browser.bring_to_front("pdv")
+        with startup.step("pdv_page", requires=("pdv_session",)):
+            pdv_page = pdv_browser.access("https://app.gdoorweb.com.br/movimentos/pdv/nova", "pdv")
+            pdv_browser.bring_to_front("pdv")
         print("   ✅ Página PDV acessada")
         
         # Verificar se precisa fazer login
-        if not pdv_browser.url_search("movimentos/pdv/nova", "pdv"):
-            print("   🔐 Fazendo login automático...")
-            login_success = pdv_browser.login("pdv")
-            if login_success:
-                print("   ✅ Login realizado com sucesso!")
-                time.sleep(3)
+        with startup.step("pdv_login", requires=("pdv_page",)):
+            needs_login = not pdv_browser.url_search("movimentos/pdv/nova", "pdv")
+            if needs_login:
+                # Só descarta a sessão salva se foi ela que o PDV recusou
+                if session_result == SESSION_RESTORED:
+                    print("   ⌛ Sessão restaurada não foi aceita pelo PDV, descartando")
+                    pdv_browser.discard_session()
+                print("   🔐 Fazendo login automático...")
+                login_success = pdv_browser.login("pdv")
+                if login_success:
+                    print("   ✅ Login realizado com sucesso!")
+                    time.sleep(3)
                 
-                if pdv_browser.url_search("movimentos/pdv/nova", "pdv"):
-                    print("   ✅ PDV carregado corretamente após login!")
+                    if pdv_browser.url_search("movimentos/pdv/nova", "pdv"):
+                        print("   ✅ PDV carregado corretamente após login!")
+                        pdv_browser.save_session()
+                    else:
+                        print("   ⚠️ PDV pode não ter carregado completamente, mas continuando...")
                 else:
-                    print("   ⚠️ PDV pode não ter carregado completamente, mas continuando...")
+                    print("   ❌ Falha no login, mas continuando...")
             else:
-                print("   ❌ Falha no login, mas continuando...")
-        else:
-            print("   ✅ PDV já carregado, não precisa de login")
+                print("   ✅ PDV já carregado, não precisa de login")
         
         pdv_ready = True
+        startup.signal("pdv_ready", requires=("pdv_login",))
         print("   🎯 PDV pronto para comandos de voz!")
         
         # Loop principal com processamento de comandos
@@ -490,11 +644,13 @@ def initialize_pdv_browser():
                         pass
                     else:
                         print(f"   ⚠️ PDV mudou de URL: {current_url}")
+                        metrics.inc('pdv_reconnects_total', labels={'reason': 'url_changed'})
                         pdv_browser.access("https://app.gdoorweb.com.br/movimentos/pdv/nova", "pdv")
                         pdv_browser.bring_to_front("pdv")
                 else:
                     if pdv_ready:  # Só reconecta se ainda deveria estar ativo
                         print("   ⚠️ Página PDV foi fechada, reconectando...")
+                        metrics.inc('pdv_reconnects_total', labels={'reason': 'page_closed'})
                         pdv_page = pdv_browser.access("https://app.gdoorweb.com.br/movimentos/pdv/nova", "pdv")
                         pdv_browser.bring_to_front("pdv")
                         print("   ✅ PDV reconectado!")
@@ -502,6 +658,7 @@ def initialize_pdv_browser():
             except Exception as e:
                 if pdv_ready:  # Só tenta reconectar se ainda deveria estar ativo
                     print(f"   🔄 Erro no monitoramento PDV, tentando reconectar: {e}")
+                    metrics.inc('pdv_reconnects_total', labels={'reason': 'error'})
                     try:
                         pdv_page = pdv_browser.access("https://app.gdoorweb.com.br/movimentos/pdv/nova", "pdv")
                         pdv_browser.bring_to_front("pdv")
@@ -517,6 +674,7 @@ def initialize_pdv_browser():
     except Exception as e:
         print(f"   ❌ Erro na inicialização do PDV: {e}")
         pdv_ready = False
+        startup.signal("pdv_ready", ok=False)
         return False
 
 def converter_numero_extenso(texto):
@@ -741,10 +899,12 @@ def voice_action():
         print("="*40)
         
         # Criar nova instância BrowserCDP apenas para o Google
-        voice_browser = BrowserCDP()
+        voice_browser = BrowserCDP(debug_port=CHROME_DEBUG_PORT)
+        record_credentials_status(voice_browser)
         
         if not voice_browser.connect():
             print("   ❌ Erro ao conectar com Chrome debug nesta thread")
+            metrics.inc('voice_errors_total', labels={'stage': 'connect'})
             return
         
         print("   ✅ Conexão CDP estabelecida para esta thread")
@@ -756,25 +916,36 @@ def voice_action():
             print("   ✅ Página do Google acessada")
         except Exception as e:
             print(f"   ⚠️ Erro ao acessar Google: {e}")
+            metrics.inc('voice_errors_total', labels={'stage': 'access'})
             return
         
         # Executar sequência de voice no Google
         try:
+            capture_start = time.time()
             voice_browser.google_microphone()
             print("   → Microfone do Google ativado")
             time.sleep(10)  # Aguarda gravação
             
             google_text = voice_browser.read_google_search_field()
+            capture_seconds = time.time() - capture_start
+            metrics.observe('voice_capture_duration_seconds', capture_seconds)
             print(f"   ✓ Texto capturado: '{google_text}'")
             
+            if session_recorder:
+                session_recorder.transcript(google_text or "", capture_seconds)
+            
             # Processar comando de voz no PDV
             if google_text and google_text.strip():
-                process_voice_command(google_text)
+                recognized = process_voice_command(google_text)
+                if session_recorder:
+                    session_recorder.parsed(recognized)
             else:
                 print("   ⚠️ Nenhum comando capturado")
+                metrics.inc('voice_errors_total', labels={'stage': 'empty'})
                 
         except Exception as e:
             print(f"   ❌ Erro durante operação de voice: {e}")
+            metrics.inc('voice_errors_total', labels={'stage': 'capture'})
         
         # CORREÇÃO: Fechar APENAS o browser do Google, NÃO o PDV
         try:
@@ -872,59 +1043,58 @@ def remove_word(texto, palavra):
 def main():
     global running
     
-    auto_setup_chrome()
-
+    # Verificar se deve identificar botões
+    if len(sys.argv) > 1 and sys.argv[1] == "--identify":
+        MouseButtonIdentifier.identify_buttons()
+        return
+    
     # Configurar handler para sinais
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
     
     print("🔧 Iniciando sistema de automação...")
     
-    # Verificar se deve identificar botões
-    if len(sys.argv) > 1 and sys.argv[1] == "--identify":
-        MouseButtonIdentifier.identify_buttons()
-        return
+    # Endpoint local de métricas e saúde
+    start_metrics_server()
     
     # Lista para armazenar threads
     threads = []
     
     try:
-        # Tenta inicializar conexão CDP
-        print("🔍 Verificando conexão Chrome debug...")
-        chrome_ready = initialize_connection()
-        
-        if not chrome_ready:
-            print("\n⚠️ Chrome debug não está pronto.")
-            print("💡 Configure o Chrome debug primeiro.")
-            return
+        # Fases independentes rodam em paralelo; o PDV aguarda apenas o que precisa:
+        #   chrome ──────────┐
+        #   credentials ─────┼─> pdv_connect -> pdv_page -> pdv_login -> pdv_ready
+        #   playwright (PDV) ┘
+        #   listeners (independente)
+        startup.add("chrome", prepare_chrome)
+        startup.add("credentials", load_credentials)
+        startup.add("listeners", start_input_listeners)
+        startup.start()
         
         # Inicia thread do PDV
         print("🏪 Iniciando thread PDV...")
-        pdv_thread = threading.Thread(target=initialize_pdv_browser, daemon=True)
+        pdv_thread = threading.Thread(target=initialize_pdv_browser, name="pdv", daemon=True)
         pdv_thread.start()
         threads.append(pdv_thread)
         
-        # Aguarda PDV ficar pronto
+        # Aguarda PDV ficar pronto (sinalizado por evento, sem polling)
         print("   ⏳ Aguardando PDV ficar pronto...")
-        for i in range(30):  # Aguarda até 30 segundos
-            if pdv_ready:
-                break
-            time.sleep(1)
-        
-        if not pdv_ready:
-            print("   ❌ PDV não ficou pronto a tempo")
+        ready = startup.wait("pdv_ready", timeout=PDV_READY_TIMEOUT)
+        
+        if not ready:
+            if startup.wait("chrome", timeout=0) is False:
+                print("\n⚠️ Chrome debug não está pronto.")
+                print("💡 Configure o Chrome debug primeiro.")
+            elif ready is None:
+                print("   ❌ PDV não ficou pronto a tempo")
+            else:
+                print("   ❌ Falha na inicialização do PDV")
             return
         
-        # Inicia listener do mouse
-        mouse_listener = mouse.Listener(on_click=on_mouse_click)
-        mouse_listener.start()
-        print(f"🖱️  Listener do mouse ativo - Botão {VOICE_TRIGGER_BUTTON} configurado para voice")
+        if startup.wait("listeners"):
+            threads.append(startup.result("listeners")[1])
         
-        # Thread para monitorar input do usuário
-        input_thread = threading.Thread(target=input_monitor, daemon=True)
-        input_thread.start()
-        threads.append(input_thread)
-        time.sleep(0.1)
+        print(startup.report("pdv_ready"))
         
         print("\n" + "="*60)
         print("🚀 SISTEMA DE MENU DE VOZ ATIVO")
@@ -944,9 +1114,6 @@ def main():
             if len(active_threads) == 0:
                 print("⚠️ Todas as threads finalizaram.")
                 break
-        
-        # Para o listener do mouse
-        mouse_listener.stop()
     
     except KeyboardInterrupt:
         print("\n🛑 Interrupção detectada no main...")
@@ -959,8 +1126,20 @@ def main():
     finally:
         # Cleanup final
         running = False
+        
+        # Para o listener do mouse
+        listeners = startup.result("listeners")
+        if listeners:
+            listeners[0].stop()
+        
         cleanup_browsers()
         
+        if metrics_server:
+            metrics_server.stop()
+        
+        if session_recorder:
+            session_recorder.close()
+        
         print("\n" + "="*60)
         print("✨ PROGRAMA FINALIZADO COM SUCESSO")
         print("="*60)
@@ -1005,6 +1184,35 @@ def setup_mouse_buttons_lxqt():
     
     print("\n" + "="*60)
 
+# ==============================================
+# Argumentos de linha de comando
+# ==============================================
+
+def usage_error(flag, expected, value, placeholder):
+    """Erro de uso de um argumento: mensagem em stderr e saída com código 2"""
+    print(f"❌ {flag} requer {expected} (recebido: {value or 'nada'})", file=sys.stderr)
+    print(f"   uso: python3 main.py {flag} <{placeholder}>", file=sys.stderr)
+    sys.exit(2)
+
+def flag_value(flag):
+    """Valor após `flag` na linha de comando; None se `flag` for o último argumento"""
+    index = sys.argv.index(flag) + 1
+    return sys.argv[index] if index < len(sys.argv) else None
+
+def port_arg(flag):
+    """Lê a porta após `flag` na linha de comando; valor ausente ou inválido encerra com erro de uso"""
+    value = flag_value(flag)
+    if value is None or not value.isdigit() or int(value) > 65535:
+        usage_error(flag, "uma porta entre 0 e 65535", value, "porta")
+    return int(value)
+
+def path_arg(flag):
+    """Lê o caminho de arquivo após `flag`; ausente (ou outra opção no lugar) encerra com erro de uso"""
+    value = flag_value(flag)
+    if not value or value.startswith("--"):
+        usage_error(flag, "um caminho de arquivo", value, "arquivo")
+    return value
+
 # ==============================================
 # VII -> Handle PyInstaller executable path
 # ==============================================
@@ -1026,6 +1234,24 @@ if __name__ == "__main__":
             voice_action()
             sys.exit(0)
         
+        if "--record-session" in sys.argv:
+            session_path = path_arg("--record-session")
+            session_recorder = SessionRecorder(session_path)
+            print(f"📼 Gravando sessão de voz em {session_path}")
+        
+        if "--chrome-port" in sys.argv:
+            CHROME_LAUNCH_PORT = port_arg("--chrome-port")
+            CHROME_DEBUG_PORT = CHROME_LAUNCH_PORT
+        
+        if "--managed" in sys.argv:
+            BROWSER_MODE = MODE_LAUNCH
+            BROWSER_HEADLESS = "--headless" in sys.argv
+        
+        if "--no-metrics" in sys.argv:
+            METRICS_PORT = None
+        elif "--metrics-port" in sys.argv:
+            METRICS_PORT = port_arg("--metrics-port")
+        
         # No início do main(), adicione:
         if "--auto-setup" in sys.argv:
             auto_setup_chrome()
@@ -1051,8 +1277,8 @@ if __name__ == "__main__":
         input("Pressione Enter para sair...")
 
 '''
-# Crie uma cópia do seu perfil para debug (uma vez só)
-cp -r "$HOME/.config/google-chrome" "$HOME/.config/google-chrome-debug"
+# Crie ou atualize o perfil debug (incremental, sem caches)
+python3 -m browser.profile_snapshot
 
 # Inicie Chrome debug (mantenha seu Chrome normal aberto)
 google-chrome --remote-debugging-port=9222 --user-data-dir="$HOME/.config/google-chrome-debug" --no-first-run &
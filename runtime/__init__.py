@@ -0,0 +1,12 @@
+# ==============================================
+# runtime/__init__.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Suporte de execução do daemon de automação (main.py): métricas, saúde e tempos de inicialização.
+
+from .metrics import MetricsRegistry, MetricsServer, metrics, chrome_rss_bytes
+from .startup import StartupTimer, StartupOrchestrator
+
+__all__ = [ 'MetricsRegistry', 'MetricsServer', 'metrics', 'chrome_rss_bytes', 'StartupTimer', 'StartupOrchestrator' ]
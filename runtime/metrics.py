@@ -0,0 +1,302 @@
+# ==============================================
+# runtime/metrics.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Buckets padrão (segundos) para latência de comandos e captura de voz.
+DEFAULT_BUCKETS = ( 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0 )
+
+# Porta padrão do endpoint de métricas (somente localhost).
+DEFAULT_METRICS_PORT = 9464
+
+LabelKey = Tuple[ Tuple[ str, str ], ... ]
+
+
+def _label_key( labels: Optional[ Dict[ str, str ] ] ) -> LabelKey:
+    """Normaliza labels em uma chave ordenada e hashable"""
+    if not labels:
+        return ()
+    return tuple( sorted( ( str( k ), str( v ) ) for k, v in labels.items() ) )
+
+
+def _format_labels( key: LabelKey, extra: Optional[ Tuple[ str, str ] ] = None ) -> str:
+    """Formata labels no padrão texto do Prometheus"""
+    items = list( key ) + ( [ extra ] if extra else [] )
+    if not items:
+        return ""
+    escaped = [
+        '{}="{}"'.format( k, v.replace( '\\', '\\\\' ).replace( '"', '\\"' ).replace( '\n', '\\n' ) )
+        for k, v in items
+    ]
+    return "{" + ",".join( escaped ) + "}"
+
+
+def _format_value( value: float ) -> str:
+    if value == float( 'inf' ):
+        return "+Inf"
+    if float( value ).is_integer():
+        return str( int( value ) )
+    return repr( float( value ) )
+
+
+class MetricsRegistry:
+    """Registro thread-safe de contadores, gauges e histogramas no estilo Prometheus"""
+
+    def __init__( self ) -> None:
+        self._lock = threading.Lock()
+        self._meta: Dict[ str, Tuple[ str, str ] ] = {}
+        self._buckets: Dict[ str, Tuple[ float, ... ] ] = {}
+        self._counters: Dict[ str, Dict[ LabelKey, float ] ] = {}
+        self._gauges: Dict[ str, Dict[ LabelKey, float ] ] = {}
+        self._histograms: Dict[ str, Dict[ LabelKey, List[ float ] ] ] = {}
+        self._collectors: List[ Callable[ [ 'MetricsRegistry' ], None ] ] = []
+
+    def describe( self, name: str, kind: str, help_text: str, buckets: Optional[ Tuple[ float, ... ] ] = None ) -> None:
+        """Declara tipo ('counter', 'gauge' ou 'histogram') e descrição de uma métrica"""
+        with self._lock:
+            self._meta[ name ] = ( kind, help_text )
+            if kind == 'histogram':
+                self._buckets[ name ] = tuple( sorted( buckets or DEFAULT_BUCKETS ) )
+
+    def inc( self, name: str, value: float = 1, labels: Optional[ Dict[ str, str ] ] = None ) -> None:
+        """Incrementa um contador"""
+        key = _label_key( labels )
+        with self._lock:
+            series = self._counters.setdefault( name, {} )
+            series[ key ] = series.get( key, 0 ) + value
+
+    def set_counter( self, name: str, value: float, labels: Optional[ Dict[ str, str ] ] = None ) -> None:
+        """Define o total de um contador mantido fora do registro (ex.: estatísticas do cache de credenciais)"""
+        with self._lock:
+            self._counters.setdefault( name, {} )[ _label_key( labels ) ] = value
+
+    def set_gauge( self, name: str, value: float, labels: Optional[ Dict[ str, str ] ] = None ) -> None:
+        """Define o valor atual de um gauge"""
+        with self._lock:
+            self._gauges.setdefault( name, {} )[ _label_key( labels ) ] = value
+
+    def observe( self, name: str, value: float, labels: Optional[ Dict[ str, str ] ] = None ) -> None:
+        """Registra uma observação em um histograma"""
+        key = _label_key( labels )
+        with self._lock:
+            buckets = self._buckets.setdefault( name, DEFAULT_BUCKETS )
+            series = self._histograms.setdefault( name, {} )
+            # Layout: [contagem por bucket..., soma, total]
+            state = series.setdefault( key, [ 0 ] * ( len( buckets ) + 2 ) )
+            for i, bound in enumerate( buckets ):
+                if value <= bound:
+                    state[ i ] += 1
+            state[ -2 ] += value
+            state[ -1 ] += 1
+
+    def get( self, name: str, labels: Optional[ Dict[ str, str ] ] = None ) -> Optional[ float ]:
+        """Retorna o valor atual de um contador ou gauge (útil para testes e diagnóstico)"""
+        key = _label_key( labels )
+        with self._lock:
+            for store in ( self._counters, self._gauges ):
+                if name in store and key in store[ name ]:
+                    return store[ name ][ key ]
+        return None
+
+    def add_collector( self, collector: Callable[ [ 'MetricsRegistry' ], None ] ) -> None:
+        """Registra uma função chamada a cada coleta para atualizar gauges sob demanda"""
+        with self._lock:
+            self._collectors.append( collector )
+
+    def collect( self ) -> None:
+        """Executa os coletores registrados; falhas não interrompem a coleta"""
+        with self._lock:
+            collectors = list( self._collectors )
+        for collector in collectors:
+            try:
+                collector( self )
+            except Exception:
+                self.inc( 'metrics_collector_errors_total' )
+
+    def render( self ) -> str:
+        """Gera a saída no formato texto de exposição do Prometheus"""
+        self.collect()
+        lines: List[ str ] = []
+
+        with self._lock:
+            names = sorted( set( self._counters ) | set( self._gauges ) | set( self._histograms ) )
+            for name in names:
+                kind, help_text = self._meta.get( name, ( None, None ) )
+                if name in self._histograms:
+                    kind = 'histogram'
+                elif kind is None:
+                    kind = 'counter' if name in self._counters else 'gauge'
+
+                if help_text:
+                    lines.append( f"# HELP {name} {help_text}" )
+                lines.append( f"# TYPE {name} {kind}" )
+
+                if kind == 'histogram':
+                    buckets = self._buckets.get( name, DEFAULT_BUCKETS )
+                    for key, state in sorted( self._histograms[ name ].items() ):
+                        # Os buckets já são acumulados em observe()
+                        for i, bound in enumerate( buckets ):
+                            lines.append( f"{name}_bucket{_format_labels( key, ( 'le', _format_value( bound ) ) )} {state[ i ]}" )
+                        lines.append( f"{name}_bucket{_format_labels( key, ( 'le', '+Inf' ) )} {state[ -1 ]}" )
+                        lines.append( f"{name}_sum{_format_labels( key )} {_format_value( state[ -2 ] )}" )
+                        lines.append( f"{name}_count{_format_labels( key )} {state[ -1 ]}" )
+                else:
+                    store = self._counters if name in self._counters else self._gauges
+                    for key, value in sorted( store[ name ].items() ):
+                        lines.append( f"{name}{_format_labels( key )} {_format_value( value )}" )
+
+        return "\n".join( lines ) + "\n"
+
+
+def chrome_rss_bytes( debug_port: int = 9222, pid: Optional[ int ] = None ) -> Optional[ int ]:
+    """
+    Soma a memória residente (RSS) do Chrome em modo debug e de todos os seus
+    processos filhos (renderers, GPU, utilitários).
+
+    Args:
+        debug_port: Porta usada para localizar o processo pela flag --remote-debugging-port
+        pid: PID do processo raiz, quando conhecido (ex.: Chrome lançado com porta efêmera)
+    Returns:
+        int: Bytes de RSS, ou None se psutil não estiver disponível ou o Chrome não for encontrado
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    if pid is not None:
+        try:
+            root = psutil.Process( pid )
+            total = root.memory_info().rss
+            for child in root.children( recursive=True ):
+                try:
+                    total += child.memory_info().rss
+                except ( psutil.NoSuchProcess, psutil.AccessDenied ):
+                    continue
+            return total
+        except ( psutil.NoSuchProcess, psutil.AccessDenied ):
+            pass
+
+    flag = f"--remote-debugging-port={debug_port}"
+    total = 0
+    found = False
+
+    for proc in psutil.process_iter( [ 'cmdline' ] ):
+        try:
+            cmdline = proc.info.get( 'cmdline' ) or []
+            if flag not in cmdline:
+                continue
+            # Processos filhos herdam a flag; conta apenas a raiz e seus descendentes
+            parent = proc.parent()
+            if parent is not None and flag in ( parent.cmdline() or [] ):
+                continue
+            found = True
+            total += proc.memory_info().rss
+            for child in proc.children( recursive=True ):
+                try:
+                    total += child.memory_info().rss
+                except ( psutil.NoSuchProcess, psutil.AccessDenied ):
+                    continue
+        except ( psutil.NoSuchProcess, psutil.AccessDenied ):
+            continue
+
+    return total if found else None
+
+
+class _MetricsHandler( BaseHTTPRequestHandler ):
+    """Handler HTTP mínimo: /metrics (Prometheus) e /health (JSON)"""
+
+    registry: MetricsRegistry = None
+    health_check: Optional[ Callable[ [], bool ] ] = None
+
+    def do_GET( self ) -> None:
+        path = self.path.split( '?', 1 )[ 0 ]
+
+        if path == '/metrics':
+            body = self.registry.render().encode( 'utf-8' )
+            self._reply( 200, body, 'text/plain; version=0.0.4; charset=utf-8' )
+        elif path in ( '/health', '/healthz' ):
+            ready = bool( self.health_check() ) if self.health_check else True
+            body = json.dumps( { "ready": ready } ).encode( 'utf-8' )
+            self._reply( 200 if ready else 503, body, 'application/json' )
+        else:
+            self._reply( 404, b"not found\n", 'text/plain' )
+
+    def _reply( self, status: int, body: bytes, content_type: str ) -> None:
+        self.send_response( status )
+        self.send_header( 'Content-Type', content_type )
+        self.send_header( 'Content-Length', str( len( body ) ) )
+        self.end_headers()
+        self.wfile.write( body )
+
+    def log_message( self, format, *args ) -> None:
+        # Silencia o log padrão para não poluir o console do PDV
+        pass
+
+
+class MetricsServer:
+    """Servidor HTTP em thread daemon que expõe as métricas em localhost"""
+
+    def __init__(
+        self,
+        registry: MetricsRegistry,
+        port: int = DEFAULT_METRICS_PORT,
+        host: str = '127.0.0.1',
+        health_check: Optional[ Callable[ [], bool ] ] = None
+    ) -> None:
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self.health_check = health_check
+        self._server: Optional[ ThreadingHTTPServer ] = None
+        self._thread: Optional[ threading.Thread ] = None
+
+    def start( self ) -> bool:
+        """Inicia o servidor; retorna False se a porta não puder ser aberta"""
+        handler = type( '_BoundMetricsHandler', ( _MetricsHandler, ), {
+            'registry': self.registry,
+            'health_check': staticmethod( self.health_check ) if self.health_check else None
+        } )
+        try:
+            self._server = ThreadingHTTPServer( ( self.host, self.port ), handler )
+        except OSError as e:
+            print( f"⚠️ Endpoint de métricas indisponível em {self.host}:{self.port}: {e}" )
+            return False
+
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[ 1 ]
+        self._thread = threading.Thread( target=self._server.serve_forever, daemon=True )
+        self._thread.start()
+        print( f"📊 Métricas em http://{self.host}:{self.port}/metrics" )
+        return True
+
+    def stop( self ) -> None:
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+# Registro global usado pelo daemon
+metrics = MetricsRegistry()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+
+# ==============================================
+# runtime/replay.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Reproduz uma sessão gravada com `main.py --record-session` passando cada
+# transcrição por process_voice_command e pelo dispatcher da thread PDV,
+# contra uma página PDV substituta (sem Chrome). Serve como benchmark de
+# throughput e corpus de regressão do interpretador de comandos.
+#
+#   python -m runtime.replay sessao.ndjson            # velocidade original
+#   python -m runtime.replay sessao.ndjson --fast     # o mais rápido possível
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from runtime.session import SessionRecorder, load_session
+
+
+class StandInPDVBrowser:
+    """Substituto do BrowserCDP da thread PDV: registra as chamadas e sempre tem sucesso"""
+
+    def __init__( self, action_delay: float = 0.0 ) -> None:
+        """
+        Args:
+            action_delay: Atraso artificial por ação, para simular a página real
+        """
+        self.action_delay = action_delay
+        self.calls: List[ tuple ] = []
+
+    def __getattr__( self, name: str ):
+        if name.startswith( '_' ):
+            raise AttributeError( name )
+
+        def action( *args, **kwargs ):
+            self.calls.append( ( name, args ) )
+            if self.action_delay:
+                time.sleep( self.action_delay )
+            return True
+
+        return action
+
+    def get_page( self, page_name: str ):
+        return None
+
+
+def _expected_by_utterance( events: List[ Dict[ str, Any ] ] ) -> Dict[ int, List[ Any ] ]:
+    expected: Dict[ int, List[ Any ] ] = {}
+    for event in events:
+        if event.get( 'type' ) == 'intent' and event.get( 'utterance' ) is not None:
+            expected.setdefault( event[ 'utterance' ], [] ).append( [ event[ 'command' ], event.get( 'data' ) ] )
+    return expected
+
+
+def replay_session(
+    events: List[ Dict[ str, Any ] ],
+    fast: bool = False,
+    action_delay: float = 0.0,
+    quiet: bool = True,
+    runtime_module=None
+) -> Dict[ str, Any ]:
+    """
+    Reproduz os eventos de uma sessão e compara as intenções geradas com as gravadas.
+
+    Args:
+        events: Eventos carregados com load_session
+        fast: Ignora os intervalos originais entre falas
+        action_delay: Atraso por ação na página PDV substituta
+        quiet: Suprime a saída de console do main.py durante o replay
+        runtime_module: Módulo com process_voice_command/process_pdv_commands (padrão: main)
+    Returns:
+        dict: Relatório com contagens, divergências e tempos
+    """
+    if runtime_module is None:
+        import main as runtime_module
+
+    transcripts = [ e for e in events if e.get( 'type' ) == 'transcript' ]
+    expected = _expected_by_utterance( events )
+
+    recorder = SessionRecorder( None )
+    stand_in = StandInPDVBrowser( action_delay )
+
+    # Estado do daemon trocado durante o replay e restaurado ao final;
+    # 'desligar' nunca pode desligar a máquina de quem está depurando
+    patched = {
+        'session_recorder': recorder,
+        'pdv_browser': stand_in,
+        'pdv_ready': True,
+        'running': True,
+        'desligar_computador': lambda: False
+    }
+    saved = { name: getattr( runtime_module, name, None ) for name in patched }
+    for name, value in patched.items():
+        setattr( runtime_module, name, value )
+
+    try:
+        return _run_transcripts( runtime_module, recorder, transcripts, expected, fast, quiet )
+    finally:
+        for name, value in saved.items():
+            setattr( runtime_module, name, value )
+
+
+def _run_transcripts( runtime_module, recorder, transcripts, expected, fast, quiet ) -> Dict[ str, Any ]:
+    mismatches = []
+    start = time.monotonic()
+    first_t = transcripts[ 0 ][ 't' ] if transcripts else 0.0
+
+    for event in transcripts:
+        if not fast:
+            delay = ( event[ 't' ] - first_t ) - ( time.monotonic() - start )
+            if delay > 0:
+                time.sleep( delay )
+
+        # O PDV substituto nunca fecha, mesmo que a sessão tenha 'fechar pdv'
+        runtime_module.pdv_ready = True
+        sink = io.StringIO() if quiet else sys.stdout
+        with contextlib.redirect_stdout( sink ):
+            utterance = recorder.transcript( event.get( 'text', '' ), event.get( 'capture_seconds' ) )
+            recognized = runtime_module.process_voice_command( event.get( 'text', '' ) ) if event.get( 'text' ) else False
+            recorder.parsed( recognized )
+            runtime_module.process_pdv_commands()
+
+        produced = [
+            [ e[ 'command' ], e.get( 'data' ) ]
+            for e in recorder.events
+            if e[ 'type' ] == 'intent' and e[ 'utterance' ] == utterance
+        ]
+        wanted = expected.get( event.get( 'utterance' ), [] )
+        if produced != wanted:
+            mismatches.append( {
+                'utterance': event.get( 'utterance' ),
+                'text': event.get( 'text' ),
+                'expected': wanted,
+                'produced': produced
+            } )
+
+    elapsed = time.monotonic() - start
+    dispatches = [ e for e in recorder.events if e[ 'type' ] == 'dispatch' ]
+    latencies = sorted( e[ 'latency_seconds' ] for e in dispatches )
+
+    return {
+        'utterances': len( transcripts ),
+        'commands': len( dispatches ),
+        'mismatches': mismatches,
+        'elapsed_seconds': round( elapsed, 6 ),
+        'utterances_per_second': round( len( transcripts ) / elapsed, 2 ) if elapsed > 0 else None,
+        'commands_per_second': round( len( dispatches ) / elapsed, 2 ) if elapsed > 0 else None,
+        'latency_p50_seconds': latencies[ len( latencies ) // 2 ] if latencies else None,
+        'latency_max_seconds': latencies[ -1 ] if latencies else None,
+        'recorded_duration_seconds': round( transcripts[ -1 ][ 't' ] - first_t, 6 ) if transcripts else 0.0
+    }
+
+
+def main( argv: Optional[ List[ str ] ] = None ) -> None:
+    parser = argparse.ArgumentParser( description="Reproduz uma sessão de voz gravada contra um PDV substituto." )
+    parser.add_argument( "session", type=str, help="Arquivo de sessão (NDJSON) gravado com --record-session" )
+    parser.add_argument( "--fast", action="store_true", help="Reproduz o mais rápido possível (ignora intervalos)" )
+    parser.add_argument( "--action-delay", type=float, default=0.0, help="Atraso por ação do PDV substituto (s)" )
+    parser.add_argument( "--verbose", action="store_true", help="Mostra a saída do interpretador de comandos" )
+    parser.add_argument( "--json", action="store_true", help="Imprime o relatório em JSON" )
+    args = parser.parse_args( argv )
+
+    events = load_session( Path( args.session ) )
+    report = replay_session( events, fast=args.fast, action_delay=args.action_delay, quiet=not args.verbose )
+
+    if args.json:
+        print( json.dumps( report, ensure_ascii=False ) )
+    else:
+        print( "\n📼 REPLAY DA SESSÃO DE VOZ" )
+        print( "=" * 50 )
+        print( f"   Falas reproduzidas:   {report[ 'utterances' ]}" )
+        print( f"   Comandos executados:  {report[ 'commands' ]}" )
+        print( f"   Tempo total:          {report[ 'elapsed_seconds' ]:.3f}s (gravado: {report[ 'recorded_duration_seconds' ]:.3f}s)" )
+        print( f"   Throughput:           {report[ 'commands_per_second' ]} comandos/s" )
+        print( f"   Latência p50 / máx:   {report[ 'latency_p50_seconds' ]} / {report[ 'latency_max_seconds' ]} s" )
+        if report[ 'mismatches' ]:
+            print( f"\n   ❌ {len( report[ 'mismatches' ] )} divergência(s):" )
+            for m in report[ 'mismatches' ]:
+                print( f"      • '{m[ 'text' ]}': esperado {m[ 'expected' ]}, obtido {m[ 'produced' ]}" )
+        else:
+            print( "\n   ✅ Todas as intenções conferem com a gravação" )
+
+    sys.exit( 1 if report[ 'mismatches' ] else 0 )
+
+
+if __name__ == "__main__":
+    main()
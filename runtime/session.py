@@ -0,0 +1,130 @@
+# ==============================================
+# runtime/session.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Versão do formato do arquivo de sessão (NDJSON, um evento por linha)
+SESSION_FORMAT_VERSION = 1
+
+
+class SessionRecorder:
+    """
+    Grava uma sessão de voz em NDJSON: transcrições capturadas, intenções
+    interpretadas, comandos despachados ao PDV e seus tempos.
+
+    Cada evento tem 't' (segundos desde o início da sessão) e 'type':
+        - session:    cabeçalho com versão e data de início
+        - transcript: texto capturado ('utterance', 'text', 'capture_seconds')
+        - parsed:     resultado de process_voice_command ('utterance', 'recognized')
+        - intent:     comando enfileirado ('utterance', 'command', 'data')
+        - dispatch:   comando executado pela thread PDV ('utterance', 'command',
+                      'latency_seconds', 'ok')
+    """
+
+    def __init__( self, path: Optional[ Path ] = None ) -> None:
+        """
+        Args:
+            path: Arquivo de destino, sobrescrito (um arquivo por sessão, já que ids de
+                  fala e tempos recomeçam em 0); None mantém os eventos apenas em memória
+                  (replay), sem crescer durante a vida do daemon quando há arquivo
+        """
+        self.path = Path( path ) if path else None
+        self.events: List[ Dict[ str, Any ] ] = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._start = time.monotonic()
+        self._next_utterance = 0
+        self._file = open( self.path, 'w', encoding='utf-8' ) if self.path else None
+
+        self._write( {
+            'type': 'session',
+            'version': SESSION_FORMAT_VERSION,
+            'started_at': datetime.now().isoformat()
+        } )
+
+    def _write( self, event: Dict[ str, Any ] ) -> None:
+        event = { 't': round( time.monotonic() - self._start, 6 ), **event }
+        with self._lock:
+            if self.path is None:
+                self.events.append( event )
+            elif self._file:
+                self._file.write( json.dumps( event, ensure_ascii=False ) + "\n" )
+                self._file.flush()
+
+    @property
+    def current_utterance( self ) -> Optional[ int ]:
+        """Identificador da fala em processamento na thread atual"""
+        return getattr( self._local, 'utterance', None )
+
+    def transcript( self, text: str, capture_seconds: Optional[ float ] = None ) -> int:
+        """Registra uma transcrição e a associa à thread atual; retorna o id da fala"""
+        with self._lock:
+            utterance = self._next_utterance
+            self._next_utterance += 1
+        self._local.utterance = utterance
+        self._write( {
+            'type': 'transcript',
+            'utterance': utterance,
+            'text': text,
+            'capture_seconds': capture_seconds
+        } )
+        return utterance
+
+    def parsed( self, recognized: bool ) -> None:
+        self._write( { 'type': 'parsed', 'utterance': self.current_utterance, 'recognized': bool( recognized ) } )
+
+    def intent( self, command: str, data: Any = None ) -> None:
+        self._write( { 'type': 'intent', 'utterance': self.current_utterance, 'command': command, 'data': data } )
+
+    def dispatch( self, command: str, latency_seconds: float, ok: bool, utterance: Optional[ int ] = None ) -> None:
+        self._write( {
+            'type': 'dispatch',
+            'utterance': utterance,
+            'command': command,
+            'latency_seconds': round( latency_seconds, 6 ),
+            'ok': bool( ok )
+        } )
+
+    def close( self ) -> None:
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+
+def load_session( path: Path ) -> List[ Dict[ str, Any ] ]:
+    """Carrega os eventos de um arquivo de sessão, ignorando linhas corrompidas"""
+    events = []
+    with open( path, 'r', encoding='utf-8' ) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                events.append( json.loads( line ) )
+            except json.JSONDecodeError:
+                continue
+    return events
@@ -0,0 +1,257 @@
+# ==============================================
+# runtime/startup.py
+# version: 0.0.1
+# author: silvioantunes1@hotmail.com
+# ==============================================
+
+# Copyright (C) 2025 Silvio Antunes
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+class StartupTimer:
+    """Cronometra as fases da inicialização do daemon (thread-safe)"""
+
+    def __init__( self ) -> None:
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self.phases: List[ Dict[ str, object ] ] = []
+
+    def now( self ) -> float:
+        """Segundos desde o início da inicialização"""
+        return time.perf_counter() - self._origin
+
+    def record( self, name: str, start: float, end: float, ok: bool = True ) -> None:
+        """Registra uma fase com início/fim relativos à origem"""
+        with self._lock:
+            self.phases.append( {
+                'name': name,
+                'start': start,
+                'end': end,
+                'ok': ok,
+                'thread': threading.current_thread().name
+            } )
+
+    @contextmanager
+    def phase( self, name: str ) -> Iterator[ None ]:
+        """Cronometra o bloco como uma fase; exceções marcam a fase como falha"""
+        start = self.now()
+        ok = False
+        try:
+            yield
+            ok = True
+        finally:
+            self.record( name, start, self.now(), ok )
+
+    def total( self ) -> float:
+        with self._lock:
+            return max( ( p[ 'end' ] for p in self.phases ), default=0.0 )
+
+    def report( self, title: str = "TEMPOS DE INICIALIZAÇÃO" ) -> str:
+        """Relatório fase a fase (ordenado pelo início de cada fase)"""
+        with self._lock:
+            phases = sorted( self.phases, key=lambda p: p[ 'start' ] )
+
+        lines = [ "", "⏱️  " + title, "-" * 60 ]
+        for p in phases:
+            status = "✅" if p[ 'ok' ] else "❌"
+            duration_ms = ( p[ 'end' ] - p[ 'start' ] ) * 1000
+            lines.append(
+                f"   {status} {p[ 'name' ]:<24} {duration_ms:>8.0f} ms"
+                f"   (+{p[ 'start' ] * 1000:.0f} → +{p[ 'end' ] * 1000:.0f} ms, {p[ 'thread' ]})"
+            )
+        lines.append( "-" * 60 )
+        lines.append( f"   Total: {self.total() * 1000:.0f} ms" )
+        return "\n".join( lines )
+
+
+class StartupOrchestrator:
+    """
+    Executa fases independentes da inicialização em paralelo e sinaliza a
+    conclusão de cada uma com threading.Event, sem laços de sleep.
+
+    Cada fase declara as fases de que depende (requires). Fases registradas
+    com add() rodam em threads próprias; fases que precisam rodar em uma thread
+    específica (ex.: objetos síncronos do Playwright, presos à thread que os
+    criou) usam step() ou signal() na própria thread.
+
+    Uma fase cujas dependências falharam é marcada como falha sem executar.
+    """
+
+    def __init__( self, timer: Optional[ StartupTimer ] = None ) -> None:
+        self.timer = timer or StartupTimer()
+        self._lock = threading.Lock()
+        self._events: Dict[ str, threading.Event ] = {}
+        self._ok: Dict[ str, bool ] = {}
+        self._results: Dict[ str, Any ] = {}
+        self._errors: Dict[ str, str ] = {}
+        self._requires: Dict[ str, Tuple[ str, ... ] ] = {}
+        self._spans: Dict[ str, Tuple[ float, float ] ] = {}
+        self._tasks: List[ Tuple[ str, Callable[ [], Any ] ] ] = []
+
+    def _event( self, name: str ) -> threading.Event:
+        with self._lock:
+            return self._events.setdefault( name, threading.Event() )
+
+    def add( self, name: str, func: Callable[ [], Any ], requires: Iterable[ str ] = () ) -> None:
+        """Registra uma fase executada em thread própria; retornar False marca falha"""
+        with self._lock:
+            self._requires[ name ] = tuple( requires )
+            self._tasks.append( ( name, func ) )
+        self._event( name )
+
+    def start( self ) -> None:
+        """Dispara as fases registradas com add()"""
+        with self._lock:
+            tasks, self._tasks = self._tasks, []
+        for name, func in tasks:
+            threading.Thread( target=self._run, args=( name, func ), name=f"startup-{name}", daemon=True ).start()
+
+    def _run( self, name: str, func: Callable[ [], Any ] ) -> None:
+        if not self._dependencies_ok( name ):
+            return
+        start = self.timer.now()
+        try:
+            result = func()
+            self._finish( name, result is not False, start, result )
+        except Exception as e:
+            self._finish( name, False, start, error=str( e ) )
+
+    def _dependencies_ok( self, name: str ) -> bool:
+        """Aguarda as dependências; se alguma falhar, marca a fase como falha"""
+        for dep in self._requires.get( name, () ):
+            if not self.wait( dep ):
+                now = self.timer.now()
+                self._finish( name, False, now, error=f"dependência '{dep}' falhou", end=now )
+                return False
+        return True
+
+    def _finish(
+        self,
+        name: str,
+        ok: bool,
+        start: float,
+        result: Any = None,
+        error: Optional[ str ] = None,
+        end: Optional[ float ] = None
+    ) -> None:
+        end = self.timer.now() if end is None else end
+        self.timer.record( name, start, end, ok )
+        with self._lock:
+            self._ok[ name ] = ok
+            self._results[ name ] = result
+            self._spans[ name ] = ( start, end )
+            if error:
+                self._errors[ name ] = error
+        self._event( name ).set()
+
+    @contextmanager
+    def step( self, name: str, requires: Iterable[ str ] = () ) -> Iterator[ None ]:
+        """
+        Cronometra um bloco executado na thread atual como fase do startup.
+        As dependências devem ter sido aguardadas antes (wait_all); exceções
+        marcam a fase como falha e são propagadas.
+        """
+        with self._lock:
+            self._requires[ name ] = tuple( requires )
+        start = self.timer.now()
+        ok = False
+        try:
+            yield
+            ok = True
+        except Exception as e:
+            self._finish( name, False, start, error=str( e ) )
+            raise
+        finally:
+            if ok:
+                self._finish( name, True, start )
+
+    def signal( self, name: str, ok: bool = True, requires: Iterable[ str ] = () ) -> None:
+        """Marca um marco instantâneo (ex.: 'pdv_ready'); ignorado se já sinalizado"""
+        if self._event( name ).is_set():
+            return
+        with self._lock:
+            self._requires[ name ] = tuple( requires )
+        now = self.timer.now()
+        self._finish( name, ok, now, end=now )
+
+    def wait( self, name: str, timeout: Optional[ float ] = None ) -> Optional[ bool ]:
+        """
+        Aguarda a conclusão de uma fase.
+
+        Returns:
+            bool: True/False conforme o sucesso da fase, ou None se o timeout expirar
+        """
+        if not self._event( name ).wait( timeout ):
+            return None
+        with self._lock:
+            return self._ok.get( name, False )
+
+    def wait_all( self, names: Iterable[ str ], timeout: Optional[ float ] = None ) -> bool:
+        """Aguarda várias fases; True somente se todas concluírem com sucesso"""
+        deadline = None if timeout is None else time.perf_counter() + timeout
+        for name in names:
+            remaining = None if deadline is None else max( 0.0, deadline - time.perf_counter() )
+            if not self.wait( name, remaining ):
+                return False
+        return True
+
+    def result( self, name: str ) -> Any:
+        with self._lock:
+            return self._results.get( name )
+
+    def error( self, name: str ) -> Optional[ str ]:
+        with self._lock:
+            return self._errors.get( name )
+
+    def critical_path( self, target: str ) -> Tuple[ float, List[ str ] ]:
+        """
+        Caminho crítico até `target`: a partir do alvo, segue sempre a
+        dependência que terminou por último (a que de fato segurou o início).
+
+        Returns:
+            tuple: (instante de conclusão do alvo em segundos, fases do caminho em ordem)
+        """
+        with self._lock:
+            spans = dict( self._spans )
+            requires = dict( self._requires )
+
+        if target not in spans:
+            return 0.0, []
+
+        path = [ target ]
+        current = target
+        while True:
+            deps = [ d for d in requires.get( current, () ) if d in spans ]
+            if not deps:
+                break
+            current = max( deps, key=lambda d: spans[ d ][ 1 ] )
+            path.append( current )
+        return spans[ target ][ 1 ], list( reversed( path ) )
+
+    def report( self, target: str, title: str = "TEMPOS DE INICIALIZAÇÃO" ) -> str:
+        """Relatório fase a fase seguido do caminho crítico até `target`"""
+        elapsed, path = self.critical_path( target )
+        with self._lock:
+            serial = sum( end - start for start, end in self._spans.values() )
+        lines = [ self.timer.report( title ) ]
+        if path:
+            lines.append( f"   Caminho crítico: {' → '.join( path )} ({elapsed * 1000:.0f} ms)" )
+            lines.append( f"   Soma das fases (execução serial): {serial * 1000:.0f} ms" )
+        return "\n".join( lines )
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark do registro de configurações (ConfigManager): backend JSON x SQLite.
+
+Mede, para 10, 1 mil e 100 mil configurações:
+    - abertura do ConfigManager (carga do registro)
+    - consulta por nome (get_config)
+    - atualização (update_config_description: uma escrita completa no JSON,
+      uma transação no SQLite)
+    - last_used em lote (flush de 49 consultas pendentes)
+
+Uso:
+    python3 scripts/registry_benchmark.py
+    python3 scripts/registry_benchmark.py --sizes 10 1000 --json
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from credentials.config.config import CONFIGS_REGISTRY_DB
+from credentials.config.config_manager import ConfigManager, ConfigInfo, CONFIGS_REGISTRY_FILE
+from credentials.config.sqlite_registry import SQLiteRegistry
+
+def _rows(count):
+    for i in range(count):
+        yield asdict(ConfigInfo(
+            name=f"loja-{i:06d}",
+            base_directory=f"/srv/lojas/{i % 100:03d}",
+            folder_name=".credentials",
+            credentials_filename="credentials.enc",
+            key_filename="key.key",
+            created_at="2025-01-01T00:00:00",
+            last_used=None if i % 3 else f"2025-06-{1 + i % 28:02d}T12:00:00",
+            description=None
+        ))
+
+def _populate(registry_dir, backend, count):
+    registry_dir.mkdir(parents=True, exist_ok=True)
+    if backend == "json":
+        data = {row["name"]: row for row in _rows(count)}
+        (registry_dir / CONFIGS_REGISTRY_FILE).write_text(json.dumps(data))
+    else:
+        db = SQLiteRegistry(registry_dir / CONFIGS_REGISTRY_DB)
+        db.import_rows(_rows(count))
+        db.close()
+
+def _timed(func, repeat):
+    start = time.perf_counter()
+    for i in range(repeat):
+        func(i)
+    return (time.perf_counter() - start) / repeat
+
+def bench(backend, count):
+    with tempfile.TemporaryDirectory() as tmp:
+        registry_dir = Path(tmp) / "registry"
+        _populate(registry_dir, backend, count)
+        names = [f"loja-{i:06d}" for i in range(0, count, max(1, count // 50))]
+        updates = 5 if count >= 100000 else 20
+
+        start = time.perf_counter()
+        manager = ConfigManager(registry_base_dir=registry_dir, backend=backend)
+        open_s = time.perf_counter() - start
+
+        # Abaixo de LAST_USED_FLUSH_COUNT: consultas puras, sem escrita; o flush do lote é medido à parte
+        lookup_s = _timed(lambda i: manager.get_config(names[i % len(names)]), 49)
+        flush_s = _timed(lambda i: manager.flush(), 1)
+        update_s = _timed(lambda i: manager.update_config_description(names[i % len(names)], f"d{i}"), updates)
+        query_s = _timed(lambda i: manager.find_configs(base_directory="/srv/lojas/007", limit=20), 20)
+        manager.flush()
+
+    return {
+        "backend": backend,
+        "configs": count,
+        "open_ms": round(open_s * 1000, 3),
+        "lookup_us": round(lookup_s * 1e6, 1),
+        "update_ms": round(update_s * 1000, 3),
+        "last_used_flush_ms": round(flush_s * 1000, 3),
+        "query_base_dir_ms": round(query_s * 1000, 3)
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark do registro de configurações (JSON x SQLite).")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1000, 100000])
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite"], choices=["json", "sqlite"])
+    parser.add_argument("--json", action="store_true", help="Imprime os resultados em NDJSON")
+    args = parser.parse_args(argv)
+
+    if not args.json:
+        print(f"{'backend':<8} {'configs':>8} {'abrir ms':>10} {'get µs':>9} {'update ms':>10} {'flush ms':>9} {'busca ms':>9}")
+    for count in args.sizes:
+        for backend in args.backends:
+            r = bench(backend, count)
+            if args.json:
+                print(json.dumps(r))
+            else:
+                print(f"{r['backend']:<8} {r['configs']:>8} {r['open_ms']:>10} {r['lookup_us']:>9} "
+                      f"{r['update_ms']:>10} {r['last_used_flush_ms']:>9} {r['query_base_dir_ms']:>9}")
+
+if __name__ == "__main__":
+    main()
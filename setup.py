@@ -129,17 +129,22 @@ setup(
     entry_points={
         "console_scripts": [
             # === COMANDOS DE CREDENCIAIS ===
+            "cred=credentials.commands.cred:main",
             "check_cred=credentials.commands.check_cred:main",
             "check_cred_json=credentials.commands.check_cred_json:main", 
+            "check_cred_bin=credentials.commands.check_cred_bin:main",
             "create_cred=credentials.commands.create_cred:main",
             "create_cred_json=credentials.commands.creat_cred_json:main",
             "show_cred=credentials.commands.show_cred:main",
             "show_cred_json=credentials.commands.show_cred_json:main",
+            "calibrate_kdf=credentials.commands.calibrate_kdf:main",
+            "cred-agent=credentials.commands.cred_agent:main",
             
             # === COMANDOS DO SISTEMA ===
             "browser_automation=main:main",
             "setup_browser_automation=custom_setup:main",
             "test_browser_automation=test_installation:main",
+            "replay_voice_session=runtime.replay:main",
             
             # === COMANDOS DE DESENVOLVIMENTO ===
             "identify_mouse_buttons=main:main --identify",
@@ -15,6 +15,13 @@ safe_copy_profile() {
     # Criar diretório de destino
     mkdir -p "$DEBUG_PROFILE"
     
+    # Snapshot incremental (só o necessário, com hard links/reflinks), se disponível
+    SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+    if (cd "$SCRIPT_DIR" && python3 -m browser.profile_snapshot --source "$SOURCE_PROFILE" --dest "$DEBUG_PROFILE"); then
+        echo "   ✅ Perfil sincronizado com snapshot incremental"
+        return 0
+    fi
+    
     # Copiar usando rsync (mais robusto) ou cp com exclusões
     if command -v rsync >/dev/null 2>&1; then
         echo "   → Usando rsync para cópia robusta..."
@@ -118,8 +125,9 @@ if [ -d "$DEBUG_PROFILE" ]; then
     if [[ $recreate =~ ^[Ss]$ ]]; then
         echo "🗑️ Removendo perfil antigo..."
         rm -rf "$DEBUG_PROFILE"
-        safe_copy_profile
     fi
+    # Ressincroniza apenas o que mudou no perfil original
+    safe_copy_profile
 else
     safe_copy_profile
 fi
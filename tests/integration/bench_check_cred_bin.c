@@ -0,0 +1,158 @@
+/*
+ * Benchmark: one-shot check_cred_bin (popen per check) vs. the persistent
+ * frame server (check_cred_bin --serve) driven through pipes.
+ *
+ *   gcc -O2 -o bench_check_cred_bin tests/integration/bench_check_cred_bin.c
+ *   ./bench_check_cred_bin [checks=10000] [batch=256] [oneshot=20] [config_name]
+ *
+ * CHECK_CRED_BIN overrides the command (e.g. "python3 credentials/commands/check_cred_bin.py").
+ */
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <stdint.h>
+#include <unistd.h>
+#include <signal.h>
+#include <sys/wait.h>
+#include <time.h>
+
+#define CONFIG_NAME_SIZE 64
+
+#pragma pack(push, 1)
+typedef struct {
+    char config_name[CONFIG_NAME_SIZE];
+    int32_t check_type;            /* 0 all, 1 directory, 2 credentials, 3 key */
+} check_request;
+
+typedef struct {
+    int32_t status;                /* 0, CONFIG_NOT_FOUND (181) or CONFIG_INVALID (182) */
+    int32_t directory;
+    int32_t credentials;
+    int32_t key;                   /* -1 when not requested */
+} check_response;
+#pragma pack(pop)
+
+static double now_seconds(void) {
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return ts.tv_sec + ts.tv_nsec / 1e9;
+}
+
+static int write_all(int fd, const void *buffer, size_t size) {
+    const char *p = buffer;
+    while (size) {
+        ssize_t n = write(fd, p, size);
+        if (n <= 0) return -1;
+        p += n;
+        size -= (size_t)n;
+    }
+    return 0;
+}
+
+static int read_all(int fd, void *buffer, size_t size) {
+    char *p = buffer;
+    while (size) {
+        ssize_t n = read(fd, p, size);
+        if (n <= 0) return -1;
+        p += n;
+        size -= (size_t)n;
+    }
+    return 0;
+}
+
+/* Start "<command> --serve" with stdin/stdout connected to pipes. */
+static pid_t start_server(const char *command, int *to_server, int *from_server) {
+    int in[2], out[2];
+    char shell_command[512];
+    if (pipe(in) || pipe(out)) return -1;
+    snprintf(shell_command, sizeof shell_command, "exec %s --serve", command);
+
+    pid_t pid = fork();
+    if (pid == 0) {
+        dup2(in[0], STDIN_FILENO);
+        dup2(out[1], STDOUT_FILENO);
+        close(in[0]); close(in[1]); close(out[0]); close(out[1]);
+        execl("/bin/sh", "sh", "-c", shell_command, (char *)NULL);
+        _exit(127);
+    }
+    close(in[0]);
+    close(out[1]);
+    *to_server = in[1];
+    *from_server = out[0];
+    return pid;
+}
+
+int main(int argc, char **argv) {
+    long checks = argc > 1 ? atol(argv[1]) : 10000;
+    long batch = argc > 2 ? atol(argv[2]) : 256;
+    long oneshot = argc > 3 ? atol(argv[3]) : 20;
+    const char *config_name = argc > 4 ? argv[4] : "";
+    const char *command = getenv("CHECK_CRED_BIN") ? getenv("CHECK_CRED_BIN") : "check_cred_bin";
+    char oneshot_command[512];
+    int32_t results[3];
+    int to_server, from_server;
+
+    signal(SIGPIPE, SIG_IGN);
+    if (batch < 1) batch = 1;
+
+    /* One Python process per check */
+    snprintf(oneshot_command, sizeof oneshot_command, "%s", command);
+    double start = now_seconds();
+    for (long i = 0; i < oneshot; i++) {
+        FILE *fp = popen(oneshot_command, "r");
+        if (!fp || fread(results, sizeof(int32_t), 3, fp) != 3) {
+            fprintf(stderr, "one-shot check failed\n");
+            return EXIT_FAILURE;
+        }
+        pclose(fp);
+    }
+    double oneshot_elapsed = now_seconds() - start;
+
+    /* Persistent server, pipelined in batches */
+    check_request *requests = calloc((size_t)batch, sizeof *requests);
+    check_response *responses = calloc((size_t)batch, sizeof *responses);
+    for (long i = 0; i < batch; i++) {
+        strncpy(requests[i].config_name, config_name, CONFIG_NAME_SIZE);
+        requests[i].check_type = 0;
+    }
+
+    start = now_seconds();
+    pid_t pid = start_server(command, &to_server, &from_server);
+    if (pid < 0) {
+        perror("start server");
+        return EXIT_FAILURE;
+    }
+    /* Warm-up request: interpreter start and imports are paid once */
+    if (write_all(to_server, requests, sizeof *requests) || read_all(from_server, responses, sizeof *responses)) {
+        fprintf(stderr, "server did not answer\n");
+        return EXIT_FAILURE;
+    }
+    double startup_elapsed = now_seconds() - start;
+
+    long done = 0, failures = 0;
+    start = now_seconds();
+    while (done < checks) {
+        long n = checks - done < batch ? checks - done : batch;
+        if (write_all(to_server, requests, (size_t)n * sizeof *requests) ||
+            read_all(from_server, responses, (size_t)n * sizeof *responses)) {
+            fprintf(stderr, "server pipe closed after %ld checks\n", done);
+            return EXIT_FAILURE;
+        }
+        for (long i = 0; i < n; i++)
+            failures += responses[i].status != 0 || responses[i].directory != 0 ||
+                        responses[i].credentials != 0 || responses[i].key != 0;
+        done += n;
+    }
+    double server_elapsed = now_seconds() - start;
+
+    close(to_server);
+    waitpid(pid, NULL, 0);
+    free(requests);
+    free(responses);
+
+    printf("one-shot : %ld checks, %.3f ms/check\n", oneshot, oneshot ? oneshot_elapsed * 1e3 / oneshot : 0.0);
+    printf("server   : startup %.1f ms, %ld checks (batch %ld), %.2f us/check, %.0f checks/s\n",
+           startup_elapsed * 1e3, checks, batch, server_elapsed * 1e6 / checks, checks / server_elapsed);
+    printf("incomplete/failed checks: %ld\n", failures);
+    return EXIT_SUCCESS;
+}
@@ -0,0 +1,66 @@
+import stat
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from credentials.config.config import CredentialsConfig
+from credentials.core.agent import AgentClient, CredentialsAgent
+from credentials.core.credentials_cache import credentials_cache
+from credentials.core.credentials_reader import CredentialsReader
+from credentials.credentials import Credentials
+from credentials.crypto.decrypto_manager import DecryptoManager
+from credentials.crypto.key_cache import key_cache
+from credentials.message.msg_code import MsgCode
+
+class TestCredentialsAgent(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+        self.socket_path = self.base / 'run' / 'agent.sock'
+        self.client = AgentClient(self.socket_path)
+        with patch('credentials.core.credentials_reader.agent_enabled', return_value=False):
+            creds = Credentials(base_directory=self.base)
+        creds.create_credentials(email='op@loja.com', password='segredo')
+        self.config = CredentialsConfig(base_directory=self.base)
+        self.agent = CredentialsAgent(self.socket_path, idle_timeout=None)
+        self.agent.start()
+
+    def tearDown(self):
+        self.agent.shutdown()
+        credentials_cache.invalidate()
+        key_cache.invalidate()
+        self.tmp.cleanup()
+
+    def test_reader_uses_agent_instead_of_decrypting(self):
+        # Test that a reader is served by the agent and the socket is owner-only.
+        self.assertEqual(stat.S_IMODE(self.socket_path.stat().st_mode), 0o600)
+        self.assertTrue(self.client.ping())
+
+        self.assertEqual(self.client.get(self.config)[0], MsgCode.SUCCESS)   # agent unlocks once
+        credentials_cache.invalidate()
+        with patch.object(DecryptoManager, 'load_and_decrypt_credentials', side_effect=AssertionError('decrypted locally')):
+            reader = CredentialsReader(self.config, freshness=0, agent=self.client)
+            self.assertEqual(reader.get_password(), (MsgCode.SUCCESS, 'segredo'))
+            self.assertEqual(reader.verify_login('op@loja.com', 'segredo'), MsgCode.SUCCESS)
+            self.assertEqual(reader.verify_login('op@loja.com', 'errada'), MsgCode.CREDENTIALS_INVALID)
+
+    def test_fallback_and_idle_wipe(self):
+        # Test local decryption without agent and that idle entries are dropped.
+        self.client.get(self.config)
+        self.assertEqual(self.client.request({'op': 'ping'})['entries'], 1)
+        self.agent.idle_timeout = 0.05
+        self.agent._last_request = time.monotonic() - 1
+        self.assertFalse(self.agent.expire_idle())
+        self.assertEqual(self.agent._cache.stats()['entries'], 0)
+
+        self.assertTrue(self.client.stop())
+        time.sleep(0.1)
+        self.assertIsNone(self.client.get(self.config))
+        reader = CredentialsReader(self.config, freshness=0, agent=self.client)
+        self.assertEqual(reader.get_email(), (MsgCode.SUCCESS, 'op@loja.com'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from cryptography.fernet import Fernet
+
+from credentials.credentials import Credentials
+from credentials.crypto.key_cache import key_cache
+from credentials.crypto.stream_cipher import encrypt_stream, decrypt_stream, StreamCipherError, HEADER, LENGTH
+from credentials.message.msg_code import MsgCode
+
+class TestStreamCipher(unittest.TestCase):
+
+    def setUp(self):
+        self.key = Fernet.generate_key()
+
+    def _encrypt(self, data, chunk_size=1024):
+        sealed = io.BytesIO()
+        self.assertEqual(encrypt_stream(self.key, io.BytesIO(data), sealed, chunk_size), len(data))
+        return sealed.getvalue()
+
+    def test_round_trip_across_chunk_boundaries(self):
+        # Test empty, exact-multiple and ragged sizes.
+        for size in (0, 1, 1024, 4096, 5000):
+            with self.subTest(size=size):
+                data = os.urandom(size)
+                output = io.BytesIO()
+                decrypt_stream(self.key, io.BytesIO(self._encrypt(data)), output)
+                self.assertEqual(output.getvalue(), data)
+
+    def test_tampering_and_truncation_are_detected(self):
+        # Test flipped bits, a dropped final chunk and the wrong key.
+        sealed = self._encrypt(os.urandom(3000))
+        chunk = LENGTH.size + 1024 + 16
+
+        flipped = bytearray(sealed)
+        flipped[HEADER.size + LENGTH.size + 10] ^= 1
+        dropped_last = sealed[:HEADER.size + 2 * chunk]
+
+        for broken, key in ((bytes(flipped), self.key), (dropped_last, self.key), (sealed, Fernet.generate_key())):
+            with self.assertRaises(StreamCipherError):
+                decrypt_stream(key, io.BytesIO(broken), io.BytesIO())
+
+class TestCredentialsAttachments(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+        self.creds = Credentials(base_directory=self.base)
+        self.assertEqual(self.creds.create_credentials(email='a@b.c', password='s'), MsgCode.SUCCESS)
+
+    def tearDown(self):
+        key_cache.invalidate(self.creds.key_file_path)
+        self.tmp.cleanup()
+
+    def test_attachment_is_kept_out_of_credentials_file(self):
+        # Test that a large PFX is stored apart and only a reference lands in additional_data.
+        pfx = os.urandom(3 * 1024 * 1024 + 7)
+        source = self.base / 'loja.pfx'
+        source.write_bytes(pfx)
+        size_before = self.creds.credentials_file_path.stat().st_size
+
+        self.assertEqual(self.creds.add_attachment('certificado_a1', source), MsgCode.SUCCESS)
+        self.assertLess(self.creds.credentials_file_path.stat().st_size, size_before + 1024)
+        self.assertEqual(self.creds.get_password(), (MsgCode.SUCCESS, 's'))
+
+        target = self.base / 'out.pfx'
+        self.assertEqual(self.creds.get_attachment('certificado_a1', target), MsgCode.SUCCESS)
+        self.assertEqual(target.read_bytes(), pfx)
+        self.assertEqual(self.creds.read_attachment('certificado_a1'), (MsgCode.SUCCESS, pfx))
+
+        self.assertEqual(self.creds.remove_attachment('certificado_a1'), MsgCode.SUCCESS)
+        self.assertEqual(self.creds.read_attachment('certificado_a1'), (MsgCode.ATTACHMENT_NOT_FOUND, None))
+        self.assertEqual(list((self.creds.credentials_directory / 'attachments').iterdir()), [])
+
+    def test_attachments_and_session_survive_a_new_key(self):
+        # Test that create_credentials re-encrypts kept attachments and the session, and drops unreferenced ones.
+        self.creds.add_attachment('certificado_a1', io.BytesIO(b'pfx-1'))
+        self.creds.add_attachment('contrato', io.BytesIO(b'doc'))
+        self.creds.save_session({'cookies': [{'name': 'sid', 'value': 'x'}], 'origins': []})
+        key = self.creds.key_file_path.read_bytes()
+
+        additional_data = self.creds.get_additional_data()[1]
+        del additional_data['attachments']['contrato']
+        self.assertEqual(self.creds.create_credentials(email='a@b.c', password='s2', additional_data=additional_data), MsgCode.SUCCESS)
+        self.assertNotEqual(self.creds.key_file_path.read_bytes(), key)
+
+        self.assertEqual(self.creds.read_attachment('certificado_a1'), (MsgCode.SUCCESS, b'pfx-1'))
+        self.assertEqual(self.creds.load_session()[1]['cookies'][0]['value'], 'x')
+        self.assertEqual(len(list((self.creds.credentials_directory / 'attachments').iterdir())), 1)
+
+        # Without the references every attachment file goes
+        self.assertEqual(self.creds.create_credentials(email='a@b.c', password='s3'), MsgCode.SUCCESS)
+        self.assertEqual(list((self.creds.credentials_directory / 'attachments').iterdir()), [])
+        self.assertEqual(self.creds.load_session()[0], MsgCode.SUCCESS)
+
+if __name__ == '__main__':
+    unittest.main()
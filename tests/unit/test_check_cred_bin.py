@@ -0,0 +1,68 @@
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from credentials.commands.check_cred_bin import CheckServer, REQUEST, RESPONSE, CHECK_ALL, CHECK_KEY, NOT_CHECKED
+from credentials.config.config_manager import ConfigManager
+from credentials.message.msg_code import MsgCode
+
+def frame(name, check_type=CHECK_ALL):
+    return REQUEST.pack(name.encode(), check_type)
+
+class TestCheckServer(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+        self.manager = ConfigManager(registry_base_dir=self.base / 'registry')
+        _, config = self.manager.register_config('loja', base_directory=self.base)
+        config.ensure_secure_directory()
+        config.credentials_file.write_bytes(b'x')
+        os.chmod(config.credentials_file, 0o600)
+        self.server = CheckServer(self.manager)
+
+    def tearDown(self):
+        self.manager.flush()
+        self.tmp.cleanup()
+
+    def test_frames(self):
+        # Test full and single checks, unknown configs and malformed requests.
+        self.assertEqual(RESPONSE.unpack(self.server.answer(frame('loja'))),
+                         (MsgCode.SUCCESS, MsgCode.SUCCESS, MsgCode.SUCCESS, MsgCode.MISSING_KEY_FILE))
+        self.assertEqual(RESPONSE.unpack(self.server.answer(frame('loja', CHECK_KEY))),
+                         (MsgCode.SUCCESS, NOT_CHECKED, NOT_CHECKED, MsgCode.MISSING_KEY_FILE))
+        self.assertEqual(RESPONSE.unpack(self.server.answer(frame('outra')))[0], MsgCode.CONFIG_NOT_FOUND)
+        self.assertEqual(RESPONSE.unpack(self.server.answer(frame('loja', 9)))[0], MsgCode.CONFIG_INVALID)
+        self.assertIsNone(self.manager.list_configs()[0].last_used)
+
+    def test_pipelined_frames_over_pipes(self):
+        # Test that a batch split across writes gets one ordered response per request.
+        to_server_r, to_server_w = os.pipe()
+        from_server_r, from_server_w = os.pipe()
+        thread = threading.Thread(target=self.server.serve_fd, args=(to_server_r, from_server_w))
+        thread.start()
+
+        batch = b''.join(frame('loja' if i % 2 else 'outra') for i in range(500))
+        os.write(to_server_w, batch[:1000])
+        os.write(to_server_w, batch[1000:])
+        os.close(to_server_w)
+        thread.join(10)
+        os.close(from_server_w)
+
+        replies = b''
+        while True:
+            chunk = os.read(from_server_r, 65536)
+            if not chunk:
+                break
+            replies += chunk
+        os.close(from_server_r)
+        os.close(to_server_r)
+
+        statuses = [RESPONSE.unpack_from(replies, i * RESPONSE.size)[0] for i in range(len(replies) // RESPONSE.size)]
+        self.assertEqual(len(statuses), 500)
+        self.assertEqual(statuses[:2], [MsgCode.CONFIG_NOT_FOUND, MsgCode.SUCCESS])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import os
+import stat
+import sys
+import tempfile
+import textwrap
+import unittest
+from pathlib import Path
+
+from browser.chrome_launcher import ChromeLauncher, read_active_port, DEVTOOLS_ACTIVE_PORT
+
+# Stand-in for google-chrome: announces an ephemeral port the way Chrome does.
+FAKE_CHROME = textwrap.dedent('''\
+    #!{python}
+    import os, sys, time
+    args = dict(a.split("=", 1) for a in sys.argv[1:] if "=" in a)
+    profile = args["--user-data-dir"]
+    port = int(args["--remote-debugging-port"]) or 40123
+    time.sleep(0.2)
+    if os.environ.get("FAKE_CHROME_MODE") == "stderr":
+        sys.stderr.write("DevTools listening on ws://127.0.0.1:%d/devtools/browser/abc\\n" % port)
+        sys.stderr.flush()
+    else:
+        tmp = os.path.join(profile, "DevToolsActivePort.tmp")
+        with open(tmp, "w") as f:
+            f.write("%d\\n/devtools/browser/abc" % port)
+        os.rename(tmp, os.path.join(profile, "DevToolsActivePort"))
+    time.sleep(5)
+''')
+
+class TestChromeLauncher(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.executable = self.root / "fake-chrome"
+        self.executable.write_text(FAKE_CHROME.format(python=sys.executable))
+        self.executable.chmod(self.executable.stat().st_mode | stat.S_IEXEC)
+        self.launcher = None
+
+    def tearDown(self):
+        if self.launcher and self.launcher.process:
+            self.launcher.process.kill()
+            self.launcher.process.wait()
+        os.environ.pop("FAKE_CHROME_MODE", None)
+        self.tmp.cleanup()
+
+    def test_ephemeral_port_from_active_port_file(self):
+        # Test readiness via DevToolsActivePort with port 0.
+        profile = self.root / "profile"
+        profile.mkdir()
+        (profile / DEVTOOLS_ACTIVE_PORT).write_text("9999\n/stale")  # left over from a crash
+        self.launcher = ChromeLauncher(profile, port=0, executable=str(self.executable))
+
+        endpoint = self.launcher.launch(timeout=5)
+
+        self.assertIsNotNone(endpoint)
+        self.assertEqual(endpoint.port, 40123)
+        self.assertEqual(endpoint.ws_path, "/devtools/browser/abc")
+        self.assertLess(endpoint.time_to_ready, 1.0)
+        self.assertEqual(read_active_port(profile), (40123, "/devtools/browser/abc"))
+
+    def test_ready_from_stderr(self):
+        # Test readiness via the "DevTools listening on" stderr line.
+        os.environ["FAKE_CHROME_MODE"] = "stderr"
+        self.launcher = ChromeLauncher(self.root / "profile", port=9333, executable=str(self.executable))
+
+        endpoint = self.launcher.launch(timeout=5)
+
+        self.assertIsNotNone(endpoint)
+        self.assertEqual(endpoint.port, 9333)
+        self.assertEqual(endpoint.source, "stderr")
+
+    def test_timeout_stops_chrome(self):
+        # Test that a launch that times out does not leave the browser process running.
+        os.environ["FAKE_CHROME_MODE"] = "silent"
+        self.executable.write_text(FAKE_CHROME.format(python=sys.executable).replace("time.sleep(0.2)", "time.sleep(30)"))
+        self.launcher = ChromeLauncher(self.root / "profile", port=9333, executable=str(self.executable))
+
+        self.assertIsNone(self.launcher.launch(timeout=0.3))
+        self.assertIsNotNone(self.launcher.process.poll())
+
+if __name__ == "__main__":
+    unittest.main()
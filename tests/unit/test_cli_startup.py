@@ -0,0 +1,58 @@
+import os
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Modules the status commands must not import: they only stat files
+HEAVY_MODULES = ('cryptography', 'sqlite3', 'credentials.crypto', 'credentials.credentials')
+
+def import_times(code):
+    # Runs `code` under -X importtime; returns {module: cumulative microseconds}
+    env = dict(os.environ, PYTHONPATH=str(ROOT), PYTHONDONTWRITEBYTECODE='1')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+def best_import_time(module, runs=3):
+    return min(import_times(f'import {module}')[module] for _ in range(runs))
+
+class TestCliStartup(unittest.TestCase):
+
+    def assertLight(self, module):
+        loaded = import_times(f'import {module}')
+        heavy = sorted(name for name in loaded if name.startswith(HEAVY_MODULES))
+        self.assertEqual(heavy, [], f'{module} imports {heavy}')
+
+    def test_status_commands_do_not_import_crypto(self):
+        # Test that the check commands and the cred multiplexer stay off the crypto/sqlite import path.
+        for module in ('credentials.commands.cred', 'credentials.commands.check_cred',
+                       'credentials.commands.check_cred_json', 'credentials.commands.check_cred_bin'):
+            with self.subTest(module=module):
+                self.assertLight(module)
+
+    def test_package_exports_are_lazy(self):
+        # Test that importing the package is light and a public name still resolves on access.
+        self.assertLight('credentials')
+        # import_module() imports are not reported by -X importtime, their children are
+        loaded = import_times('from credentials import Credentials')
+        self.assertIn('cryptography.fernet', loaded)
+
+    def test_check_starts_faster_than_the_facade(self):
+        # Benchmark: the status path must import in well under the time of the full Credentials facade.
+        check = best_import_time('credentials.commands.check_cred')
+        facade = best_import_time('credentials.credentials')
+        self.assertLess(check, facade, f'check_cred {check} us, credentials.credentials {facade} us')
+
+if __name__ == '__main__':
+    unittest.main()
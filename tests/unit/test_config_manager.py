@@ -0,0 +1,134 @@
+import json
+import multiprocessing
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from credentials.config import config_manager
+from credentials.config.config_manager import ConfigManager
+from credentials.message.msg_code import MsgCode
+
+def _register_many(registry_dir, prefix, count):
+    manager = ConfigManager(registry_base_dir=Path(registry_dir))
+    for i in range(count):
+        manager.register_config(f'{prefix}-{i}', base_directory=Path(registry_dir))
+
+class TestConfigManager(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+        self.manager = ConfigManager(registry_base_dir=self.base / 'registry')
+        self.manager.register_config('pdv', base_directory=self.base)
+        self.registry = self.base / 'registry' / config_manager.CONFIGS_REGISTRY_FILE
+
+    def tearDown(self):
+        self.manager.flush()
+        self.tmp.cleanup()
+
+    def test_lookups_do_not_write_until_flush(self):
+        # Test that get_config is read-only on disk and flush persists last_used.
+        with patch.object(self.manager, '_save_configs', wraps=self.manager._save_configs) as save:
+            for _ in range(10):
+                status, config = self.manager.get_config('pdv')
+                self.assertEqual(status, MsgCode.SUCCESS)
+            self.assertEqual(save.call_count, 0)
+            self.assertIsNone(json.loads(self.registry.read_text())['pdv']['last_used'])
+
+            self.assertEqual(self.manager.flush(), MsgCode.SUCCESS)
+            self.assertEqual(save.call_count, 1)
+
+        stored = json.loads(self.registry.read_text())['pdv']['last_used']
+        self.assertEqual(stored, self.manager.list_configs()[0].last_used)
+
+    def test_flush_after_batch_keeps_other_process_entries(self):
+        # Test the count-based flush and that a concurrent registration is not lost.
+        other = ConfigManager(registry_base_dir=self.base / 'registry')
+        other.register_config('outro', base_directory=self.base)
+
+        with patch.object(config_manager, 'LAST_USED_FLUSH_COUNT', 3):
+            for _ in range(3):
+                self.manager.get_config('pdv')
+
+        data = json.loads(self.registry.read_text())
+        self.assertIsNotNone(data['pdv']['last_used'])
+        self.assertIn('outro', data)
+
+    def test_concurrent_processes_do_not_lose_writes(self):
+        # Test that locked read-modify-write keeps every registration from parallel processes.
+        registry_dir = str(self.base / 'registry')
+        workers = [
+            multiprocessing.Process(target=_register_many, args=(registry_dir, f'p{n}', 15))
+            for n in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join(30)
+
+        data = json.loads(self.registry.read_text())
+        self.assertEqual(len(data), 1 + 4 * 15)
+        self.assertFalse(list((self.base / 'registry').glob('*.tmp')))
+
+        # The long-lived instance picks up the other processes' entries by mtime
+        self.assertEqual(self.manager.get_config('p3-14')[0], MsgCode.SUCCESS)
+
+    def test_pending_last_used_survives_reload_by_another_writer(self):
+        # Test that a full write after another process changed the registry keeps buffered last_used values.
+        other = ConfigManager(registry_base_dir=self.base / 'registry')
+        self.assertEqual(self.manager.get_config('pdv')[0], MsgCode.SUCCESS)
+        other.register_config('two', base_directory=self.base)
+        self.manager.register_config('three', base_directory=self.base)
+        self.assertEqual(self.manager.flush(), MsgCode.SUCCESS)
+
+        data = json.loads(self.registry.read_text())
+        self.assertEqual(sorted(data), ['pdv', 'three', 'two'])
+        self.assertIsNotNone(data['pdv']['last_used'])
+        self.assertEqual(self.manager._pending_last_used, {})
+
+    def test_pending_last_used_kept_when_write_fails(self):
+        # Test that buffered values are only dropped once the registry file was replaced.
+        self.manager.get_config('pdv')
+        with patch.object(config_manager.os, 'replace', side_effect=OSError):
+            self.assertNotEqual(self.manager.flush(), MsgCode.SUCCESS)
+        self.assertIn('pdv', self.manager._pending_last_used)
+        self.assertEqual(self.manager.flush(), MsgCode.SUCCESS)
+        self.assertIsNotNone(json.loads(self.registry.read_text())['pdv']['last_used'])
+
+    def test_sqlite_backend_migrates_json_and_queries(self):
+        # Test the JSON -> SQLite migration and the indexed queries behind the same API.
+        self.manager.register_config('loja-1', base_directory=self.base / 'lojas')
+        db_manager = ConfigManager(registry_base_dir=self.base / 'registry', backend='sqlite')
+        self.assertEqual(db_manager.backend, 'sqlite')
+        self.assertEqual(sorted(c.name for c in db_manager.list_configs()), ['loja-1', 'pdv'])
+
+        self.assertEqual(db_manager.register_config('pdv')[0], MsgCode.CONFIG_ALREADY_EXISTS)
+        self.assertEqual(db_manager.get_config('loja-1')[0], MsgCode.SUCCESS)
+        self.assertEqual(db_manager.update_config_description('loja-1', 'Centro'), MsgCode.SUCCESS)
+
+        by_dir = db_manager.find_configs(base_directory=str(self.base / 'lojas'))
+        self.assertEqual([(c.name, c.description) for c in by_dir], [('loja-1', 'Centro')])
+        self.assertEqual([c.name for c in db_manager.find_configs(used_since='2000-01-01')], ['loja-1'])
+        self.assertEqual([c.name for c in db_manager.find_configs(unused_since='2000-01-01')], ['pdv'])
+
+        self.assertEqual(db_manager.remove_config('pdv'), MsgCode.SUCCESS)
+        self.assertEqual(db_manager.remove_config('pdv'), MsgCode.CONFIG_NOT_FOUND)
+
+        # Once the database exists it is picked by default
+        self.assertEqual(ConfigManager(registry_base_dir=self.base / 'registry').backend, 'sqlite')
+        db_manager.flush()
+
+    def test_sqlite_migrates_json_only_once(self):
+        # Test that removing the last config does not bring the stale JSON registry back.
+        db_manager = ConfigManager(registry_base_dir=self.base / 'registry', backend='sqlite')
+        self.assertEqual([c.name for c in db_manager.list_configs()], ['pdv'])
+        self.assertEqual(db_manager.remove_config('pdv'), MsgCode.SUCCESS)
+        db_manager.flush()
+
+        reopened = ConfigManager(registry_base_dir=self.base / 'registry', backend='sqlite')
+        self.assertEqual(reopened.list_configs(), [])
+        self.assertTrue(self.registry.exists())   # the JSON file itself is left untouched
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+from credentials.config.config import CredentialsConfig
+from credentials.core.credentials_cache import CredentialsCache
+from credentials.core.credentials_reader import CredentialsReader
+from credentials.crypto.crypto_manager import CryptoManager
+from credentials.message.msg_code import MsgCode
+
+class TestCredentialsCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = CredentialsConfig(base_directory=Path(self.tmp.name))
+        self.config.ensure_secure_directory()
+        self.crypto = CryptoManager(self.config)
+        _, key = self.crypto.create_key()
+        self.crypto.save_key(key)
+        self._write({'email': 'a@b.c', 'password': 'x'})
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, data):
+        _, encrypted = self.crypto.encrypt_data(data)
+        self.crypto.save_encrypted_data(encrypted)
+
+    def test_hits_until_file_changes_or_ttl(self):
+        # Test that the loader runs once per file version and once per TTL window.
+        cache = CredentialsCache(ttl=None)
+        calls = []
+        loader = lambda: calls.append(1) or (MsgCode.SUCCESS, {'email': 'a@b.c'})
+
+        for _ in range(5):
+            status, data = cache.get(self.config, loader)
+        self.assertEqual((status, data), (MsgCode.SUCCESS, {'email': 'a@b.c'}))
+        self.assertEqual(len(calls), 1)
+
+        data['email'] = 'mutated'
+        self.assertEqual(cache.get(self.config, loader)[1]['email'], 'a@b.c')
+
+        st = os.stat(self.config.credentials_file)
+        os.utime(self.config.credentials_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1000))
+        cache.get(self.config, loader)
+        self.assertEqual(len(calls), 2)
+
+        cache.ttl = 0
+        cache.get(self.config, loader)
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(cache.stats()['hits'], 5)
+
+    def test_failures_are_not_cached_and_threads_share_one_decrypt(self):
+        # Test that errors always retry and concurrent misses decrypt only once.
+        cache = CredentialsCache()
+        self.assertEqual(cache.get(self.config, lambda: (MsgCode.DECRYPTION_ERROR, None)), (MsgCode.DECRYPTION_ERROR, None))
+
+        calls = []
+        def slow_loader():
+            calls.append(1)
+            threading.Event().wait(0.05)
+            return MsgCode.SUCCESS, {'ok': True}
+
+        threads = [threading.Thread(target=cache.get, args=(self.config, slow_loader)) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(cache.stats()['misses'], 2)
+
+    def test_reader_sees_rewritten_credentials(self):
+        # Test the integration through CredentialsReader with the process-wide cache.
+        reader = CredentialsReader(self.config, freshness=0)
+        self.assertEqual(reader.get_email(), (MsgCode.SUCCESS, 'a@b.c'))
+        self._write({'email': 'new@b.c', 'password': 'y', 'pad': 'changes the size'})
+        self.assertEqual(reader.get_email(), (MsgCode.SUCCESS, 'new@b.c'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from credentials.config.config import CredentialsConfig
+from credentials.core.credentials_reader import CredentialsReader
+from credentials.crypto.crypto_manager import CryptoManager
+from credentials.message.msg_code import MsgCode
+
+class TestCredentialsReader(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = CredentialsConfig(base_directory=Path(self.tmp.name))
+        self.config.ensure_secure_directory()
+        crypto = CryptoManager(self.config)
+        _, key = crypto.create_key()
+        crypto.save_key(key)
+        _, encrypted = crypto.encrypt_data({
+            'username': 'op', 'email': 'a@b.c', 'password': 'x', 'additional_data': {'loja': [1, 2]}
+        })
+        crypto.save_encrypted_data(encrypted)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_fields_decrypts_once_and_is_read_only(self):
+        # Test that email + password + getters within the window cost a single read.
+        reader = CredentialsReader(self.config, freshness=60)
+        with patch.object(reader, '_read_credentials', wraps=reader._read_credentials) as read:
+            status, fields = reader.get_fields(['email', 'password'])
+            self.assertEqual(status, MsgCode.SUCCESS)
+            self.assertEqual(dict(fields), {'email': 'a@b.c', 'password': 'x'})
+            self.assertEqual(reader.get_username(), (MsgCode.SUCCESS, 'op'))
+            self.assertEqual(reader.get_additional_data(), (MsgCode.SUCCESS, {'loja': [1, 2]}))
+            self.assertEqual(read.call_count, 1)
+
+        with self.assertRaises(TypeError):
+            fields['email'] = 'other'
+        _, snapshot = reader.snapshot()
+        self.assertNotIn('a@b.c', repr(snapshot))
+        self.assertEqual(reader.get_fields(['email', 'pin'])[0], MsgCode.FIELD_NOT_FOUND)
+
+    def test_zero_freshness_reads_every_time(self):
+        # Test that freshness=0 keeps the original read-per-call behavior.
+        reader = CredentialsReader(self.config, freshness=0)
+        with patch.object(reader, '_read_credentials', wraps=reader._read_credentials) as read:
+            reader.get_email()
+            reader.get_password()
+            self.assertEqual(read.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
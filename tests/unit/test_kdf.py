@@ -0,0 +1,84 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from credentials.config.config import CredentialsConfig
+from credentials.crypto import kdf
+from credentials.crypto.crypto_manager import CryptoManager
+from credentials.message.msg_code import MsgCode
+
+# Cheap costs so the tests stay fast
+FAST = {
+    kdf.KDF_PBKDF2: {'iterations': 1000},
+    kdf.KDF_SCRYPT: {'n': 2 ** 10, 'r': 8, 'p': 1},
+    kdf.KDF_ARGON2: {'iterations': 1, 'memory_cost': 8 * 1024, 'lanes': 1},
+}
+
+class TestKdf(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = CredentialsConfig(base_directory=Path(self.tmp.name))
+        self.config.ensure_secure_directory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_header_round_trip_and_verify(self):
+        # Test that each KDF key is stored with its header and re-derives from the password.
+        for algorithm in kdf.available_kdfs():
+            with self.subTest(kdf=algorithm):
+                params = kdf.new_kdf_params(algorithm, profile={'kdf': algorithm, **FAST[algorithm]})
+                crypto = CryptoManager(self.config)
+                status, key = crypto.create_key('segredo', kdf_params=params)
+                self.assertEqual(status, MsgCode.SUCCESS)
+                self.assertEqual(crypto.save_key(key), MsgCode.SUCCESS)
+
+                loader = CryptoManager(self.config)
+                self.assertEqual(loader.load_key(), (MsgCode.SUCCESS, key))
+                self.assertEqual(loader.load_kdf_params()[1], params)
+                self.assertEqual(loader.verify_key_password('segredo'), MsgCode.SUCCESS)
+                self.assertEqual(loader.verify_key_password('outra'), MsgCode.KEY_PASSWORD_MISMATCH)
+                self.assertEqual(loader.encrypt_data({'a': 1})[0], MsgCode.SUCCESS)
+
+    def test_random_salt_and_legacy_keys(self):
+        # Test that salts differ per key and header-less keys still load and verify.
+        first = kdf.new_kdf_params(kdf.KDF_PBKDF2, profile={'kdf': kdf.KDF_PBKDF2, 'iterations': 1000})
+        second = kdf.new_kdf_params(kdf.KDF_PBKDF2, profile={'kdf': kdf.KDF_PBKDF2, 'iterations': 1000})
+        self.assertNotEqual(first['salt'], second['salt'])
+        self.assertNotEqual(kdf.derive_key('x', first)[1], kdf.derive_key('x', second)[1])
+
+        _, legacy_key = kdf.derive_key('segredo', kdf.LEGACY_KDF_PARAMS)
+        self.config.key_file.write_bytes(legacy_key)
+        crypto = CryptoManager(self.config)
+        self.assertEqual(crypto.load_key(), (MsgCode.SUCCESS, legacy_key))
+        self.assertEqual(crypto.verify_key_password('segredo'), MsgCode.SUCCESS)
+
+    def test_tampered_header_is_rejected(self):
+        # Test that out-of-range costs in a header are refused before deriving.
+        params = kdf.new_kdf_params(kdf.KDF_SCRYPT)
+        params['n'] = 2 ** 30
+        self.config.key_file.write_bytes(kdf.encode_key_file(b'k' * 44, params))
+        crypto = CryptoManager(self.config)
+        self.assertEqual(crypto.verify_key_password('x'), MsgCode.KDF_HEADER_INVALID)
+        self.config.key_file.write_bytes(kdf.KEY_HEADER_PREFIX + b'{not json\nkey')
+        self.assertEqual(crypto.load_key()[0], MsgCode.KDF_HEADER_INVALID)
+
+    def test_calibrate_profile_is_used_for_new_keys(self):
+        # Test calibration against a synthetic timer and that create_key picks up the saved profile.
+        def timer(params):
+            return params['n'] / 2 ** 12 * 10.0   # 10 ms at n=4096, linear in n
+
+        profile = kdf.calibrate(150, kdf.KDF_SCRYPT, max_memory_mib=64, timer=timer)
+        self.assertEqual(profile['n'], 2 ** 15)
+        self.assertLessEqual(profile['measured_ms'], 150)
+
+        profile['n'] = 2 ** 10
+        self.assertEqual(kdf.save_profile(self.config.kdf_profile_file, profile), MsgCode.SUCCESS)
+        crypto = CryptoManager(self.config)
+        crypto.create_key('segredo')
+        self.assertEqual(crypto._kdf_params['kdf'], kdf.KDF_SCRYPT)
+        self.assertEqual(crypto._kdf_params['n'], 2 ** 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from cryptography.fernet import Fernet
+
+from credentials.config.config import CredentialsConfig
+from credentials.crypto.crypto_manager import CryptoManager
+from credentials.crypto.decrypto_manager import DecryptoManager
+from credentials.crypto.key_cache import key_cache
+from credentials.message.msg_code import MsgCode
+
+class TestKeyCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = CredentialsConfig(base_directory=Path(self.tmp.name))
+        self.config.ensure_secure_directory()
+        crypto = CryptoManager(self.config)
+        _, self.key = crypto.create_key()
+        crypto.save_key(self.key)
+
+    def tearDown(self):
+        key_cache.invalidate(self.config.key_file)
+        self.tmp.cleanup()
+
+    def test_managers_share_one_read_and_fernet(self):
+        # Test that several managers read the key file once and share the Fernet.
+        with patch.object(CryptoManager, '_read_key_file', autospec=True,
+                          side_effect=CryptoManager._read_key_file) as read:
+            crypto = CryptoManager(self.config)
+            status, encrypted = crypto.encrypt_data({'email': 'a@b.c'})
+            self.assertEqual(status, MsgCode.SUCCESS)
+            for _ in range(3):
+                self.assertEqual(DecryptoManager(self.config).decrypt_data(encrypted), (MsgCode.SUCCESS, {'email': 'a@b.c'}))
+            self.assertEqual(CryptoManager(self.config).load_key(), (MsgCode.SUCCESS, self.key))
+            self.assertEqual(read.call_count, 1)
+
+        self.assertIs(CryptoManager(self.config)._get_fernet()[1], DecryptoManager(self.config)._crypto_manager._get_fernet()[1])
+
+    def test_new_key_invalidates(self):
+        # Test that save_key and an external replace (new inode) both switch managers to the new key.
+        reader = CryptoManager(self.config)
+        self.assertEqual(reader.load_key()[1], self.key)
+
+        writer = CryptoManager(self.config)
+        _, second = writer.create_key()
+        writer.save_key(second)
+        self.assertEqual(reader.load_key()[1], second)
+
+        third = Fernet.generate_key()
+        tmp_file = self.config.key_file.with_name('key.tmp')
+        tmp_file.write_bytes(third)
+        os.replace(tmp_file, self.config.key_file)
+        self.assertEqual(reader.load_key()[1], third)
+        self.assertEqual(reader._get_fernet()[1].decrypt(Fernet(third).encrypt(b'x')), b'x')
+
+        os.remove(self.config.key_file)
+        self.assertEqual(reader.load_key(), (MsgCode.MISSING_KEY_FILE, None))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import builtins
+import os
+import tempfile
+import unittest
+from contextlib import ExitStack
+from pathlib import Path
+from unittest.mock import patch
+
+from credentials.config.config import CredentialsConfig
+from credentials.core.credentials_checker import CredentialsChecker
+from credentials.core.credentials_reader import CredentialsReader
+from credentials.credentials import Credentials
+from credentials.crypto.crypto_manager import CryptoManager
+from credentials.message.msg_code import MsgCode
+
+def no_filesystem():
+    # Any stat/open/mkdir/listing during the block fails the test
+    stack = ExitStack()
+    for target in (os, builtins):
+        for name in ('stat', 'lstat', 'open', 'mkdir', 'makedirs', 'listdir', 'scandir'):
+            if hasattr(target, name):
+                stack.enter_context(patch.object(target, name, side_effect=AssertionError(f'{name} called')))
+    return stack
+
+class TestLazyRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.home = Path(self.tmp.name) / 'home'
+        self.home.mkdir()
+        self.env = patch.dict(os.environ, {'HOME': str(self.home), 'CREDENTIALS_AGENT': '0'})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        self.tmp.cleanup()
+
+    def test_construction_does_no_io(self):
+        # Test that the facade and its components are built without touching the filesystem.
+        with no_filesystem():
+            creds = Credentials(base_directory=Path(self.tmp.name))
+            config = CredentialsConfig(base_directory=Path(self.tmp.name))
+            CredentialsChecker(config)
+            CryptoManager(config)
+            CredentialsReader(config)
+        self.assertFalse((self.home / '.credentials_manager').exists())
+
+        self.assertEqual(creds.create_credentials(email='op@loja.com', password='segredo'), MsgCode.SUCCESS)
+        self.assertEqual(creds.verify_credentials('op@loja.com', 'segredo'), MsgCode.SUCCESS)
+        self.assertFalse((self.home / '.credentials_manager').exists())
+
+    def test_registry_opened_on_first_registry_operation(self):
+        # Test that registry operations still work and share one ConfigManager.
+        creds = Credentials(base_directory=Path(self.tmp.name))
+        self.assertEqual(creds.list_saved_configs(), [])
+        self.assertTrue((self.home / '.credentials_manager').is_dir())
+        self.assertIs(creds.config_manager, creds.config_manager)
+
+        self.assertEqual(creds.save_current_config('loja1'), MsgCode.SUCCESS)
+        loaded = Credentials('loja1')
+        self.assertEqual(loaded.credentials_directory, creds.credentials_directory)
+        loaded.config_manager.flush()   # pending last_used write-behind, before the tmp dir goes
+
+if __name__ == '__main__':
+    unittest.main()
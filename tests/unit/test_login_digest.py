@@ -0,0 +1,93 @@
+import os
+import stat
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from credentials.config.config import CredentialsConfig
+from credentials.core.credentials_cache import credentials_cache
+from credentials.core.credentials_checker import CredentialsChecker
+from credentials.core.credentials_reader import CredentialsReader
+from credentials.crypto.crypto_manager import CryptoManager
+from credentials.crypto.decrypto_manager import DecryptoManager
+from credentials.crypto.key_cache import key_cache
+from credentials.credentials import Credentials
+from credentials.message.msg_code import MsgCode
+
+NO_DECRYPT = patch.object(DecryptoManager, 'load_and_decrypt_credentials', side_effect=AssertionError('decrypted'))
+
+class TestLoginDigest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.env = patch.dict(os.environ, {'CREDENTIALS_AGENT': '0'})
+        self.env.start()
+        self.creds = Credentials(base_directory=Path(self.tmp.name))
+        self.config = CredentialsConfig(base_directory=Path(self.tmp.name))
+
+    def tearDown(self):
+        self.env.stop()
+        credentials_cache.invalidate()
+        key_cache.invalidate()
+        self.tmp.cleanup()
+
+    def _rewrite_without_digest(self, data):
+        # Another writer (older version): new credentials file, digest left behind
+        crypto = CryptoManager(self.config)
+        _, encrypted = crypto.encrypt_data(data)
+        crypto.save_encrypted_data(encrypted)
+        credentials_cache.invalidate()
+
+    def test_verify_uses_digest_without_key_or_decryption(self):
+        # Test that create writes an owner-only digest with no plaintext and verify never decrypts.
+        self.assertEqual(self.creds.create_credentials(email='op@loja.com', password='segredo'), MsgCode.SUCCESS)
+        digest_file = self.config.login_digest_file
+        self.assertEqual(stat.S_IMODE(digest_file.stat().st_mode), 0o600)
+        self.assertNotIn('segredo', digest_file.read_text())
+        self.assertNotIn('op@loja.com', digest_file.read_text())
+
+        credentials_cache.invalidate()
+        key_cache.invalidate()
+        with NO_DECRYPT, patch.object(CryptoManager, '_read_key_file', side_effect=AssertionError('key read')):
+            self.assertEqual(self.creds.verify_credentials('op@loja.com', 'segredo'), MsgCode.SUCCESS)
+            self.assertEqual(self.creds.verify_credentials('op@loja.com', 'errada'), MsgCode.CREDENTIALS_INVALID)
+            self.assertEqual(self.creds.verify_credentials('op@loja.co', 'msegredo'), MsgCode.CREDENTIALS_INVALID)
+
+    def test_stale_digest_falls_back_and_is_rebuilt(self):
+        # Test that a credentials file replaced behind the digest is verified by decrypting, then re-digested.
+        self.creds.create_credentials(email='op@loja.com', password='antiga')
+        self._rewrite_without_digest({'email': 'op@loja.com', 'password': 'nova'})
+
+        reader = CredentialsReader(self.config, freshness=0)
+        self.assertEqual(reader.verify_login('op@loja.com', 'antiga'), MsgCode.CREDENTIALS_INVALID)
+        self.assertEqual(reader.verify_login('op@loja.com', 'nova'), MsgCode.SUCCESS)
+        with NO_DECRYPT:
+            self.assertEqual(reader.verify_login('op@loja.com', 'nova'), MsgCode.SUCCESS)
+
+    def test_failed_login_does_not_write_digest(self):
+        # Test that only a successful decrypting check backfills a missing digest.
+        self.config.ensure_secure_directory()
+        crypto = CryptoManager(self.config)
+        _, key = crypto.create_key()
+        crypto.save_key(key)
+        self._rewrite_without_digest({'email': 'op@loja.com', 'password': 'segredo'})
+
+        reader = CredentialsReader(self.config, freshness=0)
+        self.assertEqual(reader.verify_login('op@loja.com', 'errada'), MsgCode.CREDENTIALS_INVALID)
+        self.assertFalse(self.config.login_digest_file.exists())
+        self.assertEqual(reader.verify_login('op@loja.com', 'segredo'), MsgCode.SUCCESS)
+        self.assertTrue(self.config.login_digest_file.exists())
+
+    def test_checker_codes(self):
+        # Test the plaintext comparison and the missing-directory code.
+        checker = CredentialsChecker(self.config)
+        self.assertEqual(checker.check_directory(), MsgCode.MISSING_DIR)
+        self.assertIsNone(checker.verify_digest('op@loja.com', 'segredo'))
+        stored = {'email': 'op@loja.com', 'password': 'segredo'}
+        self.assertEqual(checker.verify_credentials(stored, 'op@loja.com', 'segredo'), MsgCode.SUCCESS)
+        self.assertEqual(checker.verify_credentials(stored, 'op@loja.com', 'x'), MsgCode.CREDENTIALS_INVALID)
+        self.assertEqual(checker.verify_credentials(None, 'op@loja.com', 'segredo'), MsgCode.CREDENTIALS_NULL)
+
+if __name__ == '__main__':
+    unittest.main()
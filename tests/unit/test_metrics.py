@@ -0,0 +1,61 @@
+import json
+import unittest
+import urllib.request
+from urllib.error import HTTPError
+
+from runtime.metrics import MetricsRegistry, MetricsServer
+
+class TestMetrics(unittest.TestCase):
+
+    def test_render_counter_gauge_histogram(self):
+        # Test Prometheus text exposition for each metric kind.
+        registry = MetricsRegistry()
+        registry.describe('pdv_command_latency_seconds', 'histogram', 'latency', buckets=(0.1, 1.0))
+        registry.inc('pdv_reconnects_total', labels={'reason': 'error'})
+        registry.inc('pdv_reconnects_total', labels={'reason': 'error'})
+        registry.set_gauge('pdv_ready', 1)
+        registry.observe('pdv_command_latency_seconds', 0.05, labels={'command': 'login'})
+        registry.observe('pdv_command_latency_seconds', 0.5, labels={'command': 'login'})
+
+        output = registry.render()
+        self.assertIn('pdv_reconnects_total{reason="error"} 2', output)
+        self.assertIn('pdv_ready 1', output)
+        self.assertIn('pdv_command_latency_seconds_bucket{command="login",le="0.1"} 1', output)
+        self.assertIn('pdv_command_latency_seconds_bucket{command="login",le="1"} 2', output)
+        self.assertIn('pdv_command_latency_seconds_bucket{command="login",le="+Inf"} 2', output)
+        self.assertIn('pdv_command_latency_seconds_count{command="login"} 2', output)
+
+    def test_collector_runs_on_render(self):
+        # Test that collectors refresh gauges at scrape time.
+        registry = MetricsRegistry()
+        registry.add_collector(lambda r: r.set_gauge('pdv_command_queue_depth', 3))
+        self.assertIn('pdv_command_queue_depth 3', registry.render())
+
+    def test_set_counter_is_typed_as_counter(self):
+        # Test that totals copied from elsewhere are exposed as counters, not gauges.
+        registry = MetricsRegistry()
+        registry.add_collector(lambda r: r.set_counter('credentials_cache_hits_total', 7))
+        output = registry.render()
+        self.assertIn('# TYPE credentials_cache_hits_total counter', output)
+        self.assertIn('credentials_cache_hits_total 7', output)
+
+    def test_http_endpoint(self):
+        # Test /metrics and /health over a real localhost socket.
+        registry = MetricsRegistry()
+        registry.set_gauge('pdv_ready', 0)
+        server = MetricsServer(registry, port=0, health_check=lambda: False)
+        self.assertTrue(server.start())
+        try:
+            base = f"http://127.0.0.1:{server.port}"
+            with urllib.request.urlopen(base + "/metrics", timeout=5) as response:
+                self.assertIn(b'pdv_ready 0', response.read())
+
+            with self.assertRaises(HTTPError) as ctx:
+                urllib.request.urlopen(base + "/health", timeout=5)
+            self.assertEqual(ctx.exception.code, 503)
+            self.assertEqual(json.loads(ctx.exception.read()), {"ready": False})
+        finally:
+            server.stop()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+import io
+import json
+import threading
+import time
+import unittest
+
+from credentials.commands.ndjson_batch import run_batch
+
+def handler(request):
+    time.sleep(request.get('delay', 0))
+    if request.get('boom'):
+        raise RuntimeError('boom')
+    return {'success': request.get('ok', True), 'thread': threading.current_thread().name}
+
+class TestNdjsonBatch(unittest.TestCase):
+
+    def _run(self, lines, workers=1):
+        sink = io.StringIO()
+        code = run_batch(handler, workers, io.StringIO(''.join(lines)), sink)
+        return code, [json.loads(line) for line in sink.getvalue().splitlines()]
+
+    def test_sequential_compact_records(self):
+        # Test one compact record per request, ids/line numbers and error records.
+        code, records = self._run(['{"id": "a"}\n', '\n', 'nope\n', '{"boom": true}\n', '[1]\n'])
+        self.assertEqual(code, 1)
+        self.assertEqual([r['line'] for r in records], [1, 3, 4, 5])
+        self.assertEqual(records[0]['id'], 'a')
+        self.assertTrue(records[0]['success'])
+        self.assertFalse(any(r['success'] for r in records[1:]))
+        self.assertEqual(self._run(['{}\n', '{}\n'])[0], 0)
+
+    def test_workers_stream_in_completion_order(self):
+        # Test that a fast request is written before a slow one submitted earlier.
+        code, records = self._run(['{"id": "slow", "delay": 0.3}\n', '{"id": "fast"}\n'], workers=2)
+        self.assertEqual(code, 0)
+        self.assertEqual([r['id'] for r in records], ['fast', 'slow'])
+        self.assertTrue(all(r['thread'].startswith('ndjson') for r in records))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from browser.profile_snapshot import snapshot_profile, MANIFEST_NAME
+
+class TestProfileSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.source = root / "google-chrome"
+        self.dest = root / "google-chrome-debug"
+
+        default = self.source / "Default"
+        (default / "Local Storage" / "leveldb").mkdir(parents=True)
+        (default / "Cache" / "Cache_Data").mkdir(parents=True)
+        (self.source / "Local State").write_text("{}")
+        (self.source / "SingletonLock").write_text("")
+        (default / "Preferences").write_text("{}")
+        (default / "Cookies").write_bytes(b"sqlite")
+        (default / "Login Data").write_bytes(b"sqlite")
+        (default / "Local Storage" / "leveldb" / "000003.ldb").write_bytes(b"table")
+        (default / "Local Storage" / "leveldb" / "LOCK").write_text("")
+        (default / "Cache" / "Cache_Data" / "data_0").write_bytes(b"x" * 4096)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_copies_only_automation_files(self):
+        # Test whitelist, cache/lock exclusion and link strategy.
+        report = snapshot_profile(self.source, self.dest)
+
+        self.assertIsNone(report.skipped_reason)
+        self.assertTrue((self.dest / "Local State").exists())
+        self.assertTrue((self.dest / "Default" / "Cookies").exists())
+        self.assertTrue((self.dest / "Default" / "Local Storage" / "leveldb" / "000003.ldb").exists())
+        self.assertFalse((self.dest / "Default" / "Cache").exists())
+        self.assertFalse((self.dest / "SingletonLock").exists())
+        self.assertFalse((self.dest / "Default" / "Local Storage" / "leveldb" / "LOCK").exists())
+
+        # Atomically-replaced files are hard links; SQLite files never share an inode
+        self.assertEqual(os.stat(self.dest / "Default" / "Preferences").st_ino,
+                         os.stat(self.source / "Default" / "Preferences").st_ino)
+        self.assertNotEqual(os.stat(self.dest / "Default" / "Cookies").st_ino,
+                            os.stat(self.source / "Default" / "Cookies").st_ino)
+        self.assertTrue((self.dest / MANIFEST_NAME).exists())
+
+    def test_incremental_resync(self):
+        # Test that a second run only touches changed or removed files.
+        snapshot_profile(self.source, self.dest)
+        (self.source / "Default" / "Cookies").write_bytes(b"sqlite-updated")
+        (self.source / "Default" / "Login Data").unlink()
+
+        report = snapshot_profile(self.source, self.dest)
+
+        self.assertEqual(report.removed, 1)
+        self.assertEqual(report.linked + report.reflinked + report.copied, 1)
+        self.assertGreater(report.unchanged, 0)
+        self.assertEqual((self.dest / "Default" / "Cookies").read_bytes(), b"sqlite-updated")
+        self.assertFalse((self.dest / "Default" / "Login Data").exists())
+
+    def test_skips_profile_in_use(self):
+        # Test that a live debug Chrome profile is left untouched.
+        self.dest.mkdir()
+        os.symlink(f"host-{os.getpid()}", self.dest / "SingletonLock")
+
+        report = snapshot_profile(self.source, self.dest)
+
+        self.assertIsNotNone(report.skipped_reason)
+        self.assertFalse((self.dest / "Local State").exists())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from runtime.session import SessionRecorder, load_session
+from runtime.replay import replay_session
+
+def make_runtime():
+    # Minimal stand-in for main.py: 'N unidades' -> set_units, anything else unrecognized.
+    runtime = SimpleNamespace(pdv_ready=False, running=True, pdv_browser=None, session_recorder=None, queue=[])
+
+    def process_voice_command(text):
+        words = text.split()
+        if len(words) == 2 and words[1] == "unidades":
+            runtime.session_recorder.intent("set_units", int(words[0]))
+            runtime.queue.append(("set_units", runtime.session_recorder.current_utterance))
+            return True
+        return False
+
+    def process_pdv_commands():
+        while runtime.queue:
+            command, utterance = runtime.queue.pop(0)
+            runtime.pdv_browser.unit_pdv(3, "pdv")
+            runtime.session_recorder.dispatch(command, 0.001, True, utterance)
+
+    runtime.process_voice_command = process_voice_command
+    runtime.process_pdv_commands = process_pdv_commands
+    return runtime
+
+class TestSessionReplay(unittest.TestCase):
+
+    def test_record_and_load_roundtrip(self):
+        # Test that recorded events are persisted as NDJSON.
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "session.ndjson"
+            recorder = SessionRecorder(path)
+            utterance = recorder.transcript("3 unidades", 1.5)
+            recorder.intent("set_units", 3)
+            recorder.dispatch("set_units", 0.2, True, utterance)
+            recorder.close()
+
+            events = load_session(path)
+            self.assertEqual([e["type"] for e in events], ["session", "transcript", "intent", "dispatch"])
+            self.assertEqual(events[2]["utterance"], utterance)
+            self.assertEqual(recorder.events, [])
+
+            # A second recording to the same path replaces the first instead of merging utterance ids
+            second = SessionRecorder(path)
+            second.transcript("fechar")
+            second.close()
+            self.assertEqual([e["type"] for e in load_session(path)], ["session", "transcript"])
+
+    def test_replay_detects_regressions(self):
+        # Test that replay compares produced intents against the recording.
+        recorder = SessionRecorder(None)
+        recorder.transcript("3 unidades")
+        recorder.intent("set_units", 3)
+        recorder.transcript("pesquisar arroz")
+        recorder.intent("search_product", "arroz")
+
+        runtime = make_runtime()
+        report = replay_session(recorder.events, fast=True, runtime_module=runtime)
+
+        self.assertEqual(report["utterances"], 2)
+        self.assertEqual(report["commands"], 1)
+        self.assertEqual(len(report["mismatches"]), 1)
+        self.assertEqual(report["mismatches"][0]["text"], "pesquisar arroz")
+        # State swapped in for the replay is restored afterwards
+        self.assertIsNone(runtime.session_recorder)
+        self.assertFalse(runtime.pdv_ready)
+
+if __name__ == "__main__":
+    unittest.main()
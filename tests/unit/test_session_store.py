@@ -0,0 +1,95 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+from browser.browser_cdp import (
+    BrowserCDP, SESSION_DOMAIN, SESSION_NONE, SESSION_PRESENT, SESSION_RESTORED, _filter_storage_state
+)
+
+from credentials.config.config import CredentialsConfig
+from credentials.core.session_store import SessionStore
+from credentials.crypto.crypto_manager import CryptoManager
+from credentials.message.msg_code import MsgCode
+
+STATE = {
+    'cookies': [ { 'name': 'sid', 'value': 'abc', 'domain': '.gdoorweb.com.br', 'path': '/' } ],
+    'origins': [ { 'origin': 'https://app.gdoorweb.com.br', 'localStorage': [ { 'name': 'token', 'value': 't' } ] } ]
+}
+
+class TestSessionStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = CredentialsConfig(base_directory=Path(self.tmp.name))
+        self.config.ensure_secure_directory()
+        crypto = CryptoManager(self.config)
+        _, key = crypto.create_key()
+        crypto.save_key(key)
+        self.store = SessionStore(self.config)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_save_and_load_roundtrip_encrypted(self):
+        # Test that the session is stored encrypted, owner-only, and restored intact.
+        self.assertEqual(self.store.save_session(STATE), MsgCode.SUCCESS)
+        raw = self.config.session_file.read_bytes()
+        self.assertNotIn(b'gdoorweb', raw)
+        self.assertEqual(os.stat(self.config.session_file).st_mode & 0o777, 0o600)
+
+        status, state = self.store.load_session()
+        self.assertEqual(status, MsgCode.SUCCESS)
+        self.assertEqual(state, STATE)
+
+    def test_missing_expired_and_cleared(self):
+        # Test the fallback codes that make the browser go through a full login.
+        self.assertEqual(self.store.load_session()[0], MsgCode.MISSING_SESSION_FILE)
+        self.assertEqual(self.store.save_session({'origins': []}), MsgCode.SESSION_INVALID)
+
+        with patch('credentials.core.session_store.time.time', return_value=time.time() - 3600):
+            self.store.save_session(STATE)
+        self.assertEqual(self.store.load_session(max_age=60)[0], MsgCode.SESSION_EXPIRED)
+        self.assertEqual(self.store.load_session(max_age=7200)[0], MsgCode.SUCCESS)
+
+        self.assertEqual(self.store.clear_session(), MsgCode.SUCCESS)
+        self.assertFalse(self.config.session_file.exists())
+
+class TestBrowserSessionRestore(unittest.TestCase):
+
+    def _browser(self, cookies):
+        browser = BrowserCDP.__new__(BrowserCDP)
+        browser.context = MagicMock()
+        browser.context.cookies.return_value = cookies
+        browser.creds = MagicMock()
+        browser.creds.load_session.return_value = (MsgCode.SUCCESS, STATE)
+        return browser
+
+    def test_filter_matches_exact_host_or_subdomain(self):
+        # Test that look-alike domains are not saved with the session.
+        state = {
+            'cookies': [{'domain': d} for d in ('gdoorweb.com.br', '.app.gdoorweb.com.br', '.evilgdoorweb.com.br', 'gdoorweb.com.br.evil.io')],
+            'origins': [{'origin': o} for o in ('https://app.gdoorweb.com.br', 'https://evilgdoorweb.com.br', 'https://x.io/?gdoorweb.com.br')]
+        }
+        kept = _filter_storage_state(state, SESSION_DOMAIN)
+        self.assertEqual([c['domain'] for c in kept['cookies']], ['gdoorweb.com.br', '.app.gdoorweb.com.br'])
+        self.assertEqual([o['origin'] for o in kept['origins']], ['https://app.gdoorweb.com.br'])
+
+    def test_restore_reports_whether_the_saved_session_was_injected(self):
+        # Test the three results main.py uses to decide whether to discard the saved session.
+        present = self._browser([{'domain': '.gdoorweb.com.br'}])
+        self.assertEqual(present.restore_session(), SESSION_PRESENT)
+        present.context.add_cookies.assert_not_called()
+
+        empty = self._browser([{'domain': '.evilgdoorweb.com.br'}])
+        self.assertEqual(empty.restore_session(), SESSION_RESTORED)
+        empty.context.add_cookies.assert_called_once_with(STATE['cookies'])
+
+        empty = self._browser([])
+        empty.creds.load_session.return_value = (MsgCode.MISSING_SESSION_FILE, None)
+        self.assertEqual(empty.restore_session(), SESSION_NONE)
+
+if __name__ == '__main__':
+    unittest.main()
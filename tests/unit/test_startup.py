@@ -0,0 +1,41 @@
+import threading
+import time
+import unittest
+
+from runtime.startup import StartupOrchestrator
+
+class TestStartupOrchestrator(unittest.TestCase):
+
+    def test_independent_phases_run_concurrently(self):
+        # Test that phases without dependencies overlap and the critical path follows the slowest one.
+        startup = StartupOrchestrator()
+        startup.add('chrome', lambda: time.sleep(0.2))
+        startup.add('credentials', lambda: time.sleep(0.1) or ('creds', 0, {}))
+        startup.start()
+
+        self.assertTrue(startup.wait_all(('chrome', 'credentials'), timeout=5))
+        with startup.step('pdv_connect', requires=('chrome', 'credentials')):
+            pass
+        startup.signal('pdv_ready', requires=('pdv_connect',))
+
+        elapsed, path = startup.critical_path('pdv_ready')
+        self.assertEqual(path, ['chrome', 'pdv_connect', 'pdv_ready'])
+        self.assertLess(elapsed, 0.28)
+        self.assertEqual(startup.result('credentials'), ('creds', 0, {}))
+        self.assertIn('Caminho crítico', startup.report('pdv_ready'))
+
+    def test_failed_dependency_propagates_without_running(self):
+        # Test that a phase whose dependency failed is marked failed and never executed.
+        startup = StartupOrchestrator()
+        ran = threading.Event()
+        startup.add('chrome', lambda: False)
+        startup.add('connect', ran.set, requires=('chrome',))
+        startup.start()
+
+        self.assertIs(startup.wait('connect', timeout=5), False)
+        self.assertFalse(ran.is_set())
+        self.assertIn('chrome', startup.error('connect'))
+        self.assertIsNone(startup.wait('never_signaled', timeout=0.01))
+
+if __name__ == '__main__':
+    unittest.main()
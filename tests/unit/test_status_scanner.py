@@ -0,0 +1,62 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from credentials.config.config_manager import ConfigManager
+from credentials.config.status_scanner import scan_credentials_dir, iter_config_status
+
+class TestStatusScanner(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+        self.manager = ConfigManager(registry_base_dir=self.base / 'registry')
+
+    def tearDown(self):
+        self.manager.flush()
+        self.tmp.cleanup()
+
+    def _make(self, name, credentials=True, key=True):
+        self.manager.register_config(name, base_directory=self.base / name)
+        info = self.manager._lookup(name)
+        folder = Path(info.base_directory) / info.folder_name
+        folder.mkdir(parents=True, exist_ok=True)
+        if credentials:
+            (folder / info.credentials_filename).write_bytes(b'x')
+        if key:
+            (folder / info.key_filename).write_bytes(b'x')
+        return info
+
+    def test_scan_matches_check_config_exists(self):
+        # Test that the single-scandir status equals the per-file stat result.
+        self._make('full')
+        self._make('nokey', key=False)
+        self.manager.register_config('missing', base_directory=self.base / 'missing')
+
+        expected = {
+            'full': {'directory_exists': True, 'credentials_exists': True, 'key_exists': True},
+            'nokey': {'directory_exists': True, 'credentials_exists': True, 'key_exists': False},
+            'missing': {'directory_exists': False, 'credentials_exists': False, 'key_exists': False},
+        }
+        for name, files in expected.items():
+            _, exists, status = self.manager.check_config_exists(name)
+            self.assertTrue(exists)
+            self.assertEqual(status, files)
+
+        results = self.manager.check_all_configs(max_workers=4)
+        self.assertEqual(list(results), ['full', 'nokey', 'missing'])
+        self.assertEqual({name: r['files'] for name, r in results.items()}, expected)
+
+        streamed = dict(self.manager.iter_config_status())
+        self.assertEqual({name: r['files'] for name, r in streamed.items()}, expected)
+
+    def test_directory_named_like_file_is_not_a_file(self):
+        # Test that a sub-directory with the credentials file name is not reported as present.
+        folder = self.base / 'dir'
+        (folder / 'credentials.enc').mkdir(parents=True)
+        status = scan_credentials_dir(folder, 'credentials.enc', 'key.key')
+        self.assertEqual(status, {'directory_exists': True, 'credentials_exists': False, 'key_exists': False})
+        self.assertEqual(list(iter_config_status([])), [])
+
+if __name__ == '__main__':
+    unittest.main()
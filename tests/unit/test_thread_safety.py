@@ -0,0 +1,144 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from credentials.config.config_manager import ConfigManager
+from credentials.config.rw_lock import ReadWriteLock
+from credentials.core.credentials_cache import credentials_cache
+from credentials.credentials import Credentials
+from credentials.crypto.key_cache import key_cache
+from credentials.message.msg_code import MsgCode
+
+READERS = 8
+REWRITES = 5
+
+def run_threads(targets):
+    # Start every target, join them, and re-raise the first exception from any thread
+    errors = []
+    def guard(target):
+        try:
+            target()
+        except BaseException as e:
+            errors.append(e)
+    threads = [threading.Thread(target=guard, args=(target,)) for target in targets]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+    if errors:
+        raise errors[0]
+
+class TestReadWriteLock(unittest.TestCase):
+
+    def test_writer_excludes_readers_and_reentry(self):
+        # Test exclusion, per-thread re-entry and the upgrade guard.
+        lock = ReadWriteLock()
+        inside = []
+        with lock.write_locked():
+            with lock.read_locked(), lock.write_locked():
+                pass
+            reader = threading.Thread(target=lambda: lock.read_locked().__enter__() or inside.append(1))
+            reader.start()
+            reader.join(0.1)
+            self.assertEqual(inside, [])
+        reader.join(5)
+        self.assertEqual(inside, [1])
+
+        other = ReadWriteLock()
+        with other.read_locked(), other.read_locked():
+            with self.assertRaises(RuntimeError):
+                other.acquire_write()
+
+class TestThreadSafety(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+        self.env = patch.dict(os.environ, {'HOME': str(self.base / 'home'), 'CREDENTIALS_AGENT': '0'})
+        self.env.start()
+        credentials_cache.invalidate()
+        key_cache.invalidate()
+
+    def tearDown(self):
+        self.env.stop()
+        credentials_cache.invalidate()
+        key_cache.invalidate()
+        self.tmp.cleanup()
+
+    def test_concurrent_loads_during_rewrites(self):
+        # Stress: shared and per-thread instances load while another thread rewrites key + credentials.
+        shared = Credentials(base_directory=self.base)
+        self.assertEqual(shared.create_credentials(email='op@loja.com', password='senha0'), MsgCode.SUCCESS)
+        written = {('op@loja.com', 'senha0')}
+        done = threading.Event()
+        loads = []
+
+        def reader(own_instance):
+            creds = Credentials(base_directory=self.base) if own_instance else shared
+            count = 0
+            while not done.is_set() or count < 50:
+                status, data = creds.load_credentials()
+                self.assertEqual(status, MsgCode.SUCCESS)
+                self.assertIn((data['email'], data['password']), written)
+                count += 1
+            loads.append(count)
+
+        def writer():
+            try:
+                for i in range(1, REWRITES + 1):
+                    written.add(('op@loja.com', f'senha{i}'))
+                    self.assertEqual(shared.create_credentials(email='op@loja.com', password=f'senha{i}'), MsgCode.SUCCESS)
+                    time.sleep(0.01)
+            finally:
+                done.set()
+
+        started = time.perf_counter()
+        run_threads([writer] + [lambda own=i % 2: reader(own) for i in range(READERS)])
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(loads), READERS)
+        throughput = sum(loads) / elapsed
+        self.assertGreater(throughput, 200, f'{sum(loads)} loads in {elapsed:.2f}s')
+        self.assertEqual(shared.verify_credentials('op@loja.com', f'senha{REWRITES}'), MsgCode.SUCCESS)
+
+    def test_concurrent_registry_updates(self):
+        # Stress: registrations and description updates from shared and separate managers, with readers.
+        registry_dir = self.base / 'registry'
+        shared = ConfigManager(registry_dir)
+        done = threading.Event()
+        per_thread = 10
+
+        def writer(index):
+            manager = shared if index % 2 else ConfigManager(registry_dir)
+            for j in range(per_thread):
+                name = f't{index}-{j}'
+                status, _ = manager.register_config(name, base_directory=self.base, folder_name=name)
+                self.assertEqual(status, MsgCode.SUCCESS)
+                self.assertEqual(manager.update_config_description(name, f'desc {name}'), MsgCode.SUCCESS)
+
+        def reader():
+            while not done.is_set():
+                for info in shared.list_configs():
+                    self.assertIsNotNone(shared.get_config_info(info.name))
+                    self.assertEqual(shared.get_config(info.name, touch=False)[0], MsgCode.SUCCESS)
+
+        readers = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in readers:
+            thread.start()
+        try:
+            run_threads([lambda i=i: writer(i) for i in range(READERS)])
+        finally:
+            done.set()
+            for thread in readers:
+                thread.join(10)
+
+        configs = {info.name: info for info in ConfigManager(registry_dir).list_configs()}
+        self.assertEqual(len(configs), READERS * per_thread)
+        self.assertTrue(all(info.description == f'desc {name}' for name, info in configs.items()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from cryptography.fernet import Fernet
+
+from credentials.config.config import CredentialsConfig
+from credentials.core.credentials_cache import credentials_cache
+from credentials.core.vault import CredentialsVault
+from credentials.credentials import Credentials
+from credentials.crypto.crypto_manager import CryptoManager
+from credentials.crypto.key_cache import key_cache
+from credentials.message.msg_code import MsgCode
+
+class TestCredentialsVault(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config = CredentialsConfig(base_directory=Path(self.tmp.name))
+        self.config.ensure_secure_directory()
+        crypto = CryptoManager(self.config)
+        _, key = crypto.create_key()
+        crypto.save_key(key)
+        self.vault = CredentialsVault(self.config)
+
+    def tearDown(self):
+        key_cache.invalidate(self.config.key_file)
+        self.tmp.cleanup()
+
+    def test_entries_are_appended_and_decrypted_individually(self):
+        # Test that puts append records, reads decrypt one token and names never hit disk in clear.
+        for i in range(5):
+            self.assertEqual(self.vault.put_entry(f'loja-{i}', email=f'op{i}@loja.com', password='s'), MsgCode.SUCCESS)
+        size = self.config.vault_file.stat().st_size
+        self.vault.put_entry('loja-2', email='novo@loja.com', password='t')
+        self.assertGreater(self.config.vault_file.stat().st_size, size)
+
+        with patch.object(Fernet, 'decrypt', autospec=True, side_effect=Fernet.decrypt) as decrypt:
+            status, entry = CredentialsVault(self.config).get_entry('loja-2')
+            self.assertEqual(decrypt.call_count, 1)
+        self.assertEqual(status, MsgCode.SUCCESS)
+        self.assertEqual(entry['email'], 'novo@loja.com')
+
+        for path in (self.config.vault_file, self.config.vault_index_file):
+            self.assertNotIn(b'loja-', path.read_bytes())
+        self.assertEqual(len(self.vault.entry_ids()[1]), 5)
+
+    def test_remove_compact_and_torn_record(self):
+        # Test tombstones, compaction and recovery from a partially written record.
+        self.vault.put_entry('a', password='1')
+        self.vault.put_entry('b', password='2')
+        self.assertEqual(self.vault.remove_entry('a'), MsgCode.SUCCESS)
+        self.assertEqual(self.vault.get_entry('a'), (MsgCode.ENTRY_NOT_FOUND, None))
+        self.assertEqual(self.vault.remove_entry('a'), MsgCode.ENTRY_NOT_FOUND)
+
+        self.assertEqual(self.vault.compact(), MsgCode.SUCCESS)
+        self.assertEqual(self.vault.list_names(), (MsgCode.SUCCESS, ['b']))
+        self.assertEqual(len(self.config.vault_file.read_bytes().splitlines()), 1)
+
+        with open(self.config.vault_file, 'ab') as vault_file:
+            vault_file.write(b'0123456789abcdef0123456789abcdef P gAAAA')
+        other = CredentialsVault(self.config)
+        self.assertEqual(other.put_entry('c', password='3'), MsgCode.SUCCESS)
+        self.assertEqual(other.list_names(), (MsgCode.SUCCESS, ['b', 'c']))
+        self.assertEqual(self.vault.get_entry('c')[1]['password'], '3')
+
+class TestVaultKeyRotation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.env = patch.dict(os.environ, {'CREDENTIALS_AGENT': '0'})
+        self.env.start()
+        self.creds = Credentials(base_directory=Path(self.tmp.name))
+
+    def tearDown(self):
+        self.env.stop()
+        credentials_cache.invalidate()
+        key_cache.invalidate()
+        self.tmp.cleanup()
+
+    def test_entries_survive_a_new_key(self):
+        # Test that re-creating the main login (new key, random or password) re-encrypts the vault.
+        self.assertEqual(self.creds.create_credentials('u', 'e@x', 'p1'), MsgCode.SUCCESS)
+        self.assertEqual(self.creds.vault_put('op1', email='op1@loja.com', password='s1'), MsgCode.SUCCESS)
+        self.assertEqual(self.creds.vault_put('op2', password='s2'), MsgCode.SUCCESS)
+        self.creds.vault_remove('op2')
+        old_ids = self.creds._vault.entry_ids()[1]
+
+        self.assertEqual(self.creds.create_credentials('u', 'e@x', 'p2'), MsgCode.SUCCESS)
+        self.assertEqual(self.creds.create_credentials('u', 'e@x', 'p3', key_password='chave'), MsgCode.SUCCESS)
+        status, entry = self.creds.vault_get('op1')
+        self.assertEqual(status, MsgCode.SUCCESS)
+        self.assertEqual(entry['email'], 'op1@loja.com')
+        self.assertEqual(self.creds.vault_names(), (MsgCode.SUCCESS, ['op1']))
+        self.assertNotEqual(self.creds._vault.entry_ids()[1], old_ids)
+        self.assertEqual(self.creds.load_credentials()[1]['password'], 'p3')
+
+    def test_key_kept_when_vault_cannot_be_decrypted(self):
+        # Test that a vault the current key cannot read blocks the rotation instead of being orphaned.
+        self.creds.create_credentials('u', 'e@x', 'p1')
+        self.creds.vault_put('op1', password='s1')
+        key = self.creds._config.key_file.read_bytes()
+        with patch.object(Fernet, 'decrypt', side_effect=ValueError):
+            self.assertEqual(self.creds.create_credentials('u', 'e@x', 'p2'), MsgCode.DECRYPTION_ERROR)
+        self.assertEqual(self.creds._config.key_file.read_bytes(), key)
+        self.assertEqual(self.creds.vault_get('op1')[0], MsgCode.SUCCESS)
+
+if __name__ == '__main__':
+    unittest.main()